@@ -0,0 +1,152 @@
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Added to every Earth911 page so the Chrome flow finds the search form, the
+# radius dropdown and a popup to close, like on the live site
+EARTH911_CHROME_SNIPPET = b"""
+<form id="search-form" action="/" method="get">
+  <input id="what" name="what" type="text">
+  <input id="where" name="where" type="text">
+  <input type="hidden" name="list_filter" value="all">
+  <input type="hidden" name="max_distance" value="100">
+  <button id="submit-location-search" type="submit">Search</button>
+</form>
+<select onchange="const url = new URL(location.href); url.searchParams.set('max_distance', this.value); location.href = url;">
+  <option value="25">25 miles</option>
+  <option value="50">50 miles</option>
+  <option value="100" selected>100 miles</option>
+</select>
+<div class="newsletter-popup" style="display: none; position: fixed; top: 0; right: 0;">
+  <i class="_close-icon" onclick="this.parentNode.style.display = 'none';">x</i>
+</div>
+<script>setTimeout(() => { document.querySelector(".newsletter-popup").style.display = "block"; }, 200);</script>
+"""
+
+# /bestbuy/v1/stores(area(ZIP,RADIUS)), shaped like the Best Buy Stores API
+STORES_API_PATH = re.compile(r"^/bestbuy/v1/stores\(area\((\w+),([\d.]+)\)\)$")
+
+
+def stores_api_page(path, query):
+    """Answer a Stores API query from the recorded stores, or None if path is not one
+
+    Stores within the radius are returned nearest first, pageSize at a
+    time, in the same envelope as the real API.
+    """
+    match = STORES_API_PATH.match(path)
+    if match is None:
+        return None
+    with open(os.path.join(FIXTURES_DIR, "bestbuy", "stores_api.json"), encoding="utf-8") as f:
+        stores = json.load(f)["stores"]
+    radius = float(match.group(2))
+    stores = sorted((store for store in stores if store["distance"] <= radius), key=lambda store: store["distance"])
+    page = int(query.get("page", ["1"])[0])
+    page_size = int(query.get("pageSize", ["10"])[0])
+    start = (page - 1) * page_size
+    selected = stores[start:start + page_size]
+    return {
+        "from": start + 1 if selected else 0,
+        "to": start + len(selected),
+        "currentPage": page,
+        "total": len(stores),
+        "totalPages": math.ceil(len(stores) / page_size),
+        "partial": False,
+        "stores": selected,
+    }
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serve recorded Earth911 and Best Buy pages with injected latency and failures
+
+    /?what=...&page=N (or /earth911/?...) serves earth911/page_N.html, and
+    /bestbuy/store-locator serves the recorded store locator and
+    /bestbuy/v1/stores(area(ZIP,RADIUS)) pages through the recorded stores
+    as JSON (see stores_api_page). Any other path is looked up under
+    FIXTURES_DIR.
+    """
+
+    def resolve(self, path):
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        if parts.path in ("/", "/earth911/"):
+            page = query.get("page", ["1"])[0] if "what" in query else "1"
+            return os.path.join(FIXTURES_DIR, "earth911", f"page_{page}.html")
+        if parts.path.rstrip("/") == "/bestbuy/store-locator":
+            return os.path.join(FIXTURES_DIR, "bestbuy", "store_locator.html")
+        return os.path.join(FIXTURES_DIR, os.path.normpath(parts.path).lstrip("/\\"))
+
+    def do_GET(self):
+        server = self.server
+        delay = server.latency + server.rng.uniform(-server.jitter, server.jitter) if server.jitter else server.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        with server.lock:
+            server.stats["requests"] += 1
+            fail = server.failure_rate and server.rng.random() < server.failure_rate
+            if fail:
+                server.stats["failures"] += 1
+        if fail:
+            self.send_error(503, "Injected failure")
+            return
+
+        parts = urlsplit(self.path)
+        if STORES_API_PATH.match(parts.path):
+            query = parse_qs(parts.query)
+            if "apiKey" not in query:
+                self.send_error(403, "Missing apiKey")
+                return
+            self.send_body(json.dumps(stores_api_page(parts.path, query)).encode("utf-8"), "application/json")
+            return
+
+        path = self.resolve(self.path)
+        if not path.startswith(FIXTURES_DIR) or not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+        if os.sep + "earth911" + os.sep in path:
+            body = body.replace(b"</body>", EARTH911_CHROME_SNIPPET + b"</body>")
+
+        self.send_body(body, "text/html")
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.stats["bytes"] += len(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+
+def start_fixture_server(host="127.0.0.1", port=0, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+    """Start the fixture server on a background thread and return (server, base_url)
+
+    Every response is delayed by latency seconds plus or minus a uniform
+    jitter, and failure_rate of the requests get a 503. Request, failure
+    and byte counts are kept in server.stats.
+    """
+    server = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+    server.latency = latency
+    server.jitter = jitter
+    server.failure_rate = failure_rate
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.stats = {"requests": 0, "failures": 0, "bytes": 0}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/"
@@ -0,0 +1,289 @@
+"""Benchmark every scraper engine and mode end to end against a local fixture site
+
+Run from the repository root:
+
+    python benchmarks/suite.py --rounds 10 --output bench.json
+    python benchmarks/suite.py --skip-chrome --latency 0.05 --jitter 0.02 --failure-rate 0.05
+    python benchmarks/suite.py --output after.json --compare before.json
+
+The fixture server replays the recorded Earth911 result pages and the Best
+Buy store locator, with optional latency, jitter and 503 failure injection.
+Each scenario reports pages/sec, rows/sec, p50/p95 per-page latency,
+WebDriver command counts and peak RSS (including Chrome child processes).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import start_fixture_server  # noqa: E402
+from scrapper.sessions import process_tree_rss_mb  # noqa: E402
+
+QUERY = ("Electronics", "10001", 100)
+
+# Metrics --compare reports, and whether a higher value is better
+COMPARED_METRICS = {
+    "pages_per_sec": True,
+    "rows_per_sec": True,
+    "p50_page_ms": False,
+    "p95_page_ms": False,
+    "webdriver_commands": False,
+    "peak_rss_mb": False,
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers, or None if it is empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class RssSampler:
+    """Sample the RSS of this process tree in the background and keep the peak
+
+    peak_mb stays None where the RSS cannot be measured.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def _sample(self):
+        rss = process_tree_rss_mb()
+        if rss is not None:
+            self.peak_mb = max(self.peak_mb or 0.0, rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+
+def run_scenario(name, rounds, run_round, setup=None, teardown=None):
+    """Time rounds of run_round(context, stats) and summarise them
+
+    run_round returns the rows it produced and appends per-page latencies
+    to stats["page_seconds"]; it may also add a "webdriver_commands" count.
+    """
+    context = setup() if setup else None
+    stats = {"page_seconds": [], "webdriver_commands": 0}
+    rows = 0
+    try:
+        with RssSampler() as sampler:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                rows += len(run_round(context, stats))
+            elapsed = time.perf_counter() - start
+    finally:
+        if teardown:
+            teardown(context)
+
+    pages = len(stats["page_seconds"])
+    p50 = percentile(stats["page_seconds"], 50)
+    p95 = percentile(stats["page_seconds"], 95)
+    return {
+        "scenario": name,
+        "rounds": rounds,
+        "pages": pages,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else None,
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed else None,
+        "p50_page_ms": round(p50 * 1000, 1) if p50 is not None else None,
+        "p95_page_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        "webdriver_commands": stats["webdriver_commands"],
+        "peak_rss_mb": round(sampler.peak_mb, 1) if sampler.peak_mb is not None else None,
+    }
+
+
+def earth911_http_scenarios(base_url, max_pages):
+    from scrapper.earth911_http import iter_earth911_concurrent, iter_earth911_http, iter_replay_from_cache
+    from scrapper.http_client import create_session
+    from scrapper.page_cache import PageCache
+
+    def http_round(session, stats):
+        return list(iter_earth911_http(*QUERY, max_pages, session=session, base_url=base_url, stats=stats))
+
+    def concurrent_round(session, stats):
+        return list(iter_earth911_concurrent(*QUERY, max_pages, session=session, base_url=base_url,
+                                             rate=1000, stats=stats))
+
+    def replay_setup():
+        directory = tempfile.mkdtemp(prefix="bench-cache-")
+        cache = PageCache(directory, ttl=None)
+        list(iter_earth911_http(*QUERY, max_pages, base_url=base_url, cache=cache))
+        return cache, directory
+
+    def replay_round(context, stats):
+        return list(iter_replay_from_cache(context[0], *QUERY, max_pages, stats=stats))
+
+    def replay_teardown(context):
+        context[0].close()
+        shutil.rmtree(context[1], ignore_errors=True)
+
+    return [
+        ("earth911-http", http_round, create_session, None),
+        ("earth911-http-concurrent", concurrent_round, create_session, None),
+        ("earth911-replay", replay_round, replay_setup, replay_teardown),
+    ]
+
+
+def bestbuy_api_scenarios(base_url):
+    from scrapper.bestbuy_api import StoreApiClient
+
+    def start_client():
+        # Five stores per page, so each ZIP takes three requests
+        return StoreApiClient("benchmark", f"{base_url}bestbuy/v1/stores(area({{zip_code}},{{radius}}))", page_size=5)
+
+    def api_round(client, stats):
+        start = time.perf_counter()
+        stores = client.search("10001", 25)
+        stats["page_seconds"].append(time.perf_counter() - start)
+        return stores
+
+    return [("bestbuy-api", api_round, start_client, None)]
+
+
+def chrome_scenarios(base_url, max_pages, browser_profile):
+    from scrapper.bestBut_scrapper import search_stores
+    from scrapper.browser import CommandCounter, create_driver
+    from scrapper.earth911_scrapper import iter_with_chrome
+
+    def start_driver():
+        return create_driver(headless=True, profile=browser_profile)
+
+    def stop_driver(driver):
+        driver.quit()
+
+    def earth911_round(driver, stats):
+        with CommandCounter(driver) as counter:
+            rows = list(iter_with_chrome(*QUERY, max_pages, driver=driver, search_url=base_url, stats=stats))
+        stats["webdriver_commands"] += counter.total
+        return rows
+
+    def bestbuy_round(extract_mode):
+        def run_round(driver, stats):
+            start = time.perf_counter()
+            with CommandCounter(driver) as counter:
+                stores = search_stores(driver, "10001", extract_mode, locator_url=f"{base_url}bestbuy/store-locator")
+            if stores is None:
+                raise RuntimeError("The store search on the fixture site could not be run")
+            stats["page_seconds"].append(time.perf_counter() - start)
+            stats["webdriver_commands"] += counter.total
+            return stores
+        return run_round
+
+    return [
+        ("earth911-chrome", earth911_round, start_driver, stop_driver),
+        ("bestbuy-chrome-js", bestbuy_round("js"), start_driver, stop_driver),
+        ("bestbuy-chrome-dom", bestbuy_round("dom"), start_driver, stop_driver),
+    ]
+
+
+def compare(results, baseline_path):
+    """Print the change of every compared metric against an earlier results file"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {result["scenario"]: result for result in json.load(f)["results"]}
+
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        before = baseline.get(result["scenario"])
+        if before is None:
+            print(f"  {result['scenario']}: not in baseline")
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            better = change > 0 if higher_is_better else change < 0
+            marker = "" if abs(change) < 5 else (" better" if better else " WORSE")
+            changes.append(f"{metric} {change:+.0f}%{marker}")
+        print(f"  {result['scenario']}: {', '.join(changes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10, help="How many times to run each scenario")
+    parser.add_argument("--max-pages", type=int, default=5)
+    parser.add_argument("--skip-chrome", action="store_true", help="Only run the browserless scenarios")
+    parser.add_argument("--only", nargs="*", help="Run only the scenarios with these names")
+    parser.add_argument("--browser-profile", default="default", help="Browser profile for the Chrome scenarios")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every fixture response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds on top of --latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for jitter and failure injection")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare with an earlier --output file")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(latency=args.latency, jitter=args.jitter,
+                                            failure_rate=args.failure_rate, seed=args.seed)
+    scenarios = earth911_http_scenarios(base_url, args.max_pages) + bestbuy_api_scenarios(base_url)
+    if not args.skip_chrome:
+        scenarios += chrome_scenarios(base_url, args.max_pages, args.browser_profile)
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if scenario[0] in args.only]
+
+    results = []
+    try:
+        for name, run_round, setup, teardown in scenarios:
+            # Silence the scrapers' progress output while timing
+            stdout = sys.stdout
+            sys.stdout = open(os.devnull, "w")
+            try:
+                result = run_scenario(name, args.rounds, run_round, setup, teardown)
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+            results.append(result)
+            print(f"{name:>25}: {result['pages']} pages, {result['rows']} rows in {result['seconds']:.2f}s -> "
+                  f"{result['pages_per_sec']} pages/sec, {result['rows_per_sec']} rows/sec, "
+                  f"p50 {result['p50_page_ms']} ms, p95 {result['p95_page_ms']} ms, "
+                  f"{result['webdriver_commands']} WebDriver commands, peak RSS {result['peak_rss_mb']} MB")
+    finally:
+        server.shutdown()
+
+    print(f"Fixture server: {server.stats['requests']} requests, {server.stats['failures']} injected failures")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+                "environment": {"python": platform.python_version(), "platform": platform.platform()},
+                "server": server.stats,
+                "results": results,
+            }, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
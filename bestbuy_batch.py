@@ -0,0 +1,6 @@
+"""Keeps `python bestbuy_batch.py` working; the code lives in scrapper/bestbuy_batch.py"""
+from scrapper.bestbuy_batch import *  # noqa: F401,F403
+from scrapper.bestbuy_batch import main
+
+if __name__ == "__main__":
+    main()
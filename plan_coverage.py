@@ -0,0 +1,6 @@
+"""Keeps the coverage planner runnable as `python plan_coverage.py`; the code lives in scrapper/coverage.py"""
+from scrapper.coverage import *  # noqa: F401,F403
+from scrapper.coverage import main
+
+if __name__ == "__main__":
+    main()
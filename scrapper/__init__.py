@@ -0,0 +1,68 @@
+"""Earth911 recycling and Best Buy store locator scrapers
+
+Importing the package does not start a browser. Chrome is only launched
+when a job needs it, and the drivers are kept warm across jobs by a
+SessionManager (the process-wide default one unless another is passed).
+
+    from scrapper import scrape_bestbuy, scrape_earth911
+
+    rows = scrape_earth911("Electronics", "10001", radius=100, pages=5)
+    stores = scrape_bestbuy(["10001", "60601"])
+"""
+
+
+def scrape_earth911(query="Electronics", zip_code="10001", radius=100, pages=5, engine="auto",
+                    concurrent_pages=False, cache=None, checkpoint=None, sessions=None, dedupe=True):
+    """Scrape one Earth911 search and return its rows
+
+    engine is "auto" (HTTP, falling back to Chrome when it finds nothing),
+    "http" or "chrome". Chrome runs on a driver borrowed from sessions.
+    """
+    from .earth911_http import iter_earth911_concurrent, iter_earth911_http
+    from .earth911_scrapper import iter_with_chrome
+    from .records import dedupe_rows
+    from .sessions import default_session_manager
+
+    rows = []
+    if engine in ("auto", "http"):
+        try:
+            if concurrent_pages:
+                rows = list(iter_earth911_concurrent(query, zip_code, radius, pages, cache=cache, checkpoint=checkpoint))
+            else:
+                rows = list(iter_earth911_http(query, zip_code, radius, pages, cache=cache, checkpoint=checkpoint))
+        except Exception as e:
+            print(f"HTTP engine failed: {e}")
+            if engine == "http":
+                raise
+
+    if not rows and engine in ("auto", "chrome"):
+        with (sessions or default_session_manager()).session() as driver:
+            rows = list(iter_with_chrome(query, zip_code, radius, pages, concurrent_pages=concurrent_pages,
+                                         cache=cache, checkpoint=checkpoint, driver=driver))
+
+    return list(dedupe_rows(rows)) if dedupe else rows
+
+
+def scrape_bestbuy(zip_codes, extract_mode="js", cache=None, sessions=None, enrich=False):
+    """Search the Best Buy store locator for each ZIP and return the merged stores
+
+    A single ZIP may be passed as a string. Stores seen from several ZIPs
+    are kept once, at their nearest distance. RuntimeError is raised when
+    the search for a ZIP could not be run.
+    """
+    from .bestBut_scrapper import enrich_stores, search_stores
+    from .bestbuy_batch import merge_stores
+    from .sessions import default_session_manager
+
+    if isinstance(zip_codes, str):
+        zip_codes = [zip_codes]
+    sessions = sessions or default_session_manager()
+
+    batches = []
+    for zip_code in zip_codes:
+        with sessions.session() as driver:
+            stores = search_stores(driver, zip_code, extract_mode, cache=cache)
+        if stores is None:
+            raise RuntimeError(f"The store search for ZIP {zip_code} could not be run")
+        batches.append(stores)
+    return enrich_stores(merge_stores(batches), enrich, cache)
@@ -0,0 +1,32 @@
+"""Command line entry point: python -m scrapper <command> [options]"""
+import importlib
+import sys
+
+COMMANDS = {
+    "earth911": ("earth911_scrapper", "Scrape recycling facilities from Earth911 search results"),
+    "bestbuy": ("bestBut_scrapper", "Scrape Best Buy stores around one ZIP code"),
+    "bestbuy-batch": ("bestbuy_batch", "Scrape Best Buy stores for many ZIP codes with a Chrome pool"),
+    "coverage": ("coverage", "Plan a near-minimal set of ZIP queries covering a region"),
+    "materials": ("materials_index", "Build or query the Earth911 materials index"),
+    "queue": ("job_queue", "Queue scrape jobs and run worker processes that share them"),
+    "cache": ("page_cache", "Inspect or prune the on-disk page cache"),
+}
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in COMMANDS:
+        print("usage: python -m scrapper <command> [options]\n\ncommands:")
+        for name, (_, description) in COMMANDS.items():
+            print(f"  {name:<14} {description}")
+        return 0 if argv[:1] in (["-h"], ["--help"]) else 2
+
+    command = argv.pop(0)
+    module = importlib.import_module(f".{COMMANDS[command][0]}", __package__)
+    # Each command parses sys.argv itself, so present it as its own program
+    sys.argv = [f"python -m scrapper {command}"] + argv
+    return module.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
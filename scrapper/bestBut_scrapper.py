@@ -0,0 +1,536 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from urllib.parse import urljoin
+import argparse
+import os
+import time
+
+from .bestbuy_api import StoreApiClient, add_api_arguments, api_key_required
+from .browser import CommandCounter, NavigationMeter, add_browser_arguments, browser_options, create_driver
+from .html_utils import element_text, make_soup
+from .checkpoints import DEFAULT_CHECKPOINT_PATH, CheckpointStore
+from .page_cache import add_cache_arguments, open_cache
+from .records import normalize_record
+from .selector_cache import DEFAULT_SELECTOR_CACHE_PATH, SelectorCache, default_selector_cache
+from .sinks import open_sink, write_rows
+from .snapshots import CHANGE_FIELD, DEFAULT_SNAPSHOT_PATH, SNAPSHOT_FIELDS, SnapshotIndex, delta_path_for, track_changes
+from .structured_data import STRUCTURED_DATA_SCRIPT, build_store_index, join_store_index, payloads_from_html
+from .telemetry import add_telemetry_arguments, export_telemetry, profiled, telemetry
+from .waits import ReadinessWaiter, elements_present, network_idle, replaced
+
+STORE_LOCATOR_URL = "https://www.bestbuy.com/site/store-locator"
+
+def extract_store_data(driver, wait):
+    """Extract Best Buy store data from the search results"""
+    extracted_stores = []
+    
+    try:
+        # Find all store list items
+        store_items = driver.find_elements(By.CSS_SELECTOR, "li.store")
+        print(f"Found {len(store_items)} store(s)")
+        
+        for i, store_item in enumerate(store_items, 1):
+            try:
+                store_data = {}
+                
+                # Extract store ID
+                store_id = store_item.get_attribute("data-store-id")
+                store_data["store_id"] = store_id
+                
+                # Extract store name
+                try:
+                    store_name_element = store_item.find_element(By.CSS_SELECTOR, "button[data-cy='store-heading']")
+                    store_data["store_name"] = store_name_element.text.strip()
+                except Exception as e:
+                    telemetry.swallowed("bestbuy.store_name", e)
+                    store_data["store_name"] = "Store name not found"
+                
+                # Extract distance
+                try:
+                    distance_element = store_item.find_element(By.CSS_SELECTOR, "[data-cy='LocationDistance']")
+                    store_data["distance"] = distance_element.text.strip()
+                except Exception as e:
+                    telemetry.swallowed("bestbuy.distance", e)
+                    store_data["distance"] = "Distance not found"
+                
+                # Extract address
+                try:
+                    address_element = store_item.find_element(By.CSS_SELECTOR, "[data-cy='AddressComponent']")
+                    address_spans = address_element.find_elements(By.TAG_NAME, "span")
+                    
+                    street_address = address_spans[0].text.strip() if len(address_spans) > 0 else ""
+                    city_state_zip = address_spans[1].text.strip() if len(address_spans) > 1 else ""
+                    
+                    store_data["street_address"] = street_address
+                    store_data["city_state_zip"] = city_state_zip
+                    store_data["full_address"] = f"{street_address}, {city_state_zip}" if street_address else city_state_zip
+                except Exception as e:
+                    telemetry.swallowed("bestbuy.address", e)
+                    store_data["street_address"] = "Address not found"
+                    store_data["city_state_zip"] = "City/State/ZIP not found"
+                    store_data["full_address"] = "Full address not found"
+                
+                # Extract hours
+                try:
+                    hours_element = store_item.find_element(By.CSS_SELECTOR, "[data-cy='BusinessHoursComponent']")
+                    store_data["hours"] = hours_element.text.strip()
+                except Exception as e:
+                    telemetry.swallowed("bestbuy.hours", e)
+                    store_data["hours"] = "Hours not found"
+                
+                # Extract store details link
+                try:
+                    details_link = store_item.find_element(By.CSS_SELECTOR, "[data-cy='DetailsComponent']")
+                    store_data["details_url"] = details_link.get_attribute("href")
+                except Exception as e:
+                    telemetry.swallowed("bestbuy.details_url", e)
+                    store_data["details_url"] = "Details URL not found"
+                
+                # Phone comes from the page's structured data (see join_structured_data)
+                store_data["phone"] = "Phone not found"
+                
+                extracted_stores.append(store_data)
+                print(f"  {i}. Extracted: {store_data.get('store_name', 'Unknown')} - {store_data.get('distance', 'Unknown distance')}")
+                
+            except Exception as e:
+                print(f"  {i}. Error extracting store data: {e}")
+                telemetry.swallowed("bestbuy.store", e)
+                continue
+                
+    except Exception as e:
+        print(f"Error finding store items: {e}")
+        telemetry.swallowed("bestbuy.stores", e)
+    
+    return extracted_stores
+
+# Collects every store card in one round trip, with the same field names and
+# fallbacks as extract_store_data
+STORE_CARDS_SCRIPT = """
+const textOf = (root, selector, fallback) => {
+    const element = root.querySelector(selector);
+    return element ? element.innerText.trim() : fallback;
+};
+
+return Array.from(document.querySelectorAll("li.store")).map(store => {
+    const card = {store_id: store.getAttribute("data-store-id")};
+    card.store_name = textOf(store, "button[data-cy='store-heading']", "Store name not found");
+    card.distance = textOf(store, "[data-cy='LocationDistance']", "Distance not found");
+
+    const address = store.querySelector("[data-cy='AddressComponent']");
+    if (address) {
+        const spans = address.querySelectorAll("span");
+        const street = spans.length > 0 ? spans[0].innerText.trim() : "";
+        const cityStateZip = spans.length > 1 ? spans[1].innerText.trim() : "";
+        card.street_address = street;
+        card.city_state_zip = cityStateZip;
+        card.full_address = street ? `${street}, ${cityStateZip}` : cityStateZip;
+    } else {
+        card.street_address = "Address not found";
+        card.city_state_zip = "City/State/ZIP not found";
+        card.full_address = "Full address not found";
+    }
+
+    card.hours = textOf(store, "[data-cy='BusinessHoursComponent']", "Hours not found");
+
+    const details = store.querySelector("[data-cy='DetailsComponent']");
+    card.details_url = details ? details.href : "Details URL not found";
+
+    card.phone = "Phone not found";
+    return card;
+});
+"""
+
+def extract_store_data_js(driver):
+    """Extract Best Buy store data with a single in-browser script call"""
+    try:
+        extracted_stores = driver.execute_script(STORE_CARDS_SCRIPT) or []
+    except Exception as e:
+        print(f"Error running store extraction script: {e}")
+        return []
+    
+    print(f"Found {len(extracted_stores)} store(s)")
+    for i, store_data in enumerate(extracted_stores, 1):
+        print(f"  {i}. Extracted: {store_data.get('store_name', 'Unknown')} - {store_data.get('distance', 'Unknown distance')}")
+    
+    return extracted_stores
+
+def parse_store_html(html):
+    """Extract Best Buy store data from saved page HTML, without a browser
+
+    Uses the same field names and fallbacks as extract_store_data.
+    """
+    extracted_stores = []
+    soup = make_soup(html)
+    
+    for store_item in soup.select("li.store"):
+        store_data = {"store_id": store_item.get("data-store-id")}
+        
+        store_name_element = store_item.select_one("button[data-cy='store-heading']")
+        store_data["store_name"] = element_text(store_name_element) if store_name_element else "Store name not found"
+        
+        distance_element = store_item.select_one("[data-cy='LocationDistance']")
+        store_data["distance"] = element_text(distance_element) if distance_element else "Distance not found"
+        
+        address_element = store_item.select_one("[data-cy='AddressComponent']")
+        if address_element:
+            address_spans = address_element.find_all("span")
+            street_address = element_text(address_spans[0]) if len(address_spans) > 0 else ""
+            city_state_zip = element_text(address_spans[1]) if len(address_spans) > 1 else ""
+            store_data["street_address"] = street_address
+            store_data["city_state_zip"] = city_state_zip
+            store_data["full_address"] = f"{street_address}, {city_state_zip}" if street_address else city_state_zip
+        else:
+            store_data["street_address"] = "Address not found"
+            store_data["city_state_zip"] = "City/State/ZIP not found"
+            store_data["full_address"] = "Full address not found"
+        
+        hours_element = store_item.select_one("[data-cy='BusinessHoursComponent']")
+        store_data["hours"] = element_text(hours_element) if hours_element else "Hours not found"
+        
+        details_link = store_item.select_one("[data-cy='DetailsComponent']")
+        if details_link and details_link.get("href"):
+            store_data["details_url"] = urljoin(STORE_LOCATOR_URL, details_link["href"])
+        else:
+            store_data["details_url"] = "Details URL not found"
+        
+        store_data["phone"] = "Phone not found"
+        extracted_stores.append(store_data)
+    
+    matched = join_store_index(extracted_stores, build_store_index(payloads_from_html(soup)))
+    print(f"Structured data matched {matched}/{len(extracted_stores)} stores")
+    return extracted_stores
+
+def join_structured_data(driver, stores):
+    """Join phone, weekly hours and coordinates from the page's embedded JSON onto store rows
+
+    The payloads are read in one script call and parsed once per page,
+    instead of scanning the scripts inside every store card.
+    """
+    try:
+        payloads = driver.execute_script(STRUCTURED_DATA_SCRIPT) or []
+    except Exception as e:
+        print(f"Error reading structured data: {e}")
+        return 0
+    
+    matched = join_store_index(stores, build_store_index(payloads))
+    print(f"Structured data matched {matched}/{len(stores)} stores from {len(payloads)} payload(s)")
+    return matched
+
+def snapshot_url(zip_code):
+    """Cache key for the rendered results of a ZIP search (the locator URL itself never changes)"""
+    return f"{STORE_LOCATOR_URL}?zip={zip_code}"
+
+def replay_from_cache(cache, zip_code):
+    """Re-run extraction over the cached DOM snapshot of a ZIP search"""
+    html = cache.get(snapshot_url(zip_code), kind="dom", allow_expired=True)
+    if html is None:
+        print(f"No cached snapshot for ZIP {zip_code}")
+        return []
+    
+    start = time.perf_counter()
+    stores = parse_store_html(html)
+    print(f"Replayed {len(stores)} stores for ZIP {zip_code} in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return stores
+
+EXTRACT_MODES = {
+    "dom": lambda driver, wait: extract_store_data(driver, wait),
+    "js": lambda driver, wait: extract_store_data_js(driver),
+}
+
+# Columns written by save_store_data_to_csv
+STORE_CSV_HEADERS = [
+    "store_id",
+    "store_name", 
+    "distance",
+    "street_address",
+    "city_state_zip",
+    "full_address",
+    "hours",
+    "details_url",
+    "phone",
+    "weekly_hours",
+    "latitude",
+    "longitude"
+]
+
+def save_store_data_to_csv(stores, filename="bestbuy_stores.csv", output_format=None, snapshot=None, delta=None):
+    """Save extracted store data to a file (CSV unless the extension or output_format says otherwise)
+
+    With a snapshot index path, the stores are compared with the previous
+    run of the same file: rows get first_seen/last_changed columns and the
+    added, changed and removed stores go to the delta file.
+    """
+    if not stores:
+        print("No store data to save")
+        return
+    
+    headers = STORE_CSV_HEADERS
+    rows = (normalize_record(store) for store in stores)
+    snapshots = delta_sink = None
+    if snapshot:
+        snapshots = SnapshotIndex(snapshot)
+        delta_sink = open_sink(delta or delta_path_for(filename),
+                               headers + SNAPSHOT_FIELDS + [CHANGE_FIELD], output_format)
+        headers = headers + SNAPSHOT_FIELDS
+        rows = track_changes(rows, snapshots, "bestbuy", os.path.normpath(filename), delta_sink)
+    
+    # Write store data rows as they come; stores may be any iterable
+    try:
+        with open_sink(filename, headers, output_format) as sink:
+            total = write_rows(rows, sink)
+    finally:
+        if snapshots is not None:
+            delta_sink.close()
+            snapshots.close()
+    
+    print(f"Store data saved to {filename} with {total} records")
+    return total
+
+def enrich_stores(stores, enabled=True, cache=None, concurrency=4):
+    """Merge details page fields into stores when enabled (see enrichment.enrich_rows)"""
+    if not enabled or not stores:
+        return stores
+    from .enrichment import enrich_rows
+    return list(enrich_rows(stores, "bestbuy", concurrency=concurrency, cache=cache))
+
+# Candidate selectors for the store locator form, most specific first. A
+# SelectorCache races them and remembers which one the live page matches.
+ZIP_INPUT_SELECTORS = [
+    "input.zip-code-input",
+    "input[data-cy='ZipCodeInputComponent']",
+    "input[placeholder*='ZIP']",
+    "input[aria-label*='zip code']",
+    "input[title*='ZIP']"
+]
+
+UPDATE_BUTTON_SELECTORS = [
+    "button.location-zip-code-form-update-btn",
+    "button[data-cy='SubmitButton']",
+    "button[type='submit']",
+    "//button[contains(normalize-space(.), 'Update')]",
+    ".location-zip-code-form-update-btn"
+]
+
+def search_stores(driver, zip_code, extract_mode="js", compare_modes=False, cache=None, locator_url=STORE_LOCATOR_URL,
+                  selectors=None):
+    """Search the store locator for a ZIP code and extract the listed stores
+
+    With a PageCache, the rendered results are saved as a DOM snapshot so
+    they can be replayed later without a browser. locator_url overrides the
+    store locator page (the benchmarks point it at a local fixture site).
+    The form fields are found through a SelectorCache (the process-wide
+    one unless selectors is given).
+
+    Returns None when the search could not be run (the ZIP field or the
+    Update button was not found, or the form failed), and a list, empty
+    when the results loaded without any store cards, otherwise.
+    """
+    store_data = None
+    selectors = selectors or default_selector_cache()
+    
+    with telemetry.span("navigate", site="bestbuy"):
+        # Visit the Best Buy store locator
+        print(f"Opening Best Buy store locator: {locator_url}")
+        driver.get(locator_url)
+    
+        # Wait for the page to load
+        wait = WebDriverWait(driver, 20)
+        waiter = ReadinessWaiter(driver)
+        meter = NavigationMeter(driver)
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    
+        print("Page loaded successfully!")
+    
+        # Let the first load settle before refreshing
+        print("Waiting for the page to settle...")
+        waiter.wait("initial load", network_idle(), timeout=10)
+        meter.record("store locator")
+    
+        # Refresh the page
+        print("Refreshing the page...")
+        driver.refresh()
+    
+        # Wait for the page to load after refresh
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        print("Page refreshed successfully!")
+    
+        # Wait for any dynamic content to load
+        waiter.wait("refresh settled", network_idle(), timeout=3)
+        meter.record("refresh")
+    
+    # Find and fill the zip code input field
+    try:
+        print("Looking for zip code input field...")
+        
+        # Race every candidate selector at once, trying the last winner first
+        with telemetry.span("locate", site="bestbuy", element="zip_input"):
+            zip_input = selectors.find(driver, "bestbuy", "zip_input", ZIP_INPUT_SELECTORS)
+        
+        if zip_input:
+            # Clear any existing text and enter the ZIP code
+            zip_input.clear()
+            zip_input.send_keys(zip_code)
+            print(f"Entered '{zip_code}' in the zip code field")
+            
+            # Find and click the Update button
+            try:
+                print("Looking for Update button...")
+                
+                with telemetry.span("locate", site="bestbuy", element="update_button"):
+                    update_button = selectors.find(driver, "bestbuy", "update_button", UPDATE_BUTTON_SELECTORS)
+                
+                if update_button:
+                    # Remember the current results so we can tell when they are replaced
+                    first_store = next(iter(driver.find_elements(By.CSS_SELECTOR, "li.store")), None)
+                    
+                    with telemetry.span("search", site="bestbuy"):
+                        # Click the Update button
+                        update_button.click()
+                        print("Clicked the 'Update' button")
+                    
+                        # Wait for the store results for the new ZIP to render
+                        print("Waiting for store results to load...")
+                        waiter.wait("store results", EC.all_of(
+                            replaced(first_store),
+                            elements_present("li.store"),
+                            network_idle(),
+                        ), timeout=15)
+                        meter.record(f"results for {zip_code}")
+                    
+                    # Extract store data, counting the WebDriver round trips it costs
+                    print(f"Extracting store data ({extract_mode} mode)...")
+                    with CommandCounter(driver) as counter:
+                        with telemetry.span("extract", site="bestbuy", mode=extract_mode):
+                            store_data = EXTRACT_MODES[extract_mode](driver, wait)
+                        with telemetry.span("structured_data", site="bestbuy"):
+                            join_structured_data(driver, store_data)
+                    print(f"Extraction used {counter.summary()}")
+                    
+                    if cache is not None:
+                        with telemetry.span("snapshot", site="bestbuy"):
+                            cache.put(snapshot_url(zip_code), driver.page_source, kind="dom")
+                    
+                    if compare_modes:
+                        for mode in EXTRACT_MODES:
+                            if mode != extract_mode:
+                                with CommandCounter(driver) as other_counter:
+                                    other_data = EXTRACT_MODES[mode](driver, wait)
+                                print(f"{mode} mode extracted {len(other_data)} stores using {other_counter.summary()}")
+                    
+                else:
+                    print("Could not find Update button")
+                    
+            except Exception as e:
+                print(f"Error finding or clicking Update button: {e}")
+                telemetry.swallowed("bestbuy.update_button", e)
+                
+        else:
+            print("Could not find zip code input field")
+            
+    except Exception as e:
+        print(f"Error finding or filling zip code input: {e}")
+        telemetry.swallowed("bestbuy.zip_input", e)
+    
+    print(waiter.report())
+    print(f"Page weight: {meter.summary()}")
+    return store_data
+
+def run(args):
+    """Run the store search described by the parsed command line and save the stores"""
+    cache = open_cache(args) if args.cache or args.replay else None
+    
+    if args.replay:
+        store_data = replay_from_cache(cache, args.zip_code)
+        if store_data:
+            save_store_data_to_csv(enrich_stores(store_data, args.enrich, cache), args.output, args.format,
+                                   args.snapshot, args.delta)
+        return
+    
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = CheckpointStore(args.checkpoint).search("bestbuy", "stores", args.zip_code, None)
+        store_data = checkpoint.get_rows()
+        if store_data is not None:
+            print(f"ZIP {args.zip_code} already completed - loaded {len(store_data)} stores from the checkpoint")
+            save_store_data_to_csv(enrich_stores(store_data, args.enrich, cache), args.output, args.format,
+                                   args.snapshot, args.delta)
+            return
+    
+    if args.engine == "api":
+        client = StoreApiClient(args.api_key, args.api_url, page_size=args.page_size)
+        store_data = client.search(args.zip_code, args.radius)
+        if checkpoint is not None:
+            checkpoint.mark_done(1, store_data, final=True)
+        if store_data:
+            save_store_data_to_csv(enrich_stores(store_data, args.enrich, cache), args.output, args.format,
+                                   args.snapshot, args.delta)
+        return
+    
+    driver = create_driver(**browser_options(args))
+    
+    try:
+        selectors = SelectorCache(args.selector_cache)
+        store_data = search_stores(driver, args.zip_code, args.extract_mode, args.compare_modes, cache,
+                                   selectors=selectors)
+        selectors.save()
+        print(selectors.summary())
+        if store_data is None:
+            print(f"The store search for ZIP {args.zip_code} could not be run")
+        elif checkpoint is not None:
+            # No stores in range is a finished search too, so it is not repeated
+            checkpoint.mark_done(1, store_data, final=True)
+        
+        # Save data to CSV file
+        if store_data:
+            save_store_data_to_csv(enrich_stores(store_data, args.enrich, cache), args.output, args.format,
+                                   args.snapshot, args.delta)
+            print(f"Extracted {len(store_data)} stores and saved to {args.output}")
+        
+        # Keep the browser open for inspection when requested
+        if args.keep_open:
+            input("Press Enter to close the browser...")
+        
+    finally:
+        # Close the browser
+        driver.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Best Buy store locations from the store locator")
+    parser.add_argument("--zip", dest="zip_code", default="10001", help="ZIP code to search around")
+    add_api_arguments(parser)
+    parser.add_argument("--extract-mode", choices=sorted(EXTRACT_MODES), default="js",
+                        help="js collects every store card in one script call, dom queries each field")
+    parser.add_argument("--compare-modes", action="store_true",
+                        help="Also run the other extraction mode and print its WebDriver command count")
+    parser.add_argument("--keep-open", action="store_true", help="Keep Chrome open until Enter is pressed")
+    add_browser_arguments(parser)
+    parser.add_argument("--cache", action="store_true", help="Save rendered results as DOM snapshots on disk")
+    add_cache_arguments(parser)
+    parser.add_argument("--replay", action="store_true",
+                        help="Extract from the cached snapshot for --zip - no browser")
+    parser.add_argument("--checkpoint", nargs="?", const=DEFAULT_CHECKPOINT_PATH,
+                        help=f"Reuse the stores of an earlier finished run for this ZIP (default file: {DEFAULT_CHECKPOINT_PATH})")
+    parser.add_argument("--selector-cache", default=DEFAULT_SELECTOR_CACHE_PATH,
+                        help="File remembering which fallback selector matched the store locator form")
+    parser.add_argument("--output", default="bestbuy_stores.csv", help="File to write the stores to")
+    parser.add_argument("--enrich", action="store_true",
+                        help="Fetch each store's details page for phone, weekly hours and coordinates")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default=None,
+                        help="Output format (default: taken from the --output extension)")
+    parser.add_argument("--snapshot", nargs="?", const=DEFAULT_SNAPSHOT_PATH,
+                        help=f"Compare with the previous run of this export and write a delta file (default index: {DEFAULT_SNAPSHOT_PATH})")
+    parser.add_argument("--delta", help="Delta file for --snapshot (default: <output>.delta.<ext>)")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+    if api_key_required(args):
+        parser.error("--engine api needs --api-key or the BESTBUY_API_KEY environment variable")
+    
+    try:
+        with profiled(args.profile):
+            run(args)
+    finally:
+        export_telemetry(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import asyncio
+import os
+import time
+from urllib.parse import quote, urlsplit
+
+from .http_client import TokenBucket, create_session
+from .structured_data import format_hours
+from .telemetry import telemetry
+
+# Best Buy Stores API: every store within RADIUS miles of ZIP, nearest first
+STORES_API_URL = "https://api.bestbuy.com/v1/stores(area({zip_code},{radius}))"
+
+# Environment variable holding the developer API key
+API_KEY_ENV = "BESTBUY_API_KEY"
+
+# The API returns at most 100 stores per page
+MAX_PAGE_SIZE = 100
+
+STORE_DETAILS_URL = "https://stores.bestbuy.com/{store_id}"
+
+
+def store_from_api(store):
+    """Map one Stores API store onto the columns save_store_data_to_csv writes
+
+    Distances are formatted like the locator's ("0.5 miles away"), so
+    rows from both sources merge and sort the same way.
+    """
+    street_address = ", ".join(part for part in (store.get("address"), store.get("address2")) if part)
+    region = " ".join(part for part in (store.get("region"), store.get("postalCode")) if part)
+    city_state_zip = ", ".join(part for part in (store.get("city"), region) if part)
+
+    row = {
+        "store_id": str(store.get("storeId")),
+        "store_name": store.get("longName") or store.get("name") or "Store name not found",
+        "distance": f"{store['distance']:g} miles away" if store.get("distance") is not None else "Distance not found",
+        "street_address": street_address or "Address not found",
+        "city_state_zip": city_state_zip or "City/State/ZIP not found",
+        "full_address": ", ".join(part for part in (street_address, city_state_zip) if part) or "Full address not found",
+        "hours": store.get("hoursAmPm") or store.get("hours") or "Hours not found",
+        "details_url": STORE_DETAILS_URL.format(store_id=store.get("storeId")),
+        "phone": store.get("phone") or "Phone not found",
+    }
+    weekly_hours = format_hours(store.get("detailedHours"))
+    if weekly_hours:
+        row["weekly_hours"] = weekly_hours
+    if store.get("lat") is not None and store.get("lng") is not None:
+        row["latitude"] = float(store["lat"])
+        row["longitude"] = float(store["lng"])
+    return row
+
+
+class StoreApiClient:
+    """Look up Best Buy stores around a ZIP with one JSON request per page of results
+
+    All requests share one pooled session, and the optional token bucket
+    limits them to `rate` per second across threads. api_url is a
+    template with {zip_code} and {radius} (the benchmarks point it at the
+    fixture server). The key defaults to the BESTBUY_API_KEY environment
+    variable; it is sent as a query parameter and left out of telemetry.
+    """
+
+    def __init__(self, api_key=None, api_url=STORES_API_URL, session=None, page_size=MAX_PAGE_SIZE, rate=None,
+                 timeout=30, pool_size=10):
+        self.api_key = api_key or os.environ.get(API_KEY_ENV)
+        if not self.api_key:
+            raise ValueError(f"A Best Buy API key is required - pass --api-key or set {API_KEY_ENV}")
+        self.api_url = api_url
+        self.session = session or create_session(pool_size=pool_size)
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+        self.bucket = TokenBucket(rate) if rate else None
+        self.timeout = timeout
+
+    def fetch_page(self, zip_code, radius, page):
+        """Return the decoded JSON of one page of stores"""
+        url = self.api_url.format(zip_code=quote(str(zip_code)), radius=f"{float(radius):g}")
+        params = {"format": "json", "page": page, "pageSize": self.page_size, "apiKey": self.api_key}
+        if self.bucket:
+            self.bucket.acquire()
+
+        host = urlsplit(url).netloc
+        with telemetry.span("fetch", site="bestbuy", host=host, url=url):
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        telemetry.count("http_responses", host=host, status=response.status_code)
+        telemetry.count("bytes_fetched", len(response.content), host=host)
+        response.raise_for_status()
+        return response.json()
+
+    def iter_stores(self, zip_code, radius=25):
+        """Yield every store within radius miles of a ZIP as a store row, nearest first"""
+        page = 1
+        while True:
+            data = self.fetch_page(zip_code, radius, page)
+            stores = data.get("stores") or []
+            for store in stores:
+                yield store_from_api(store)
+            if not stores or page >= (data.get("totalPages") or 1):
+                break
+            page += 1
+
+    def search(self, zip_code, radius=25):
+        """Return the store rows for one ZIP"""
+        start = time.perf_counter()
+        stores = list(self.iter_stores(zip_code, radius))
+        elapsed = time.perf_counter() - start
+        telemetry.record("zip", elapsed, site="bestbuy", zip=zip_code)
+        print(f"Found {len(stores)} store(s) within {float(radius):g} miles of {zip_code} in {elapsed * 1000:.0f}ms")
+        return stores
+
+    def search_many(self, zip_codes, radius=25, concurrency=4):
+        """Search many ZIPs, at most concurrency at a time
+
+        Returns {zip_code: stores} for the ZIPs that succeeded; failures
+        are printed and counted, and left out.
+        """
+        async def search_all():
+            limit = asyncio.Semaphore(concurrency)
+
+            async def search_one(zip_code):
+                async with limit:
+                    return await asyncio.to_thread(self.search, zip_code, radius)
+
+            return await asyncio.gather(*(search_one(zip_code) for zip_code in zip_codes), return_exceptions=True)
+
+        results = {}
+        for zip_code, stores in zip(zip_codes, asyncio.run(search_all())):
+            if isinstance(stores, Exception):
+                print(f"Store API request failed for ZIP {zip_code}: {stores}")
+                telemetry.count("zips_failed", site="bestbuy")
+                continue
+            results[zip_code] = stores
+        return results
+
+
+def add_api_arguments(parser):
+    """Add the --engine api options shared by the Best Buy command lines"""
+    parser.add_argument("--engine", choices=["browser", "api"], default="browser",
+                        help="browser drives the store locator page, api calls the Best Buy Stores API (no Chrome)")
+    parser.add_argument("--radius", type=float, default=25, help="Search radius in miles for --engine api")
+    parser.add_argument("--api-key", help=f"Best Buy API key for --engine api (default: ${API_KEY_ENV})")
+    parser.add_argument("--api-url", default=STORES_API_URL,
+                        help="Stores API URL template with {zip_code} and {radius}")
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE, help="Stores per API request")
+
+
+def api_key_required(args):
+    """True when --engine api was chosen without a key on the command line or in the environment"""
+    return args.engine == "api" and not (args.api_key or os.environ.get(API_KEY_ENV))
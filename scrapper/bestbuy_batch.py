@@ -0,0 +1,271 @@
+import argparse
+import queue
+import re
+import threading
+import time
+
+from .bestbuy_api import StoreApiClient, add_api_arguments, api_key_required
+from .browser import add_browser_arguments, browser_options
+from .bestBut_scrapper import EXTRACT_MODES, enrich_stores, replay_from_cache, save_store_data_to_csv, search_stores
+from .coverage import load_zip_codes
+from .checkpoints import DEFAULT_CHECKPOINT_PATH, CheckpointStore
+from .page_cache import add_cache_arguments, open_cache
+from .selector_cache import DEFAULT_SELECTOR_CACHE_PATH, SelectorCache
+from .sessions import SessionManager
+from .snapshots import DEFAULT_SNAPSHOT_PATH
+from .telemetry import add_telemetry_arguments, export_telemetry, profiled, telemetry
+
+
+def parse_distance(distance):
+    """Turn '0.5 miles away' into 0.5, or infinity when it cannot be parsed"""
+    match = re.search(r"[\d.]+", distance or "")
+    try:
+        return float(match.group()) if match else float("inf")
+    except ValueError:
+        return float("inf")
+
+
+def merge_stores(store_batches):
+    """Merge per-ZIP store lists, keeping the nearest sighting of each store_id"""
+    merged = {}
+    for stores in store_batches:
+        for store in stores:
+            store_id = store.get("store_id")
+            if not store_id:
+                continue
+            current = merged.get(store_id)
+            if current is None or parse_distance(store.get("distance")) < parse_distance(current.get("distance")):
+                merged[store_id] = store
+    return list(merged.values())
+
+
+class StoreLocatorWorker(threading.Thread):
+    """Worker that pulls ZIPs from the queue and runs them on warm Chrome sessions
+
+    Sessions come from a shared SessionManager, so a worker keeps reusing
+    the same browser until it is recycled (after max_uses or on memory
+    growth) or fails.
+    """
+
+    def __init__(self, worker_id, zip_queue, results, sessions, extract_mode="js", cache=None, checkpoints=None,
+                 selectors=None):
+        super().__init__(name=f"bestbuy-worker-{worker_id}", daemon=True)
+        self.worker_id = worker_id
+        self.zip_queue = zip_queue
+        self.results = results
+        self.sessions = sessions
+        self.extract_mode = extract_mode
+        self.cache = cache
+        self.checkpoints = checkpoints
+        self.selectors = selectors
+        self.stats = {
+            "worker": worker_id,
+            "zips_processed": 0,
+            "zips_resumed": 0,
+            "zips_failed": 0,
+            "stores_found": 0,
+            "driver_launches": 0,
+            "busy_seconds": 0.0,
+        }
+
+    def run(self):
+        while True:
+            try:
+                zip_code = self.zip_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            start = time.perf_counter()
+            try:
+                self.run_zip(zip_code)
+            except Exception as e:
+                # One bad ZIP must not stop the worker and strand the ZIPs still queued
+                print(f"[worker {self.worker_id}] ZIP {zip_code} failed: {e}")
+                self.stats["zips_failed"] += 1
+                telemetry.count("zips_failed", site="bestbuy")
+            finally:
+                elapsed = time.perf_counter() - start
+                self.stats["busy_seconds"] += elapsed
+                telemetry.record("zip", elapsed, site="bestbuy", zip=zip_code)
+                self.zip_queue.task_done()
+
+    def run_zip(self, zip_code):
+        """Scrape one ZIP, or load it from the checkpoint, raising if the search could not be run"""
+        checkpoint = None
+        if self.checkpoints is not None:
+            checkpoint = self.checkpoints.search("bestbuy", "stores", zip_code, None)
+            stores = checkpoint.get_rows()
+            if stores is not None:
+                self.results[zip_code] = stores
+                self.stats["zips_resumed"] += 1
+                return
+
+        session = self.sessions.acquire()
+        if session.fresh:
+            self.stats["driver_launches"] += 1
+        failed = False
+        try:
+            stores = search_stores(session.driver, zip_code, self.extract_mode, cache=self.cache,
+                                   selectors=self.selectors)
+        except Exception:
+            # A crashed or wedged browser gets replaced for the next ZIP
+            failed = True
+            raise
+        finally:
+            self.sessions.release(session, discard=failed)
+
+        if stores is None:
+            raise RuntimeError("the store search could not be run")
+        self.results[zip_code] = stores
+        if checkpoint is not None:
+            # No stores in range is a finished search too, so a re-run does not repeat it
+            checkpoint.mark_done(1, stores, final=True)
+        self.stats["zips_processed"] += 1
+        self.stats["stores_found"] += len(stores)
+
+
+def run_batch(zip_codes, workers=4, extract_mode="js", headless=True, cache=None, checkpoints=None,
+              browser_options=None, sessions=None, max_uses=50, selectors=None):
+    """Scrape many ZIP codes with a pool of Chrome workers
+
+    Returns the merged, de-duplicated stores and per-worker statistics.
+    ZIPs already finished in the CheckpointStore are loaded, not scraped.
+    Pass a SessionManager to keep its browsers warm for later batches;
+    otherwise one is created for this batch and closed at the end. All
+    workers share one SelectorCache, so a selector learned by one is used
+    by the others.
+    """
+    own_sessions = sessions is None
+    if own_sessions:
+        sessions = SessionManager(max_sessions=workers, max_uses=max_uses, headless=headless,
+                                  **(browser_options or {}))
+    zip_queue = queue.Queue()
+    for zip_code in zip_codes:
+        zip_queue.put(zip_code)
+
+    results = {}
+    pool = [
+        StoreLocatorWorker(worker_id, zip_queue, results, sessions, extract_mode, cache, checkpoints, selectors)
+        for worker_id in range(1, min(workers, len(zip_codes)) + 1)
+    ]
+
+    start = time.perf_counter()
+    for worker in pool:
+        worker.start()
+    for worker in pool:
+        worker.join()
+    if own_sessions:
+        sessions.close()
+    elapsed = time.perf_counter() - start
+
+    # Merge in input order so the output is stable across runs
+    stores = merge_stores(results[zip_code] for zip_code in zip_codes if zip_code in results)
+
+    worker_stats = []
+    for worker in pool:
+        stats = dict(worker.stats)
+        busy = stats["busy_seconds"]
+        stats["busy_seconds"] = round(busy, 2)
+        stats["zips_per_minute"] = round(stats["zips_processed"] * 60 / busy, 2) if busy else 0.0
+        worker_stats.append(stats)
+
+    print(f"Processed {len(results)}/{len(zip_codes)} ZIP codes with {len(pool)} worker(s) in {elapsed:.1f}s")
+    for stats in worker_stats:
+        print(f"  worker {stats['worker']}: {stats['zips_processed']} ZIPs ({stats['zips_failed']} failed, "
+              f"{stats['zips_resumed']} from checkpoint), "
+              f"{stats['stores_found']} stores, {stats['zips_per_minute']} ZIPs/min, "
+              f"{stats['driver_launches']} Chrome launch(es)")
+
+    return stores, worker_stats
+
+
+def run_api_batch(zip_codes, client, radius=25, concurrency=4, checkpoints=None):
+    """Look up many ZIP codes through the Stores API instead of Chrome
+
+    Returns the merged, de-duplicated stores. ZIPs already finished in the
+    CheckpointStore are loaded, not requested.
+    """
+    results = {}
+    pending = []
+    for zip_code in zip_codes:
+        stores = checkpoints.search("bestbuy", "stores", zip_code, None).get_rows() if checkpoints else None
+        if stores is not None:
+            results[zip_code] = stores
+        else:
+            pending.append(zip_code)
+
+    start = time.perf_counter()
+    fetched = client.search_many(pending, radius, concurrency)
+    elapsed = time.perf_counter() - start
+    for zip_code, stores in fetched.items():
+        if checkpoints is not None:
+            checkpoints.search("bestbuy", "stores", zip_code, None).mark_done(1, stores, final=True)
+    results.update(fetched)
+
+    print(f"Processed {len(results)}/{len(zip_codes)} ZIP codes through the Stores API in {elapsed:.1f}s "
+          f"({len(zip_codes) - len(pending)} from checkpoint, {len(pending) - len(fetched)} failed)")
+    return merge_stores(results[zip_code] for zip_code in zip_codes if zip_code in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Best Buy stores for many ZIP codes with a pool of headless Chrome workers")
+    parser.add_argument("--zips", nargs="*", default=[], help="ZIP codes to search")
+    parser.add_argument("--zips-file", help="File with one ZIP code per line, or a plan from plan_coverage.py")
+    add_api_arguments(parser)
+    parser.add_argument("--workers", type=int, default=4, help="Number of Chrome workers (or concurrent API requests)")
+    parser.add_argument("--rate", type=float, default=None, help="API requests per second for --engine api")
+    parser.add_argument("--extract-mode", choices=sorted(EXTRACT_MODES), default="js")
+    parser.add_argument("--headed", action="store_true", help="Show the browser windows instead of running headless")
+    parser.add_argument("--max-uses", type=int, default=50, help="Restart each Chrome after this many ZIPs")
+    add_browser_arguments(parser)
+    parser.add_argument("--output", default="bestbuy_stores.csv", help="File to write the merged stores to")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default=None,
+                        help="Output format (default: taken from the --output extension)")
+    parser.add_argument("--cache", action="store_true", help="Save rendered results as DOM snapshots on disk")
+    add_cache_arguments(parser)
+    parser.add_argument("--enrich", action="store_true",
+                        help="Fetch each merged store's details page for phone, weekly hours and coordinates")
+    parser.add_argument("--replay", action="store_true", help="Extract from cached snapshots only - no browser")
+    parser.add_argument("--checkpoint", nargs="?", const=DEFAULT_CHECKPOINT_PATH,
+                        help=f"Record finished ZIPs and skip them when the batch is re-run (default file: {DEFAULT_CHECKPOINT_PATH})")
+    parser.add_argument("--snapshot", nargs="?", const=DEFAULT_SNAPSHOT_PATH,
+                        help=f"Compare with the previous run of this export and write a delta file (default index: {DEFAULT_SNAPSHOT_PATH})")
+    parser.add_argument("--delta", help="Delta file for --snapshot (default: <output>.delta.<ext>)")
+    parser.add_argument("--selector-cache", default=DEFAULT_SELECTOR_CACHE_PATH,
+                        help="File remembering which fallback selector matched the store locator form")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+
+    zip_codes = load_zip_codes(args.zips, args.zips_file)
+    if not zip_codes:
+        parser.error("no ZIP codes given - use --zips and/or --zips-file")
+    if api_key_required(args):
+        parser.error("--engine api needs --api-key or the BESTBUY_API_KEY environment variable")
+
+    # cProfile only sees the main thread; the workers show up in the telemetry spans
+    try:
+        with profiled(args.profile):
+            cache = open_cache(args) if args.cache or args.replay else None
+            if args.replay:
+                stores = merge_stores(replay_from_cache(cache, zip_code) for zip_code in zip_codes)
+            elif args.engine == "api":
+                checkpoints = CheckpointStore(args.checkpoint) if args.checkpoint else None
+                client = StoreApiClient(args.api_key, args.api_url, page_size=args.page_size, rate=args.rate,
+                                        pool_size=args.workers)
+                stores = run_api_batch(zip_codes, client, args.radius, args.workers, checkpoints)
+            else:
+                checkpoints = CheckpointStore(args.checkpoint) if args.checkpoint else None
+                selectors = SelectorCache(args.selector_cache)
+                stores, _ = run_batch(zip_codes, args.workers, args.extract_mode, not args.headed, cache, checkpoints,
+                                      browser_options(args), max_uses=args.max_uses, selectors=selectors)
+                selectors.save()
+                print(selectors.summary())
+            # Enrich after merging so each store's details page is fetched once
+            stores = enrich_stores(stores, args.enrich, cache, concurrency=args.workers)
+            save_store_data_to_csv(stores, args.output, args.format, args.snapshot, args.delta)
+    finally:
+        export_telemetry(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+from collections import Counter
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from .telemetry import instrument_driver
+
+
+# Request patterns the lean profile blocks through CDP: images, fonts, media
+# and the usual ad/analytics hosts. Matching is done by Chrome (`*` wildcards).
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg",
+    "*doubleclick.net*", "*googlesyndication.com*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*googletagservices.com*", "*adservice.google.*", "*facebook.net*", "*facebook.com/tr*",
+    "*hotjar.com*", "*optimizely.com*", "*quantserve.com*", "*scorecardresearch.com*", "*criteo.*",
+    "*taboola.com*", "*outbrain.com*", "*amazon-adsystem.com*", "*adnxs.com*", "*pubmatic.com*",
+    "*rubiconproject.com*", "*moatads.com*", "*demdex.net*", "*omtrdc.net*", "*tiqcdn.com*",
+]
+
+BROWSER_PROFILES = ["default", "lean"]
+
+
+def create_driver(headless=False, profile="default", blocked_urls=None, allowed_hosts=None):
+    """Create a Chrome driver using the chromedriver in the working directory, if there is one
+
+    The "lean" profile runs headless with images disabled and blocks the
+    requests matching LEAN_BLOCKED_URLS plus blocked_urls. When
+    allowed_hosts is given, every other host fails to resolve, which cuts
+    off all third-party requests (entries may be "example.com" or
+    "*.example.com").
+    """
+    # Get the path to chromedriver in the root directory
+    chrome_driver_path = os.path.join(os.getcwd(), "chromedriver.exe")
+
+    # Create a Service object; without a local chromedriver Selenium Manager finds one
+    service = Service(chrome_driver_path) if os.path.exists(chrome_driver_path) else Service()
+
+    lean = profile == "lean"
+    options = webdriver.ChromeOptions()
+    if headless or lean:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1366,900")
+    if lean:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_argument("--disable-background-networking")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    if allowed_hosts:
+        exclusions = ", ".join(f"EXCLUDE {host}" for host in allowed_hosts)
+        options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND, {exclusions}")
+
+    # Create Chrome driver instance; its commands are counted in telemetry
+    driver = instrument_driver(webdriver.Chrome(service=service, options=options))
+
+    blocked = (LEAN_BLOCKED_URLS if lean else []) + list(blocked_urls or [])
+    if blocked:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+    # Keep every resource timing entry so NavigationMeter can sum page weight
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": "performance.setResourceTimingBufferSize(5000);"
+    })
+    return driver
+
+
+def add_browser_arguments(parser):
+    """Add the --browser-profile, --block and --allow-host options to a CLI parser"""
+    parser.add_argument("--browser-profile", choices=BROWSER_PROFILES, default="default",
+                        help="lean runs headless without images, fonts, media, ads or trackers")
+    parser.add_argument("--block", action="append", default=[], metavar="PATTERN",
+                        help="Extra URL pattern to block, e.g. '*.css' (repeatable)")
+    parser.add_argument("--allow-host", action="append", default=[], metavar="HOST",
+                        help="Only let Chrome reach these hosts, e.g. '*.bestbuy.com' (repeatable)")
+
+
+def browser_options(args):
+    """Turn the options added by add_browser_arguments into create_driver keyword arguments"""
+    return {
+        "profile": args.browser_profile,
+        "blocked_urls": args.block,
+        "allowed_hosts": args.allow_host,
+    }
+
+
+# Reads the navigation and resource timing entries recorded since the last
+# call and clears the resource buffer for the next navigation
+PAGE_WEIGHT_SCRIPT = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+performance.clearResourceTimings();
+return {
+    url: location.href,
+    navigation: nav ? nav.name + "@" + performance.timeOrigin : null,
+    navigation_bytes: nav ? nav.transferSize : 0,
+    load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    resource_bytes: resources.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+    requests: resources.length + (nav ? 1 : 0),
+};
+"""
+
+
+class NavigationMeter:
+    """Record bytes transferred and load time for each page the driver shows
+
+    Sizes come from the Resource Timing API. Cross-origin responses without
+    Timing-Allow-Origin report 0 bytes, so totals are a lower bound, which
+    is still fine for comparing browser profiles on the same site.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.navigations = []
+        self._last_navigation = None
+
+    def record(self, label):
+        try:
+            weight = self.driver.execute_script(PAGE_WEIGHT_SCRIPT)
+        except Exception as e:
+            print(f"Could not read page weight: {e}")
+            return None
+
+        # Clicks that update the page in place only add resource traffic
+        new_document = weight["navigation"] != self._last_navigation
+        self._last_navigation = weight["navigation"]
+        entry = {
+            "label": label,
+            "url": weight["url"],
+            "bytes": weight["resource_bytes"] + (weight["navigation_bytes"] if new_document else 0),
+            "requests": weight["requests"] if new_document else weight["requests"] - 1,
+            "load_ms": round(weight["load_ms"], 1) if new_document and weight["load_ms"] else None,
+        }
+        self.navigations.append(entry)
+        load = f"{entry['load_ms'] / 1000:.2f}s load, " if entry["load_ms"] is not None else ""
+        print(f"[{label}] {load}{entry['bytes'] / 1024:.0f} KB over {entry['requests']} request(s)")
+        return entry
+
+    def summary(self):
+        total_bytes = sum(entry["bytes"] for entry in self.navigations)
+        load_times = [entry["load_ms"] for entry in self.navigations if entry["load_ms"] is not None]
+        average = f", {sum(load_times) / len(load_times) / 1000:.2f}s average load" if load_times else ""
+        return f"{len(self.navigations)} page(s), {total_bytes / 1024:.0f} KB transferred{average}"
+
+
+class CommandCounter:
+    """Count the WebDriver commands sent while the context is active
+
+    Every command is one round trip to chromedriver (and to the remote
+    browser when Chrome runs in a container or grid), so this is the
+    number to watch when comparing extraction strategies.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.counts = Counter()
+        self._original_execute = None
+
+    def __enter__(self):
+        self._original_execute = self.driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.counts[driver_command] += 1
+            return self._original_execute(driver_command, params)
+
+        self.driver.execute = counting_execute
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.driver.execute = self._original_execute
+        return False
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def summary(self):
+        """Return a one-line description of the commands sent"""
+        breakdown = ", ".join(f"{name}={count}" for name, count in self.counts.most_common())
+        return f"{self.total} WebDriver command(s) ({breakdown})" if self.total else "0 WebDriver commands"
@@ -0,0 +1,128 @@
+import json
+import sqlite3
+import threading
+import time
+
+DEFAULT_CHECKPOINT_PATH = "crawl_checkpoints.sqlite3"
+
+
+class CheckpointStore:
+    """Durable record of finished crawl units and the rows they produced
+
+    A unit is one (site, query, zip_code, radius, page). Restarted runs read
+    the rows of finished units back instead of scraping them again and pick
+    up at the first unfinished page.
+    """
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS units (
+                site TEXT NOT NULL,
+                query TEXT NOT NULL,
+                zip_code TEXT NOT NULL,
+                radius TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                rows TEXT NOT NULL,
+                final INTEGER NOT NULL DEFAULT 0,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (site, query, zip_code, radius, page)
+            )
+        """)
+        self.db.commit()
+
+    @staticmethod
+    def _key(site, query, zip_code, radius):
+        # radius is stored as text so sites without one still form a unique key
+        return (site, query or "", str(zip_code), "" if radius is None else str(radius))
+
+    def mark_done(self, site, query, zip_code, radius, page, rows, final=False):
+        """Record a finished unit; final marks the last page of its result set"""
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO units VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._key(site, query, zip_code, radius) + (page, json.dumps(rows), int(final), time.time()))
+            self.db.commit()
+
+    def mark_final(self, site, query, zip_code, radius, page):
+        with self.lock:
+            self.db.execute(
+                "UPDATE units SET final = 1 WHERE site = ? AND query = ? AND zip_code = ? AND radius = ? AND page = ?",
+                self._key(site, query, zip_code, radius) + (page,))
+            self.db.commit()
+
+    def completed_pages(self, site, query, zip_code, radius):
+        """Return {page: (rows, final)} for every finished page of a search"""
+        with self.lock:
+            result = self.db.execute(
+                "SELECT page, rows, final FROM units WHERE site = ? AND query = ? AND zip_code = ? AND radius = ?",
+                self._key(site, query, zip_code, radius)).fetchall()
+        return {page: (json.loads(rows), bool(final)) for page, rows, final in result}
+
+    def resume_point(self, site, query, zip_code, radius):
+        """Return (rows from the finished leading pages, next page to scrape or None if complete)"""
+        completed = self.completed_pages(site, query, zip_code, radius)
+        rows = []
+        page = 1
+        while page in completed:
+            page_rows, final = completed[page]
+            rows.extend(page_rows)
+            if final:
+                return rows, None
+            page += 1
+        return rows, page
+
+    def get_rows(self, site, query, zip_code, radius, page=1):
+        """Return the rows of a finished unit, or None if it has not been completed"""
+        with self.lock:
+            result = self.db.execute(
+                "SELECT rows FROM units WHERE site = ? AND query = ? AND zip_code = ? AND radius = ? AND page = ?",
+                self._key(site, query, zip_code, radius) + (page,)).fetchone()
+        return json.loads(result[0]) if result else None
+
+    def clear(self, site, query=None, zip_code=None, radius=None):
+        """Forget finished units for a site, optionally narrowed to one search"""
+        query_sql = "DELETE FROM units WHERE site = ?"
+        params = [site]
+        if query is not None:
+            query_sql += " AND query = ? AND zip_code = ? AND radius = ?"
+            params.extend(self._key(site, query, zip_code, radius)[1:])
+        with self.lock:
+            self.db.execute(query_sql, params)
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def search(self, site, query, zip_code, radius):
+        """Return a SearchCheckpoint bound to one search"""
+        return SearchCheckpoint(self, site, query, zip_code, radius)
+
+
+class SearchCheckpoint:
+    """CheckpointStore view for the pages of a single search"""
+
+    def __init__(self, store, site, query, zip_code, radius):
+        self.store = store
+        self.search_key = (site, query, zip_code, radius)
+
+    def mark_done(self, page, rows, final=False):
+        self.store.mark_done(*self.search_key, page, rows, final)
+
+    def mark_final(self, page):
+        self.store.mark_final(*self.search_key, page)
+
+    def completed_pages(self):
+        return self.store.completed_pages(*self.search_key)
+
+    def resume_point(self):
+        return self.store.resume_point(*self.search_key)
+
+    def get_rows(self, page=1):
+        return self.store.get_rows(*self.search_key, page)
+
+    def clear(self):
+        self.store.clear(*self.search_key)
@@ -0,0 +1,277 @@
+import argparse
+import bisect
+import csv
+import heapq
+import json
+import math
+import os
+import time
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.0
+
+# Public-domain source for the centroid table (tab separated, no state column)
+GAZETTEER_URL = "https://www2.census.gov/geo/docs/maps-data/data/gazetteer/2023_Gazetteer/2023_Gaz_zcta_national.zip"
+
+# USPS 3-digit ZIP prefix ranges and the state they belong to, so tables
+# without a state column (such as the Gazetteer file) still work with --states.
+# Military (AA/AE/AP) and unassigned prefixes are left out.
+ZIP_PREFIX_STATES = [
+    (5, 5, "NY"), (6, 7, "PR"), (8, 8, "VI"), (9, 9, "PR"), (10, 27, "MA"), (28, 29, "RI"), (30, 38, "NH"),
+    (39, 49, "ME"), (50, 54, "VT"), (55, 55, "MA"), (56, 59, "VT"), (60, 69, "CT"), (70, 89, "NJ"),
+    (100, 149, "NY"), (150, 196, "PA"), (197, 199, "DE"), (200, 200, "DC"), (201, 201, "VA"), (202, 205, "DC"),
+    (206, 219, "MD"), (220, 246, "VA"), (247, 268, "WV"), (270, 289, "NC"), (290, 299, "SC"), (300, 319, "GA"),
+    (320, 339, "FL"), (341, 349, "FL"), (350, 369, "AL"), (370, 385, "TN"), (386, 397, "MS"), (398, 399, "GA"),
+    (400, 427, "KY"), (430, 459, "OH"), (460, 479, "IN"), (480, 499, "MI"), (500, 528, "IA"), (530, 549, "WI"),
+    (550, 567, "MN"), (569, 569, "DC"), (570, 577, "SD"), (580, 588, "ND"), (590, 599, "MT"), (600, 629, "IL"),
+    (630, 658, "MO"), (660, 679, "KS"), (680, 693, "NE"), (700, 715, "LA"), (716, 729, "AR"), (730, 732, "OK"),
+    (733, 733, "TX"), (734, 749, "OK"), (750, 799, "TX"), (800, 816, "CO"), (820, 831, "WY"), (832, 838, "ID"),
+    (840, 847, "UT"), (850, 865, "AZ"), (870, 884, "NM"), (885, 885, "TX"), (889, 898, "NV"), (900, 961, "CA"),
+    (967, 968, "HI"), (969, 969, "GU"), (970, 979, "OR"), (980, 994, "WA"), (995, 999, "AK"),
+]
+_PREFIX_STARTS = [low for low, _, _ in ZIP_PREFIX_STATES]
+
+
+def state_for_zip(zip_code):
+    """Return the state of a ZIP code from its 3-digit prefix, or None"""
+    try:
+        prefix = int(str(zip_code).zfill(5)[:3])
+    except ValueError:
+        return None
+    position = bisect.bisect_right(_PREFIX_STARTS, prefix) - 1
+    if position >= 0:
+        low, high, state = ZIP_PREFIX_STATES[position]
+        if low <= prefix <= high:
+            return state
+    return None
+
+
+def load_zip_codes(zip_codes=None, zip_file=None):
+    """Collect ZIP codes from the command line and/or a file (one per line, # comments allowed, or a JSON plan)"""
+    collected = list(zip_codes or [])
+    if zip_file and zip_file.endswith(".json"):
+        # A JSON coverage plan written by write_plan
+        with open(zip_file, encoding="utf-8") as f:
+            collected.extend(centre["zip"] for centre in json.load(f)["centres"])
+    elif zip_file:
+        with open(zip_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    collected.extend(part.strip() for part in line.split(",") if part.strip())
+
+    # Keep the first occurrence of each ZIP, preserving order
+    return list(dict.fromkeys(collected))
+
+
+def load_centroids(path):
+    """Load ZIP centroids as {zip: (lat, lng, state)}
+
+    Accepts a CSV with zip, lat/latitude, lng/lon/longitude and optional
+    state columns, or the Census Gazetteer ZCTA file (tab separated, GEOID,
+    INTPTLAT, INTPTLONG). Without a state column the state is taken from
+    the ZIP prefix.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.readline()
+        f.seek(0)
+        reader = csv.DictReader(f, delimiter="\t" if "\t" in sample else ",")
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+
+        def column(*names):
+            for name in names:
+                if name in fields:
+                    return fields[name]
+            return None
+
+        zip_column = column("zip", "zip_code", "zipcode", "geoid", "zcta5")
+        lat_column = column("lat", "latitude", "intptlat")
+        lng_column = column("lng", "lon", "long", "longitude", "intptlong")
+        state_column = column("state", "state_code", "usps")
+        if not (zip_column and lat_column and lng_column):
+            raise ValueError(f"{path} needs zip, latitude and longitude columns")
+
+        centroids = {}
+        for row in reader:
+            try:
+                lat = float(row[lat_column])
+                lng = float(row[lng_column])
+            except (TypeError, ValueError):
+                continue
+            zip_code = row[zip_column].strip().zfill(5)
+            state = row[state_column].strip().upper() if state_column and row[state_column] else None
+            state = state or state_for_zip(zip_code)
+            centroids[zip_code] = (lat, lng, state)
+    return centroids
+
+
+def select_region(centroids, states=None, bbox=None):
+    """Return the ZIPs inside a list of states and/or a (min_lat, min_lng, max_lat, max_lng) box"""
+    if states and not any(state for _, _, state in centroids.values()):
+        raise ValueError("the centroid table has no state column - use a bounding box instead")
+    states = {state.upper() for state in states} if states else None
+
+    selected = {}
+    for zip_code, (lat, lng, state) in centroids.items():
+        if states is not None and state not in states:
+            continue
+        if bbox is not None:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            if not (min_lat <= lat <= max_lat and min_lng <= lng <= max_lng):
+                continue
+        selected[zip_code] = (lat, lng)
+    return selected
+
+
+def haversine_miles(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def neighbours_within(points, radius):
+    """Return {zip: [zips within radius miles]} using a uniform grid to avoid comparing every pair"""
+    if not points:
+        return {}
+    cell_lat = radius / MILES_PER_DEGREE_LAT
+    # Size longitude cells for the highest latitude so no neighbour is more than one cell away,
+    # and fit a whole number of them around the globe so the columns wrap at +/-180 degrees
+    max_abs_lat = min(max(abs(lat) for lat, _ in points.values()), 85.0)
+    columns = max(1, math.floor(360 / (cell_lat / math.cos(math.radians(max_abs_lat)))))
+    cell_lng = 360 / columns
+
+    # Compare unit vectors instead of calling haversine: within radius <=> dot product >= cos(angle)
+    min_dot = math.cos(radius / EARTH_RADIUS_MILES)
+    grid = {}
+    cells = {}
+    for zip_code, (lat, lng) in points.items():
+        lat_rad, lng_rad = math.radians(lat), math.radians(lng)
+        vector = (math.cos(lat_rad) * math.cos(lng_rad), math.cos(lat_rad) * math.sin(lng_rad), math.sin(lat_rad))
+        cell = (math.floor(lat / cell_lat), math.floor((lng + 180) / cell_lng) % columns)
+        grid.setdefault(cell, []).append((zip_code, vector))
+        cells[zip_code] = (cell, vector)
+
+    neighbours = {}
+    for zip_code, ((row, col), (x, y, z)) in cells.items():
+        nearby = []
+        for d_row in (-1, 0, 1):
+            # A set, so a grid only one or two columns wide does not visit a column twice
+            for other_col in {(col + d_col) % columns for d_col in (-1, 0, 1)}:
+                for other, (ox, oy, oz) in grid.get((row + d_row, other_col), ()):
+                    if x * ox + y * oy + z * oz >= min_dot:
+                        nearby.append(other)
+        neighbours[zip_code] = nearby
+    return neighbours
+
+
+def plan_coverage(points, radius, neighbours=None):
+    """Pick query centres so every ZIP in points lies within radius of one of them
+
+    Greedy set cover over the ZIP centroids themselves: repeatedly take the
+    centre that covers the most still-uncovered ZIPs. A lazy max-heap keeps
+    this near O(n log n) on top of the neighbour search. Returns a list of
+    (zip, newly_covered_zips) in the order the centres were chosen.
+    """
+    neighbours = neighbours if neighbours is not None else neighbours_within(points, radius)
+    uncovered = set(points)
+    heap = [(-len(covers), zip_code) for zip_code, covers in neighbours.items()]
+    heapq.heapify(heap)
+
+    plan = []
+    while uncovered and heap:
+        _, zip_code = heapq.heappop(heap)
+        gain = sum(1 for other in neighbours[zip_code] if other in uncovered)
+        if gain == 0:
+            continue
+        # Another centre may have taken some of its ZIPs since it was pushed
+        if heap and gain < -heap[0][0]:
+            heapq.heappush(heap, (-gain, zip_code))
+            continue
+        covered = [other for other in neighbours[zip_code] if other in uncovered]
+        uncovered.difference_update(covered)
+        plan.append((zip_code, covered))
+    return plan
+
+
+def summarise_plan(points, plan, radius, neighbours=None):
+    """Estimate how many queries the plan saves over one query per ZIP"""
+    neighbours = neighbours if neighbours is not None else neighbours_within(points, radius)
+    # Every per-ZIP query re-fetches the whole circle; sum how often each ZIP would be fetched
+    naive_hits = sum(len(covers) for covers in neighbours.values())
+    planned_hits = sum(len(neighbours[zip_code]) for zip_code, _ in plan)
+    return {
+        "zip_codes": len(points),
+        "radius_miles": radius,
+        "queries_naive": len(points),
+        "queries_planned": len(plan),
+        "queries_saved": len(points) - len(plan),
+        "reduction_factor": round(len(points) / len(plan), 1) if plan else None,
+        "avg_fetches_per_zip_naive": round(naive_hits / len(points), 1) if points else 0,
+        "avg_fetches_per_zip_planned": round(planned_hits / len(points), 2) if points else 0,
+    }
+
+
+def write_plan(path, plan, points, summary):
+    """Write the plan as a ZIP list the scrapers read with --zips-file / --where-file
+
+    JSON output keeps the coordinates and covered ZIPs of every centre.
+    """
+    if path.endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "summary": summary,
+                "centres": [
+                    {"zip": zip_code, "lat": points[zip_code][0], "lng": points[zip_code][1], "covers": covered}
+                    for zip_code, covered in plan
+                ],
+            }, f, indent=2)
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# Coverage plan: {summary['queries_planned']} centres for {summary['zip_codes']} ZIPs "
+                f"at {summary['radius_miles']} miles\n")
+        for zip_code, covered in plan:
+            f.write(f"{zip_code}  # covers {len(covered)} new ZIP(s)\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan a near-minimal set of ZIP queries covering a region")
+    parser.add_argument("--centroids", required=True,
+                        help="ZIP centroid table (CSV with zip,lat,lng,state or the Census Gazetteer ZCTA file)")
+    parser.add_argument("--states", nargs="*", help="Two-letter state codes to cover")
+    parser.add_argument("--bbox", nargs=4, type=float, metavar=("MIN_LAT", "MIN_LNG", "MAX_LAT", "MAX_LNG"),
+                        help="Bounding box to cover")
+    parser.add_argument("--radius", type=float, default=100, help="Search radius of each query in miles")
+    parser.add_argument("--output", default="coverage_plan.txt", help="Plan file (.txt ZIP list or .json)")
+    args = parser.parse_args()
+
+    if not args.states and not args.bbox:
+        parser.error("give a region with --states and/or --bbox")
+
+    if not os.path.exists(args.centroids):
+        parser.error(f"centroid table {args.centroids} not found - download the Census ZCTA Gazetteer file "
+                     f"({GAZETTEER_URL}), unzip it and pass it with --centroids, or use a zip,lat,lng,state CSV")
+    try:
+        centroids = load_centroids(args.centroids)
+    except ValueError as e:
+        parser.error(str(e))
+    points = select_region(centroids, args.states, args.bbox)
+    if not points:
+        print("No ZIP codes in the requested region")
+        return
+
+    start = time.perf_counter()
+    neighbours = neighbours_within(points, args.radius)
+    plan = plan_coverage(points, args.radius, neighbours)
+    summary = summarise_plan(points, plan, args.radius, neighbours)
+    print(f"Planned {summary['queries_planned']} queries instead of {summary['queries_naive']} "
+          f"({summary['reduction_factor']}x fewer) in {time.perf_counter() - start:.1f}s")
+    print(f"Each ZIP is fetched {summary['avg_fetches_per_zip_planned']} times on average "
+          f"instead of {summary['avg_fetches_per_zip_naive']}")
+
+    write_plan(args.output, plan, points, summary)
+    print(f"Plan saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+import math
+import re
+import time
+
+from .http_client import AsyncFetcher, create_session, fetch_html
+from .html_utils import element_text, make_soup
+from .records import build_recycling_entry
+from .telemetry import telemetry
+
+SEARCH_URL = "https://search.earth911.com/"
+
+
+def build_search_url(what, where, max_distance=100, page=1, base_url=SEARCH_URL):
+    """Build the Earth911 search results URL for a query and page"""
+    params = {
+        "what": what,
+        "where": where,
+        "list_filter": "all",
+        "max_distance": max_distance,
+    }
+    if page > 1:
+        params["page"] = page
+    return f"{base_url}?{urlencode(params)}"
+
+
+def iter_recycling_items(soup, page_url=None):
+    """Yield recycling facility data for each result item in a parsed results page
+
+    Mirrors the field logic of extract_recycling_data without a browser.
+    Title links are resolved against page_url when it is given.
+    """
+    for i, item in enumerate(soup.select("li.result-item"), 1):
+        title_element = item.select_one("h2.title a")
+        if title_element is None:
+            print(f"  {i}. Error extracting data from item: no title link")
+            continue
+        business_name = element_text(title_element)
+
+        address1_element = item.select_one("p.address1")
+        address3_element = item.select_one("p.address3")
+        if address1_element is None or address3_element is None:
+            address = None
+        else:
+            address = (element_text(address1_element), element_text(address3_element))
+
+        material_texts = [element_text(m) for m in item.select("span.material")]
+
+        details_url = title_element.get("href")
+        if details_url and page_url:
+            details_url = urljoin(page_url, details_url)
+
+        yield build_recycling_entry(business_name, address, material_texts, details_url)
+
+
+def parse_recycling_html(html, page_url=None):
+    """Extract recycling facility data from raw search results HTML, returning (rows, soup)"""
+    with telemetry.span("parse", site="earth911", url=page_url):
+        soup = make_soup(html)
+        rows = list(iter_recycling_items(soup, page_url))
+    return rows, soup
+
+
+def find_next_page_url(soup, current_url):
+    """Return the absolute URL behind a.next, or None on the last page"""
+    next_link = soup.select_one("a.next")
+    if next_link is None or not next_link.get("href"):
+        return None
+    return urljoin(current_url, next_link["href"])
+
+
+def _iter_following_links(session, url, page_num, max_pages, cache=None, checkpoint=None, stats=None):
+    """Fetch url as page page_num and keep following a.next links, yielding rows as pages arrive"""
+    stats = stats if stats is not None else {}
+    while page_num <= max_pages:
+        print(f"Fetching page {page_num}: {url}")
+        start = time.perf_counter()
+        html = fetch_html(session, url, cache=cache)
+        page_data, soup = parse_recycling_html(html, url)
+        elapsed = time.perf_counter() - start
+
+        print(f"Extracted {len(page_data)} items from page {page_num} in {elapsed:.2f}s")
+        if not page_data:
+            break
+        stats["pages"] = stats.get("pages", 0) + 1
+        stats.setdefault("page_seconds", []).append(elapsed)
+        yield from page_data
+
+        next_url = find_next_page_url(soup, url)
+        if checkpoint is not None:
+            checkpoint.mark_done(page_num, page_data, final=not next_url)
+        if not next_url:
+            print("No Next link found - reached end of results")
+            break
+        url = next_url
+        page_num += 1
+
+
+def iter_earth911_http(what, where, max_distance=100, max_pages=5, session=None, base_url=SEARCH_URL,
+                       cache=None, checkpoint=None, stats=None):
+    """Yield Earth911 search results over plain HTTP, following a.next links
+
+    Rows are yielded page by page as they are scraped. With a
+    SearchCheckpoint, rows of pages finished by an earlier run are yielded
+    first and the crawl resumes at the first unfinished page. The number of
+    pages is recorded in stats["pages"].
+    """
+    session = session or create_session()
+    stats = stats if stats is not None else {}
+    stats.setdefault("pages", 0)
+    first_page = 1
+
+    if checkpoint is not None:
+        finished_rows, first_page = checkpoint.resume_point()
+        finished_pages = len(checkpoint.completed_pages())
+        if first_page is None:
+            print(f"All pages already completed - loaded {len(finished_rows)} items from the checkpoint")
+        elif first_page > 1:
+            print(f"Resuming at page {first_page} with {len(finished_rows)} items from the checkpoint")
+        stats["pages"] += finished_pages if first_page is None else first_page - 1
+        yield from finished_rows
+        if first_page is None:
+            return
+
+    url = build_search_url(what, where, max_distance, page=first_page, base_url=base_url)
+    yield from _iter_following_links(session, url, first_page, max_pages, cache, checkpoint, stats)
+
+
+def scrape_earth911_http(*args, **kwargs):
+    """List-returning wrapper around iter_earth911_http; returns (rows, pages)"""
+    stats = {}
+    rows = list(iter_earth911_http(*args, stats=stats, **kwargs))
+    return rows, stats["pages"]
+
+
+def parse_total_results(soup):
+    """Read the total result count from text such as 'Showing 1-10 of 123 results'"""
+    match = re.search(r"of\s+([\d,]+)\s+results", soup.get_text(" "), re.IGNORECASE)
+    return int(match.group(1).replace(",", "")) if match else None
+
+
+def parse_last_page_number(soup):
+    """Return the highest page=N linked from the pagination, if any"""
+    pages = [int(n) for link in soup.select("a[href*='page=']")
+             for n in re.findall(r"[?&]page=(\d+)", link["href"])]
+    return max(pages) if pages else None
+
+
+def with_page(url, page):
+    """Return url with its page query parameter set to page"""
+    parts = urlsplit(url)
+    params = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "page"]
+    params.append(("page", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+def plan_remaining_pages(soup, first_page_url, rows_on_first_page, max_pages=None):
+    """Work out the URLs of pages 2..N from the first results page
+
+    The URL pattern comes from the a.next link (so whatever parameters the
+    site uses are kept) and N from the total result count or, failing that,
+    the highest page number in the pagination. Returns None if neither is
+    available.
+    """
+    next_url = find_next_page_url(soup, first_page_url)
+    if not next_url:
+        return []
+
+    total_results = parse_total_results(soup)
+    if total_results and rows_on_first_page:
+        last_page = math.ceil(total_results / rows_on_first_page)
+    else:
+        last_page = parse_last_page_number(soup)
+    if not last_page:
+        return None
+
+    if max_pages:
+        last_page = min(last_page, max_pages)
+    return [with_page(next_url, page) for page in range(2, last_page + 1)]
+
+
+def _iter_planned_pages(planned_pages, session=None, concurrency=4, rate=5.0, cache=None,
+                        checkpoint=None, stats=None):
+    """Fetch (page, url) pairs concurrently and yield their rows in page order
+
+    Pages are fetched in windows of a few times the concurrency so only a
+    bounded number of response bodies is held in memory at once. If any
+    page of a window could not be fetched, RuntimeError is raised once the
+    rest of the window has been yielded, so a partial crawl is never
+    exported as a complete one (with a checkpoint, a re-run only fetches
+    the missing pages).
+    """
+    stats = stats if stats is not None else {}
+    completed = checkpoint.completed_pages() if checkpoint is not None else {}
+    pending_count = sum(1 for page_num, _ in planned_pages if page_num not in completed)
+    if completed:
+        print(f"{len(planned_pages) - pending_count} page(s) already completed in the checkpoint")
+
+    print(f"Fetching {pending_count} page(s) with up to {concurrency} concurrent request(s) at {rate} req/s...")
+    fetcher = AsyncFetcher(session, per_host=concurrency, rate=rate, cache=cache)
+    window = max(1, concurrency * 4)
+    start = time.perf_counter()
+    pages_collected = 0
+
+    for offset in range(0, len(planned_pages), window):
+        chunk = planned_pages[offset:offset + window]
+        failed = []
+        pending = [(page_num, url) for page_num, url in chunk if page_num not in completed]
+        responses = dict(zip((page_num for page_num, _ in pending), fetcher.run([url for _, url in pending])))
+
+        for page_num, page_url in chunk:
+            if page_num in completed:
+                page_data = completed[page_num][0]
+            else:
+                html = responses[page_num]
+                if isinstance(html, Exception):
+                    print(f"Failed to fetch page {page_num}: {html}")
+                    failed.append(page_num)
+                    continue
+                parse_start = time.perf_counter()
+                page_data, page_soup = parse_recycling_html(html, page_url)
+                # Per-page latency: this page's own request plus its parse
+                stats.setdefault("page_seconds", []).append(
+                    fetcher.timings.get(page_url, 0.0) + time.perf_counter() - parse_start)
+                print(f"Extracted {len(page_data)} items from page {page_num}")
+                if checkpoint is not None:
+                    checkpoint.mark_done(page_num, page_data, final=page_soup.select_one("a.next") is None)
+            pages_collected += 1
+            stats["pages"] = stats.get("pages", 0) + 1
+            yield from page_data
+
+        if failed:
+            raise RuntimeError(f"Could not fetch page(s) {', '.join(map(str, failed))} of the search")
+
+    print(f"Collected {pages_collected} page(s) in {time.perf_counter() - start:.2f}s")
+
+
+def iter_remaining_pages(soup, first_page_url, rows_on_first_page, max_pages=None, session=None,
+                         concurrency=4, rate=5.0, cache=None, checkpoint=None, stats=None):
+    """Plan pages 2..N from the first page and return a generator of their rows
+
+    Returns None when the number of pages cannot be determined, so the caller
+    can fall back to following the a.next links.
+    """
+    page_urls = plan_remaining_pages(soup, first_page_url, rows_on_first_page, max_pages)
+    if page_urls is None:
+        print("Could not determine the number of result pages")
+        return None
+    if not page_urls and checkpoint is not None:
+        checkpoint.mark_final(1)
+    return _iter_planned_pages(list(enumerate(page_urls, 2)), session, concurrency, rate, cache, checkpoint, stats)
+
+
+def iter_earth911_concurrent(what, where, max_distance=100, max_pages=None, session=None,
+                             base_url=SEARCH_URL, concurrency=4, rate=5.0, cache=None, checkpoint=None,
+                             stats=None):
+    """Yield Earth911 results, fetching every page after the first concurrently
+
+    max_pages=None fetches every page of the result set. With a
+    SearchCheckpoint, pages finished by an earlier run are not fetched again
+    (page 1 is still read to plan the rest, from the cache when possible).
+    """
+    session = session or create_session(pool_size=concurrency)
+    stats = stats if stats is not None else {}
+    stats.setdefault("pages", 0)
+    url = build_search_url(what, where, max_distance, base_url=base_url)
+
+    if checkpoint is not None:
+        finished_rows, next_page = checkpoint.resume_point()
+        if next_page is None:
+            print(f"All pages already completed - loaded {len(finished_rows)} items from the checkpoint")
+            stats["pages"] += len(checkpoint.completed_pages())
+            yield from finished_rows
+            return
+
+    print(f"Fetching page 1: {url}")
+    start = time.perf_counter()
+    page_data, soup = parse_recycling_html(fetch_html(session, url, cache=cache), url)
+    stats.setdefault("page_seconds", []).append(time.perf_counter() - start)
+    print(f"Extracted {len(page_data)} items from page 1")
+    next_url = find_next_page_url(soup, url)
+    if checkpoint is not None and page_data:
+        checkpoint.mark_done(1, page_data, final=next_url is None)
+    stats["pages"] += 1
+    yield from page_data
+    if not page_data or max_pages == 1:
+        return
+
+    remaining = iter_remaining_pages(soup, url, len(page_data), max_pages, session, concurrency, rate,
+                                     cache, checkpoint, stats)
+    if remaining is None:
+        # No page count to plan with - walk the a.next links instead
+        remaining = _iter_following_links(session, next_url, 2, max_pages or 1000, cache, checkpoint, stats)
+    yield from remaining
+
+
+def scrape_earth911_concurrent(*args, **kwargs):
+    """List-returning wrapper around iter_earth911_concurrent; returns (rows, pages)"""
+    stats = {}
+    rows = list(iter_earth911_concurrent(*args, stats=stats, **kwargs))
+    return rows, stats["pages"]
+
+
+def iter_replay_from_cache(cache, what, where, max_distance=100, max_pages=None, stats=None):
+    """Re-run the extractor over cached pages for a search, without network or browser
+
+    Both raw HTTP responses and Chrome DOM snapshots are used; when a page was
+    cached more than once the newest copy wins.
+    """
+    stats = stats if stats is not None else {}
+    latest = {}
+    for url, kind, fetched_at in cache.entries():
+        params = dict(parse_qsl(urlsplit(url).query))
+        if (params.get("what", "").lower() != what.lower() or params.get("where") != str(where)
+                or params.get("max_distance") != str(max_distance)):
+            continue
+        page = int(params.get("page", 1))
+        if max_pages and page > max_pages:
+            continue
+        if page not in latest or fetched_at >= latest[page][2]:
+            latest[page] = (url, kind, fetched_at)
+
+    stats["pages"] = 0
+    for page in sorted(latest):
+        url, kind, _ = latest[page]
+        html = cache.get(url, kind, allow_expired=True)
+        if html is None:
+            continue
+        start = time.perf_counter()
+        page_data, _ = parse_recycling_html(html, url)
+        elapsed = time.perf_counter() - start
+        print(f"Replayed page {page} ({kind} snapshot): {len(page_data)} items in {elapsed * 1000:.1f}ms")
+        stats["pages"] += 1
+        stats.setdefault("page_seconds", []).append(elapsed)
+        yield from page_data
+
+
+def replay_from_cache(*args, **kwargs):
+    """List-returning wrapper around iter_replay_from_cache; returns (rows, pages)"""
+    stats = {}
+    rows = list(iter_replay_from_cache(*args, stats=stats, **kwargs))
+    return rows, stats["pages"]
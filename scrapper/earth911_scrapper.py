@@ -0,0 +1,575 @@
+﻿from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+import argparse
+import itertools
+import json
+import os
+import time
+
+from .browser import NavigationMeter, add_browser_arguments, browser_options, create_driver
+from .checkpoints import DEFAULT_CHECKPOINT_PATH, CheckpointStore
+from .coverage import load_zip_codes
+from .earth911_http import (iter_earth911_concurrent, iter_earth911_http, iter_remaining_pages, iter_replay_from_cache,
+                            parse_recycling_html, with_page)
+from .http_client import create_session
+from .materials_index import DEFAULT_MATERIALS_INDEX_PATH, MaterialsIndex, index_materials
+from .page_cache import add_cache_arguments, open_cache
+from .popups import PopupDismisser
+from .records import DedupIndex, build_recycling_entry, dedupe_rows
+from .sinks import CsvSink, open_sink, write_rows
+from .snapshots import CHANGE_FIELD, DEFAULT_SNAPSHOT_PATH, SNAPSHOT_FIELDS, SnapshotIndex, delta_path_for, track_changes
+from .telemetry import add_telemetry_arguments, export_telemetry, profiled, telemetry
+from .waits import ReadinessWaiter, elements_present, network_idle, replaced, url_changed
+
+# Columns written by save_data_to_csv
+CSV_HEADERS = [
+    "business_name",
+    "last_update_date", 
+    "street_address",
+    "materials_accepted",
+    "record_key"
+]
+
+# Extra columns filled in from the detail pages with --enrich
+ENRICHED_CSV_HEADERS = CSV_HEADERS + ["details_url", "phone", "hours"]
+
+# Close buttons of the advertising popup, most specific first; clicked by
+# PopupDismisser from inside the page as soon as one becomes visible
+POPUP_CLOSE_SELECTORS = [
+    "i._close-icon",
+    "._close-icon", 
+    ".close-icon",
+    "[class*='close-icon']",
+    "[class*='close']",
+    "button[aria-label*='close']",
+    ".modal-close",
+    ".popup-close"
+]
+
+def iter_recycling_data(driver):
+    """Yield recycling facility data from the search results page as each item is read"""
+    try:
+        # Wait for results to be present
+        wait = WebDriverWait(driver, 10)
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "li.result-item")))
+        
+        # Find all result items
+        result_items = driver.find_elements(By.CSS_SELECTOR, "li.result-item")
+        print(f"Found {len(result_items)} result items on this page")
+        
+        for i, item in enumerate(result_items, 1):
+            try:
+                # Extract business name
+                title_element = item.find_element(By.CSS_SELECTOR, "h2.title a")
+                business_name = title_element.text.strip()
+                details_url = title_element.get_attribute("href")
+                
+                # Extract street address
+                try:
+                    address1_element = item.find_element(By.CSS_SELECTOR, "p.address1")
+                    address3_element = item.find_element(By.CSS_SELECTOR, "p.address3")
+                    address = (address1_element.text, address3_element.text)
+                except Exception as e:
+                    telemetry.swallowed("earth911.address", e)
+                    address = None
+                
+                # Extract materials accepted
+                try:
+                    material_elements = item.find_elements(By.CSS_SELECTOR, "span.material")
+                    material_texts = [material_element.text for material_element in material_elements]
+                except Exception as e:
+                    telemetry.swallowed("earth911.materials", e)
+                    material_texts = []
+                
+                data_entry = build_recycling_entry(business_name, address, material_texts, details_url)
+                
+                print(f"  {i}. Extracted: {business_name}")
+                yield data_entry
+                
+            except Exception as e:
+                print(f"  {i}. Error extracting data from item: {e}")
+                telemetry.swallowed("earth911.item", e)
+                continue
+                
+    except Exception as e:
+        print(f"Error finding result items: {e}")
+        telemetry.swallowed("earth911.results", e)
+
+def extract_recycling_data(driver):
+    """Extract recycling facility data from the search results page"""
+    return list(iter_recycling_data(driver))
+
+def save_data_to_csv(data, search_parameters=None, filename="data.csv"):
+    """Save extracted data to a CSV file (data.csv by default), streaming rows as they arrive
+
+    data may be any iterable of rows, including the generators returned by
+    the iter_* scrapers.
+    """
+    # Write data rows; CsvSink joins the materials_accepted list with semicolons
+    with CsvSink(filename, CSV_HEADERS) as sink:
+        total = write_rows(data, sink)
+    
+    save_metadata(total, search_parameters, filename)
+    return total
+
+def save_metadata(total, search_parameters=None, filename="data.csv", fieldnames=CSV_HEADERS, changes=None):
+    """Write extraction_metadata.json describing an export
+
+    changes holds the added/changed/removed/unchanged counts and the delta
+    file when the export was compared with its previous snapshot.
+    """
+    metadata = {
+        "source": "earth911.com search results",
+        "extraction_date": time.strftime("%Y-%m-%d"),
+        "total_programs_extracted": total,
+        "data_structure_version": "2.0",
+        "search_parameters": search_parameters or {
+            "what": "Electronics",
+            "where": "10001",
+            "max_distance": 100,
+            "pages_extracted": "Multiple pages (up to 5)"
+        },
+        "fields_extracted": fieldnames,
+        "notes": {
+            "materials_accepted": "Multiple materials separated by semicolons (;)",
+            "csv_filename": filename
+        }
+    }
+    if changes:
+        metadata["changes"] = changes
+    
+    with open("extraction_metadata.json", "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+
+def iter_remaining_pages_from_driver(driver, rows_on_first_page, max_pages, concurrency=4, rate=5.0, cache=None,
+                                     checkpoint=None, stats=None):
+    """Fetch pages 2..N over HTTP using the first page Chrome rendered
+
+    Returns a generator of their rows, or None if the page count is unknown.
+    The HTTP session borrows Chrome's cookies and user agent so the site
+    serves the same results it showed the browser.
+    """
+    session = create_session(pool_size=concurrency)
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+    
+    _, soup = parse_recycling_html(driver.page_source)
+    return iter_remaining_pages(soup, driver.current_url, rows_on_first_page, max_pages,
+                                session, concurrency, rate, cache, checkpoint, stats)
+
+def iter_with_chrome(what, where, max_distance=100, max_pages=5, keep_open=False,
+                     concurrent_pages=False, concurrency=4, rate=5.0, cache=None, checkpoint=None, stats=None,
+                     browser_options=None, driver=None, search_url=None, popup_selectors=None):
+    """Yield Earth911 search results by driving a full Chrome session, page by page
+
+    With concurrent_pages, Chrome only handles the first page; the remaining
+    pages are fetched over HTTP concurrently using the URL pattern and result
+    count that page reveals. With a PageCache, every rendered results page is
+    saved as a DOM snapshot for later replay. With a SearchCheckpoint, pages
+    finished by an earlier run are loaded from it and Chrome jumps straight
+    to the first unfinished page. The number of pages is recorded in
+    stats["pages"]. A driver that is passed in (e.g. from a SessionManager)
+    is left open; otherwise one is created and quit at the end. search_url
+    overrides the Earth911 start page (the benchmarks point it at a local
+    fixture site). Time spent on each page is appended to
+    stats["page_seconds"]. Popups matching popup_selectors (default
+    POPUP_CLOSE_SELECTORS) are dismissed in the page as soon as they show.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("pages", 0)
+    first_page = 1
+    if checkpoint is not None:
+        finished_rows, first_page = checkpoint.resume_point()
+        if first_page is None:
+            print(f"All pages already completed - loaded {len(finished_rows)} items from the checkpoint")
+            stats["pages"] += len(checkpoint.completed_pages())
+            yield from finished_rows
+            return
+        stats["pages"] += first_page - 1
+        yield from finished_rows
+    
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver(**(browser_options or {}))
+    
+    # Popups are closed in the page as they appear, so nothing waits for them
+    popups = PopupDismisser(driver, popup_selectors or POPUP_CLOSE_SELECTORS, site="earth911").install()
+    
+    try:
+        with telemetry.span("search", site="earth911"):
+            # Visit the website
+            driver.get(search_url or "https://search.earth911.com/")
+    
+            # Wait for the page to load and find the form elements
+            wait = WebDriverWait(driver, 20)
+            waiter = ReadinessWaiter(driver)
+            meter = NavigationMeter(driver)
+            meter.record("search form")
+    
+            # Find and fill the "what" field
+            what_field = wait.until(EC.presence_of_element_located((By.ID, "what")))
+            what_field.clear()
+            what_field.send_keys(what)
+    
+            # Find and fill the "where" field
+            where_field = wait.until(EC.presence_of_element_located((By.ID, "where")))
+            where_field.clear()
+            where_field.send_keys(where)
+    
+            # Find and click the search button
+            search_button = wait.until(EC.element_to_be_clickable((By.ID, "submit-location-search")))
+            search_button.click()
+    
+            # Wait for the results to load
+            waiter.wait("search results", elements_present("li.result-item"), timeout=20)
+    
+        with telemetry.span("distance", site="earth911"):
+            # Find the distance dropdown and select the search radius
+            distance_dropdown = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "select[onchange*='max_distance']")))
+            first_result = next(iter(driver.find_elements(By.CSS_SELECTOR, "li.result-item")), None)
+            search_url = driver.current_url
+    
+            # Create a Select object to interact with the dropdown
+            select = Select(distance_dropdown)
+            if select.first_selected_option.get_attribute("value") != str(max_distance):
+                select.select_by_value(str(max_distance))
+        
+                # Wait for the radius change to reload the results
+                waiter.wait("distance reload", EC.all_of(
+                    url_changed(search_url, f"max_distance={max_distance}"),
+                    replaced(first_result),
+                    elements_present("li.result-item"),
+                ), timeout=20)
+    
+        # Wait for the page to settle with the new results
+        waiter.wait("results settled", EC.all_of(elements_present("li.result-item"), network_idle()), timeout=5)
+    
+        # Jump straight to the first page an earlier run did not finish
+        if first_page > 1:
+            print(f"Resuming at page {first_page} with {len(finished_rows)} items from the checkpoint")
+            first_result = next(iter(driver.find_elements(By.CSS_SELECTOR, "li.result-item")), None)
+            driver.get(with_page(driver.current_url, first_page))
+            waiter.wait(f"page {first_page} load", EC.all_of(replaced(first_result), elements_present("li.result-item")), timeout=15)
+    
+        # Extract data from multiple pages
+        # max_pages=None means no cap (used with concurrent_pages)
+        page_limit = max_pages or 1000
+        page_num = first_page - 1
+        page_started = time.perf_counter()
+    
+        for page_num in range(first_page, page_limit + 1):
+            print(f"Extracting data from page {page_num}...")
+        
+            # Extract data from current page
+            meter.record(f"page {page_num}")
+            with telemetry.span("extract", site="earth911", page=page_num):
+                page_data = extract_recycling_data(driver)
+            if cache is not None:
+                with telemetry.span("snapshot", site="earth911", page=page_num):
+                    cache.put(driver.current_url, driver.page_source, kind="dom")
+            if checkpoint is not None and page_data:
+                checkpoint.mark_done(page_num, page_data)
+            stats["pages"] += 1
+            stats.setdefault("page_seconds", []).append(time.perf_counter() - page_started)
+            print(f"Extracted {len(page_data)} items from page {page_num}")
+            yield from page_data
+        
+            if concurrent_pages and page_num == 1:
+                remaining = iter_remaining_pages_from_driver(
+                    driver, len(page_data), max_pages, concurrency, rate, cache, checkpoint, stats)
+                if remaining is not None:
+                    yield from remaining
+                    break
+                print("Falling back to clicking through the pages")
+        
+            # If this is not the last page, click Next button
+            if page_num < page_limit:
+                with telemetry.span("paginate", site="earth911", page=page_num + 1):
+                    try:
+                        # Scroll to the bottom of the page first
+                        print("Scrolling to bottom of page to find Next button...")
+                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                
+                        # Alternative scroll method if the first doesn't work
+                        try:
+                            # Try to find pagination area and scroll to it
+                            pagination_area = driver.find_element(By.CSS_SELECTOR, ".pagination, .pager, .page-navigation")
+                            driver.execute_script("arguments[0].scrollIntoView(true);", pagination_area)
+                        except Exception as e:
+                            telemetry.swallowed("earth911.pagination_area", e)
+                            # If no pagination area found, try scrolling to footer
+                            try:
+                                footer = driver.find_element(By.CSS_SELECTOR, "footer, .footer")
+                                driver.execute_script("arguments[0].scrollIntoView(true);", footer)
+                            except Exception as e:
+                                telemetry.swallowed("earth911.footer", e)
+                
+                        # Give lazily rendered pagination a moment to show the Next button
+                        waiter.wait(f"page {page_num} next button", elements_present("a.next"), timeout=3)
+                
+                        # Check if Next button exists and is clickable
+                        next_buttons = driver.find_elements(By.CSS_SELECTOR, "a.next")
+                        if not next_buttons:
+                            print("No Next button found - reached end of results")
+                            if checkpoint is not None:
+                                checkpoint.mark_final(page_num)
+                            # Take a screenshot to see what's on the page
+                            try:
+                                driver.save_screenshot(f"page_{page_num}_no_next_button.png")
+                                print(f"Screenshot saved: page_{page_num}_no_next_button.png")
+                            except Exception as e:
+                                telemetry.swallowed("earth911.screenshot", e)
+                            break
+                
+                        next_button = next_buttons[0]
+                        print(f"Found Next button: {next_button.get_attribute('href')}")
+                
+                        # Check if the Next button is actually clickable (not disabled)
+                        if next_button.get_attribute("href"):
+                            # Scroll to the Next button to ensure it's visible
+                            driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
+                            first_result = next(iter(driver.find_elements(By.CSS_SELECTOR, "li.result-item")), None)
+                            previous_url = driver.current_url
+                            page_started = time.perf_counter()
+                    
+                            # Click the Next button
+                            next_button.click()
+                            print(f"Clicked Next button to go to page {page_num + 1}")
+                    
+                            # Wait for the next page to load and verify we moved to a new page
+                            waiter.wait(f"page {page_num + 1} load", EC.all_of(
+                                url_changed(previous_url, f"page={page_num + 1}"),
+                                replaced(first_result),
+                                elements_present("li.result-item"),
+                            ), timeout=15)
+                    
+                            # Verify we successfully moved to the next page
+                            current_url = driver.current_url
+                            if f"page={page_num + 1}" in current_url:
+                                print(f"Successfully navigated to page {page_num + 1}")
+                            else:
+                                print(f"Page navigation may have failed - URL: {current_url}")
+                        else:
+                            print("Next button is disabled - reached end of results")
+                            if checkpoint is not None:
+                                checkpoint.mark_final(page_num)
+                            break
+                    
+                    except Exception as e:
+                        print(f"Could not navigate to page {page_num + 1}: {e}")
+                        telemetry.swallowed("earth911.paginate", e)
+                        print("Stopping pagination - might have reached the last page or encountered an error")
+                        break
+    
+        print(waiter.report())
+        print(f"Page weight: {meter.summary()}")
+        print(popups.summary())
+    
+        # Keep the browser open for inspection when requested
+        if keep_open:
+            input("Press Enter to close the browser...")
+    
+        return
+    
+    finally:
+        # Close the browser, or leave a borrowed one without our popup handler
+        if own_driver:
+            driver.quit()
+        else:
+            popups.uninstall()
+
+def scrape_with_chrome(*args, **kwargs):
+    """List-returning wrapper around iter_with_chrome; returns (rows, pages)"""
+    stats = {}
+    rows = list(iter_with_chrome(*args, stats=stats, **kwargs))
+    return rows, stats["pages"]
+
+def iter_search_results(args, cache=None, checkpoint=None, stats=None):
+    """Yield the rows for the parsed command line, picking the engine
+
+    In auto mode Chrome is only tried when the HTTP engine produced nothing;
+    once rows have been streamed out a failure is raised instead, since
+    switching engines mid-export would duplicate them.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("pages", 0)
+    
+    if args.replay:
+        yield from iter_replay_from_cache(cache, args.what, args.where, args.max_distance, args.max_pages, stats=stats)
+        return
+    
+    if args.engine in ("auto", "http"):
+        if args.concurrent_pages:
+            http_rows = iter_earth911_concurrent(
+                args.what, args.where, args.max_distance, args.max_pages,
+                concurrency=args.concurrency, rate=args.rate, cache=cache, checkpoint=checkpoint, stats=stats)
+        else:
+            http_rows = iter_earth911_http(
+                args.what, args.where, args.max_distance, args.max_pages, cache=cache, checkpoint=checkpoint,
+                stats=stats)
+        
+        emitted = 0
+        try:
+            for row in http_rows:
+                emitted += 1
+                yield row
+        except Exception as e:
+            print(f"HTTP engine failed: {e}")
+            if args.engine == "http" or emitted:
+                raise
+        
+        if emitted or args.engine == "http":
+            return
+        print("HTTP engine returned no results - falling back to Chrome")
+        stats["pages"] = 0
+    
+    yield from iter_with_chrome(
+        args.what, args.where, args.max_distance, args.max_pages, keep_open=args.keep_open,
+        concurrent_pages=args.concurrent_pages, concurrency=args.concurrency, rate=args.rate, cache=cache,
+        checkpoint=checkpoint, stats=stats, browser_options=browser_options(args),
+        popup_selectors=POPUP_CLOSE_SELECTORS + args.popup_selector)
+
+def iter_planned_searches(args, wheres, cache=None, checkpoints=None, stats=None):
+    """Run iter_search_results for each ZIP in wheres, one checkpointed search per ZIP"""
+    stats = stats if stats is not None else {}
+    stats.setdefault("pages", 0)
+    
+    for where in wheres:
+        if len(wheres) > 1:
+            print(f"Searching around {where}...")
+        search_args = argparse.Namespace(**{**vars(args), "where": where})
+        checkpoint = None
+        if checkpoints is not None:
+            checkpoint = checkpoints.search("earth911", args.what, where, args.max_distance)
+        search_stats = {"pages": 0}
+        try:
+            yield from iter_search_results(search_args, cache, checkpoint, search_stats)
+        finally:
+            stats["pages"] += search_stats["pages"]
+
+def run(args):
+    """Run the searches described by the parsed command line and write the export"""
+    checkpoints = CheckpointStore(args.checkpoint) if args.checkpoint else None
+    wheres = load_zip_codes(zip_file=args.where_file) if args.where_file else [args.where]
+    if checkpoints is not None and args.restart:
+        for where in wheres:
+            checkpoints.clear("earth911", args.what, where, args.max_distance)
+    
+    cache = open_cache(args) if args.cache or args.replay else None
+    
+    if args.max_pages is None and not args.concurrent_pages:
+        args.max_pages = 5
+    
+    stats = {"pages": 0}
+    rows = iter_planned_searches(args, wheres, cache, checkpoints, stats)
+    
+    if args.replay:
+        # Leave the previous export alone when nothing was cached for this search
+        first_row = next(rows, None)
+        if first_row is None:
+            print(f"No cached pages found in {args.cache_dir} for this search")
+            return
+        rows = itertools.chain([first_row], rows)
+    
+    dedup_index = None
+    if not args.keep_duplicates:
+        dedup_index = DedupIndex()
+        rows = dedupe_rows(rows, dedup_index)
+    
+    headers = CSV_HEADERS
+    if args.enrich:
+        from .enrichment import enrich_rows
+        
+        rows = enrich_rows(rows, "earth911", concurrency=args.concurrency, rate=args.rate, cache=cache)
+        headers = ENRICHED_CSV_HEADERS
+    
+    # Compare with the previous run of this export and write what changed to the delta file
+    snapshots = delta_sink = None
+    changes = {}
+    if args.snapshot:
+        snapshots = SnapshotIndex(args.snapshot)
+        changes["delta_file"] = args.delta or delta_path_for(args.output)
+        delta_sink = open_sink(changes["delta_file"], headers + SNAPSHOT_FIELDS + [CHANGE_FIELD], args.format)
+        headers = headers + SNAPSHOT_FIELDS
+        rows = track_changes(rows, snapshots, "earth911", os.path.normpath(args.output), delta_sink, changes)
+    
+    # Index the materials of every exported facility for fast AND/OR lookups
+    materials = None
+    if args.materials_index:
+        materials = MaterialsIndex()
+        rows = index_materials(rows, materials)
+    
+    # Stream the rows into the output file as they are scraped
+    try:
+        with open_sink(args.output, headers, args.format) as sink:
+            total = write_rows(rows, sink)
+    finally:
+        if dedup_index is not None:
+            dedup_index.close()
+        if snapshots is not None:
+            delta_sink.close()
+            snapshots.close()
+    
+    save_metadata(total, search_parameters={
+        "what": args.what,
+        "where": args.where if not args.where_file else wheres,
+        "max_distance": args.max_distance,
+        "pages_extracted": f"Multiple pages (up to {args.max_pages})" if args.max_pages else "All pages"
+    }, filename=args.output, fieldnames=headers, changes=changes)
+    if materials is not None:
+        materials.save(args.materials_index)
+        print(f"Indexed {len(materials.vocabulary)} materials over {len(materials)} facilities in {args.materials_index}")
+    print(f"Total extracted {total} items from {stats['pages']} pages and saved to {args.output}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape recycling facilities from Earth911 search results")
+    parser.add_argument("--what", default="Electronics", help="Material or category to search for")
+    parser.add_argument("--where", default="10001", help="ZIP code to search around")
+    parser.add_argument("--where-file",
+                        help="Search around every ZIP in this file instead, e.g. a plan from plan_coverage.py")
+    parser.add_argument("--max-distance", type=int, default=100, help="Search radius in miles")
+    parser.add_argument("--max-pages", type=int, default=None,
+                        help="Maximum number of result pages to extract (default 5, or every page with --concurrent-pages)")
+    parser.add_argument("--engine", choices=["auto", "http", "chrome"], default="auto",
+                        help="auto tries the HTTP engine first and falls back to Chrome")
+    parser.add_argument("--keep-open", action="store_true", help="Keep Chrome open until Enter is pressed")
+    add_browser_arguments(parser)
+    parser.add_argument("--popup-selector", action="append", default=[],
+                        help="Extra CSS selector of a popup close button to click (repeatable)")
+    parser.add_argument("--concurrent-pages", action="store_true",
+                        help="Fetch every page after the first concurrently instead of clicking Next")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Concurrent requests per host with --concurrent-pages and --enrich")
+    parser.add_argument("--rate", type=float, default=5.0, help="Requests per second with --concurrent-pages and --enrich")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Write facilities again when they reappear on later pages or in overlapping searches")
+    parser.add_argument("--enrich", action="store_true",
+                        help="Follow each result's detail page for the full materials list, phone and hours")
+    parser.add_argument("--cache", action="store_true", help="Cache fetched pages and DOM snapshots on disk")
+    add_cache_arguments(parser)
+    parser.add_argument("--replay", action="store_true",
+                        help="Run the extractor over cached pages only - no network, no browser")
+    parser.add_argument("--checkpoint", nargs="?", const=DEFAULT_CHECKPOINT_PATH,
+                        help=f"Record finished pages and resume an interrupted crawl (default file: {DEFAULT_CHECKPOINT_PATH})")
+    parser.add_argument("--restart", action="store_true", help="Discard checkpointed pages for this search first")
+    parser.add_argument("--output", default="data.csv", help="File to write the results to")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default=None,
+                        help="Output format (default: taken from the --output extension)")
+    parser.add_argument("--snapshot", nargs="?", const=DEFAULT_SNAPSHOT_PATH,
+                        help=f"Compare with the previous run of this export and write a delta file (default index: {DEFAULT_SNAPSHOT_PATH})")
+    parser.add_argument("--delta", help="Delta file for --snapshot (default: <output>.delta.<ext>)")
+    parser.add_argument("--materials-index", nargs="?", const=DEFAULT_MATERIALS_INDEX_PATH,
+                        help=f"Also write a materials index for python -m scrapper materials (default file: {DEFAULT_MATERIALS_INDEX_PATH})")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+    
+    try:
+        with profiled(args.profile):
+            run(args)
+    finally:
+        export_telemetry(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import json
+import time
+
+from .http_client import AsyncFetcher, create_session
+from .html_utils import element_text, make_soup
+from .records import clean_text, normalize_record
+from .structured_data import build_store_index, iter_json_objects, payloads_from_html, structured_fields
+
+# Placeholder values the listing pages leave behind; enrichment may overwrite them
+PLACEHOLDERS = {
+    "",
+    "Phone not found",
+    "Hours not found",
+    "Materials not specified",
+}
+
+EARTH911_MATERIAL_SELECTORS = "#materials li, .materials li, .material-list li, li.material, span.material"
+EARTH911_HOURS_SELECTORS = ".location-hours, .hours, [itemprop='openingHours']"
+
+
+def _page_fields(soup):
+    """Phone, hours and coordinates from a detail page's JSON-LD, falling back to tel: links"""
+    fields = {}
+    for payload in payloads_from_html(soup):
+        try:
+            data = json.loads(payload)
+        except (TypeError, ValueError):
+            continue
+        for obj in iter_json_objects(data):
+            for key, value in structured_fields(obj).items():
+                fields.setdefault(key, value)
+
+    if "phone" not in fields:
+        phone_link = soup.select_one("a[href^='tel:']")
+        if phone_link is not None:
+            fields["phone"] = element_text(phone_link) or phone_link["href"][4:]
+    return fields
+
+
+def parse_earth911_detail(html, row=None):
+    """Extract the full materials list, phone and hours from an Earth911 location page"""
+    soup = make_soup(html)
+    detail = _page_fields(soup)
+
+    materials = []
+    for element in soup.select(EARTH911_MATERIAL_SELECTORS):
+        text = clean_text(element_text(element))
+        if text and not text.startswith("+") and "Materials accepted" not in text and text not in materials:
+            materials.append(text)
+    if materials:
+        detail["materials_accepted"] = materials
+
+    if "weekly_hours" in detail:
+        detail["hours"] = detail.pop("weekly_hours")
+    else:
+        hours_element = soup.select_one(EARTH911_HOURS_SELECTORS)
+        if hours_element is not None:
+            detail["hours"] = element_text(hours_element)
+    return normalize_record(detail)
+
+
+def parse_bestbuy_detail(html, row=None):
+    """Extract phone, weekly hours and coordinates from a Best Buy store page"""
+    soup = make_soup(html)
+    store_id = str(row.get("store_id")) if row else None
+    index = build_store_index(payloads_from_html(soup))
+    detail = index[store_id] if store_id in index else _page_fields(soup)
+    return normalize_record(dict(detail))
+
+
+DETAIL_PARSERS = {
+    "earth911": parse_earth911_detail,
+    "bestbuy": parse_bestbuy_detail,
+}
+
+
+def merge_detail(row, detail):
+    """Merge detail page fields into a row, only replacing missing or placeholder values
+
+    A longer materials list replaces the truncated one from the listing.
+    Detail text is cleaned like the listing rows before it is compared.
+    """
+    detail = normalize_record(dict(detail))
+    for key, value in detail.items():
+        if isinstance(value, list):
+            value = [item for item in value if item]
+        if value in (None, "", []):
+            continue
+        current = row.get(key)
+        if isinstance(value, list):
+            if not isinstance(current, list) or current == ["Materials not specified"] or len(value) > len(current):
+                row[key] = value
+        elif current is None or current in PLACEHOLDERS:
+            row[key] = value
+    return row
+
+
+def _has_details_url(row):
+    url = row.get("details_url") or ""
+    return url.startswith("http")
+
+
+def enrich_rows(rows, site, session=None, concurrency=4, rate=None, cache=None, batch_size=50, stats=None):
+    """Yield rows merged with the fields from their detail pages
+
+    Rows are taken in batches of batch_size and their details_url pages are
+    fetched concurrently over one pooled session, with at most concurrency
+    requests per host and retries with backoff from create_session. Cached
+    pages skip the network. Rows without a detail URL, or whose page fails,
+    are passed through unchanged, in the original order.
+    """
+    parse_detail = DETAIL_PARSERS[site]
+    stats = stats if stats is not None else {}
+    for key in ("rows", "pages_fetched", "failed"):
+        stats.setdefault(key, 0)
+    fetcher = AsyncFetcher(session or create_session(pool_size=concurrency), per_host=concurrency, rate=rate,
+                           cache=cache)
+
+    def flush(batch):
+        urls = list(dict.fromkeys(row["details_url"] for row in batch if _has_details_url(row)))
+        start = time.perf_counter()
+        pages = dict(zip(urls, fetcher.run(urls))) if urls else {}
+        if urls:
+            print(f"Fetched {len(urls)} detail page(s) in {time.perf_counter() - start:.2f}s")
+
+        for row in batch:
+            html = pages.get(row.get("details_url"))
+            if isinstance(html, Exception):
+                print(f"Failed to fetch details for {row.get('details_url')}: {html}")
+                stats["failed"] += 1
+            elif html is not None:
+                merge_detail(row, parse_detail(html, row))
+            stats["rows"] += 1
+        stats["pages_fetched"] += sum(1 for html in pages.values() if not isinstance(html, Exception))
+        return batch
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield from flush(batch)
+            batch = []
+    if batch:
+        yield from flush(batch)
@@ -0,0 +1,20 @@
+from bs4 import BeautifulSoup
+
+# lxml is much faster than the pure-Python parser but stays optional
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def make_soup(html):
+    """Parse an HTML document with the fastest available parser"""
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+def element_text(element):
+    """Return the visible text of an element with whitespace collapsed"""
+    if element is None:
+        return ""
+    return " ".join(element.get_text(" ").split())
@@ -0,0 +1,150 @@
+from urllib.parse import urlsplit
+import asyncio
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .telemetry import telemetry
+
+# Browser-like headers so the sites serve the same markup Chrome receives
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def create_session(pool_size=10, retries=2):
+    """Create a requests session with a keep-alive connection pool"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+def fetch_html(session, url, timeout=30, cache=None):
+    """Fetch a page and return its HTML, raising on HTTP errors
+
+    When a PageCache is given, a fresh cached copy is returned without
+    touching the network and new responses are stored in it.
+    """
+    if cache is not None:
+        html = cache.get(url)
+        if html is not None:
+            telemetry.count("cache_hits")
+            return html
+
+    host = urlsplit(url).netloc
+    with telemetry.span("fetch", host=host, url=url):
+        response = session.get(url, timeout=timeout)
+    telemetry.count("http_responses", host=host, status=response.status_code)
+    telemetry.count("bytes_fetched", len(response.content), host=host)
+    response.raise_for_status()
+    # requests assumes ISO-8859-1 when the server omits the charset
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = "utf-8"
+
+    if cache is not None:
+        cache.put(url, response.text)
+    return response.text
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token and return how long the caller must wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class AsyncFetcher:
+    """Fetch many pages concurrently from asyncio
+
+    Requests run on worker threads over one pooled session. Each host gets
+    at most per_host requests in flight, and the optional token bucket
+    rate-limits all of them together. The time each network request took
+    (after waiting for its slot) is kept in timings, keyed by URL.
+    """
+
+    def __init__(self, session=None, per_host=4, rate=None, burst=None, timeout=30, cache=None):
+        self.session = session or create_session(pool_size=per_host)
+        self.per_host = per_host
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.timeout = timeout
+        self.cache = cache
+        self.timings = {}
+        self._host_limits = {}
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def fetch(self, url):
+        # Cache hits skip both the concurrency slot and the rate limit
+        if self.cache is not None:
+            html = self.cache.get(url)
+            if html is not None:
+                return html
+
+        async with self._host_limit(url):
+            if self.bucket:
+                await self.bucket.acquire_async()
+            return await asyncio.to_thread(self._fetch_and_store, url)
+
+    def _fetch_and_store(self, url):
+        start = time.perf_counter()
+        html = fetch_html(self.session, url, self.timeout)
+        self.timings[url] = time.perf_counter() - start
+        if self.cache is not None:
+            self.cache.put(url, html)
+        return html
+
+    async def fetch_all(self, urls, return_exceptions=True):
+        """Fetch every URL and return the results in the same order as urls"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=return_exceptions)
+
+    def run(self, urls, return_exceptions=True):
+        """Synchronous wrapper around fetch_all"""
+        # Semaphores belong to the event loop that first uses them
+        self._host_limits = {}
+        return asyncio.run(self.fetch_all(urls, return_exceptions))
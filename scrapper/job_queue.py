@@ -0,0 +1,600 @@
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from .coverage import load_zip_codes
+from .telemetry import add_telemetry_arguments, export_telemetry, telemetry
+
+DEFAULT_QUEUE_PATH = "job_queue.sqlite3"
+
+# Minimum seconds between two jobs of a site, across every worker sharing the queue
+DEFAULT_SITE_INTERVALS = {
+    "earth911": 1.0,
+    "bestbuy": 2.0,
+}
+
+JOB_FIELDS = ["id", "site", "query", "zip_code", "radius", "page", "params", "attempts", "lease_token"]
+
+
+class SQLiteJobQueue:
+    """Durable queue of scrape units shared by worker processes
+
+    A unit is one (site, query, zip_code, radius, page), like a checkpoint
+    unit, and is only ever queued once. claim() leases the oldest pending
+    unit to one worker for lease_seconds; the worker extends the lease with
+    heartbeat() while it runs and hands the rows back with complete(). A
+    lease that is not renewed in time (the worker died or hung) goes back
+    to pending on the next claim(), and a unit that keeps failing is
+    marked failed after max_attempts. complete() and fail() only count for
+    the current lease holder, so a worker that lost its lease cannot
+    overwrite the unit's new owner.
+
+    reserve_slot() enforces a minimum interval between jobs of the same
+    site for every process using the file. All writes run in BEGIN
+    IMMEDIATE transactions, so any number of processes on one host can
+    share the queue. SQLite must not be shared over a network file system;
+    for several hosts, register a backend with the same methods in
+    QUEUE_BACKENDS.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                site TEXT NOT NULL,
+                query TEXT NOT NULL,
+                zip_code TEXT NOT NULL,
+                radius TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                worker TEXT,
+                lease_token TEXT,
+                lease_expires REAL,
+                rows TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (site, query, zip_code, radius, page)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, available_at);
+            CREATE TABLE IF NOT EXISTS sites (
+                site TEXT PRIMARY KEY,
+                min_interval REAL NOT NULL,
+                next_slot REAL NOT NULL DEFAULT 0
+            );
+        """)
+
+    def _transaction(self, work):
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self.db)
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+            return result
+
+    @staticmethod
+    def _key(site, query, zip_code, radius):
+        # Same text key as CheckpointStore, so sites without a radius still form a unique key
+        return (site, query or "", str(zip_code), "" if radius is None else str(radius))
+
+    def enqueue(self, units, max_attempts=3):
+        """Queue (site, query, zip_code, radius, page, params) units; returns how many were new"""
+        def insert(db):
+            now = time.time()
+            added = 0
+            for site, query, zip_code, radius, page, params in units:
+                added += db.execute("""
+                    INSERT OR IGNORE INTO jobs (site, query, zip_code, radius, page, params, max_attempts,
+                                                available_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, self._key(site, query, zip_code, radius) + (page, json.dumps(params or {}), max_attempts,
+                                                                 now, now)).rowcount
+                db.execute("INSERT OR IGNORE INTO sites (site, min_interval) VALUES (?, ?)",
+                           (site, DEFAULT_SITE_INTERVALS.get(site, 1.0)))
+            return added
+        return self._transaction(insert)
+
+    def claim(self, worker, lease_seconds=120, sites=None):
+        """Lease the oldest pending unit to worker, or return None if there is none
+
+        Expired leases are put back first (or failed, once out of attempts).
+        """
+        def take(db):
+            now = time.time()
+            requeued = db.execute("""
+                UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+                                error = 'lease expired', worker = NULL, lease_token = NULL, updated_at = ?
+                WHERE status = 'leased' AND lease_expires < ?
+            """, (now, now)).rowcount
+            if requeued:
+                print(f"Re-queued {requeued} job(s) with expired leases")
+                telemetry.count("leases_expired", requeued)
+
+            sql = "SELECT id FROM jobs WHERE status = 'pending' AND available_at <= ?"
+            params = [now]
+            if sites:
+                sql += f" AND site IN ({', '.join('?' * len(sites))})"
+                params.extend(sites)
+            row = db.execute(sql + " ORDER BY id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+
+            token = uuid.uuid4().hex
+            db.execute("""
+                UPDATE jobs SET status = 'leased', worker = ?, lease_token = ?, lease_expires = ?,
+                                attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+            """, (worker, token, now + lease_seconds, now, row[0]))
+            job = db.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE id = ?", (row[0],)).fetchone()
+            job = dict(zip(JOB_FIELDS, job))
+            job["params"] = json.loads(job["params"])
+            return job
+        return self._transaction(take)
+
+    def heartbeat(self, job, lease_seconds=120):
+        """Extend the lease on job; returns False if it has been lost"""
+        now = time.time()
+        with self.lock:
+            return self.db.execute("""
+                UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_token = ? AND status = 'leased'
+            """, (now + lease_seconds, now, job["id"], job["lease_token"])).rowcount == 1
+
+    def complete(self, job, rows, follow_ups=()):
+        """Store the rows of a leased unit and queue its follow-up units, atomically
+
+        Returns False (and stores nothing) if the lease was lost.
+        """
+        def finish(db):
+            updated = db.execute("""
+                UPDATE jobs SET status = 'done', rows = ?, error = NULL, lease_token = NULL, lease_expires = NULL,
+                                updated_at = ?
+                WHERE id = ? AND lease_token = ? AND status = 'leased'
+            """, (json.dumps(rows), time.time(), job["id"], job["lease_token"])).rowcount
+            if not updated:
+                return False
+            now = time.time()
+            for site, query, zip_code, radius, page, params in follow_ups:
+                db.execute("""
+                    INSERT OR IGNORE INTO jobs (site, query, zip_code, radius, page, params, max_attempts,
+                                                available_at, updated_at)
+                    SELECT ?, ?, ?, ?, ?, ?, max_attempts, ?, ? FROM jobs WHERE id = ?
+                """, self._key(site, query, zip_code, radius) + (page, json.dumps(params or {}), now, now, job["id"]))
+            return True
+        return self._transaction(finish)
+
+    def fail(self, job, error, retry_delay=30):
+        """Give a unit back after an error; it is retried after a growing delay until out of attempts"""
+        now = time.time()
+        with self.lock:
+            return self.db.execute("""
+                UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+                                available_at = ? + ? * attempts, error = ?, worker = NULL, lease_token = NULL,
+                                lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND lease_token = ? AND status = 'leased'
+            """, (now, retry_delay, str(error), now, job["id"], job["lease_token"])).rowcount == 1
+
+    def retry_failed(self, site=None):
+        """Put failed units back in the queue with fresh attempts"""
+        sql = "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ? WHERE status = 'failed'"
+        params = [time.time()]
+        if site:
+            sql += " AND site = ?"
+            params.append(site)
+        with self.lock:
+            return self.db.execute(sql, params).rowcount
+
+    def set_site_interval(self, site, seconds):
+        with self.lock:
+            self.db.execute("""
+                INSERT INTO sites (site, min_interval) VALUES (?, ?)
+                ON CONFLICT (site) DO UPDATE SET min_interval = excluded.min_interval
+            """, (site, seconds))
+
+    def reserve_slot(self, site):
+        """Book the next start time for a job of site and return how long to wait for it"""
+        def reserve(db):
+            now = time.time()
+            row = db.execute("SELECT min_interval, next_slot FROM sites WHERE site = ?", (site,)).fetchone()
+            min_interval, next_slot = row or (DEFAULT_SITE_INTERVALS.get(site, 1.0), 0)
+            slot = max(now, next_slot)
+            db.execute("INSERT OR REPLACE INTO sites (site, min_interval, next_slot) VALUES (?, ?, ?)",
+                       (site, min_interval, slot + min_interval))
+            return slot - now
+        return self._transaction(reserve)
+
+    def counts(self):
+        """Return {site: {status: number of units}}"""
+        with self.lock:
+            rows = self.db.execute("SELECT site, status, COUNT(*) FROM jobs GROUP BY site, status").fetchall()
+        counts = {}
+        for site, status, count in rows:
+            counts.setdefault(site, {})[status] = count
+        return counts
+
+    def unfinished(self, sites=None):
+        """Number of units still pending or leased"""
+        sql = "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+        params = []
+        if sites:
+            sql += f" AND site IN ({', '.join('?' * len(sites))})"
+            params.extend(sites)
+        with self.lock:
+            return self.db.execute(sql, params).fetchone()[0]
+
+    def results(self, site):
+        """Yield the rows of every finished unit of a site, in search and page order"""
+        with self.lock:
+            finished = self.db.execute("""
+                SELECT rows FROM jobs WHERE site = ? AND status = 'done' ORDER BY query, zip_code, radius, page
+            """, (site,)).fetchall()
+        for (rows,) in finished:
+            yield from json.loads(rows)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+# Queue location scheme -> backend class. A plain path means sqlite.
+QUEUE_BACKENDS = {
+    "sqlite": SQLiteJobQueue,
+}
+
+
+def open_queue(location=DEFAULT_QUEUE_PATH):
+    """Open a queue from a path or a scheme://location string (see QUEUE_BACKENDS)"""
+    scheme, separator, rest = location.partition("://")
+    if not separator:
+        scheme, rest = "sqlite", location
+    if scheme not in QUEUE_BACKENDS:
+        raise ValueError(f"Unknown queue backend {scheme!r} - expected one of {', '.join(QUEUE_BACKENDS)}")
+    return QUEUE_BACKENDS[scheme](rest)
+
+
+class LeaseKeeper(threading.Thread):
+    """Renew a job's lease in the background while the job runs"""
+
+    def __init__(self, queue, job, lease_seconds):
+        super().__init__(name=f"lease-{job['id']}", daemon=True)
+        self.queue = queue
+        self.job = job
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._finished = threading.Event()
+
+    def run(self):
+        while not self._finished.wait(self.lease_seconds / 3):
+            if not self.queue.heartbeat(self.job, self.lease_seconds):
+                print(f"Lost the lease on job {self.job['id']}")
+                self.lost = True
+                return
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._finished.set()
+        self.join()
+        return False
+
+
+def run_earth911_job(worker, job):
+    """Scrape one Earth911 results page; page 1 also queues the remaining pages"""
+    from .earth911_http import SEARCH_URL, build_search_url, parse_recycling_html, plan_remaining_pages
+    from .html_utils import make_soup
+    from .http_client import fetch_html
+
+    params = job["params"]
+    url = build_search_url(job["query"], job["zip_code"], job["radius"], page=job["page"],
+                           base_url=params.get("base_url") or SEARCH_URL)
+    if params.get("engine") == "chrome":
+        from .earth911_scrapper import extract_recycling_data
+
+        driver = worker.driver()
+        driver.get(url)
+        with telemetry.span("extract", site="earth911", page=job["page"]):
+            rows = extract_recycling_data(driver)
+        soup = make_soup(driver.page_source)
+    else:
+        rows, soup = parse_recycling_html(fetch_html(worker.session(), url), url)
+
+    # Page 1 queues every remaining page when the result count gives it the
+    # page count; otherwise each page queues the next one it links to
+    max_pages = params.get("max_pages")
+    chained = bool(params.get("chained"))
+    if job["page"] == 1:
+        planned = plan_remaining_pages(soup, url, len(rows), max_pages)
+        chained = planned is None
+        pages = [2] if chained and soup.select_one("a.next") else range(2, len(planned or []) + 2)
+    else:
+        pages = [job["page"] + 1] if chained and soup.select_one("a.next") else []
+
+    follow_ups = [
+        ("earth911", job["query"], job["zip_code"], job["radius"], page, dict(params, chained=chained))
+        for page in pages if not max_pages or page <= max_pages
+    ]
+    return rows, follow_ups
+
+
+def run_bestbuy_job(worker, job):
+    """Look up the Best Buy stores around one ZIP, through the Stores API or the store locator"""
+    params = job["params"]
+    if params.get("engine") == "api":
+        from .bestbuy_api import STORES_API_URL, StoreApiClient
+
+        # The key comes from BESTBUY_API_KEY on each worker host, so it is never stored in the queue
+        client = StoreApiClient(api_url=params.get("api_url") or STORES_API_URL, session=worker.session())
+        return client.search(job["zip_code"], job["radius"] or 25), []
+
+    from .bestBut_scrapper import STORE_LOCATOR_URL, search_stores
+    stores = search_stores(worker.driver(), job["zip_code"], params.get("extract_mode", "js"),
+                           locator_url=params.get("locator_url") or STORE_LOCATOR_URL)
+    # None means the search could not be run, so the unit goes back for a retry;
+    # an empty list is a loaded page with no stores in range and is done
+    if stores is None:
+        raise RuntimeError(f"The store search for ZIP {job['zip_code']} could not be run")
+    return stores, []
+
+
+# Site -> function(worker, job) returning (rows, follow-up units)
+JOB_HANDLERS = {
+    "earth911": run_earth911_job,
+    "bestbuy": run_bestbuy_job,
+}
+
+
+class QueueWorker:
+    """Claim units from a queue and run them until it is drained
+
+    The HTTP session and the Chrome session are created on first use and
+    kept for every job this worker runs. Each job waits for its site's
+    politeness slot before it starts.
+    """
+
+    def __init__(self, queue, worker_id=None, lease_seconds=120, poll_interval=2, sites=None, browser_options=None,
+                 keep_polling=False):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.sites = sites
+        self.browser_options = browser_options or {}
+        self.keep_polling = keep_polling
+        self.stats = {"done": 0, "failed": 0, "lost": 0, "rows": 0}
+        self._session = None
+        self._sessions = None
+        self._driver_session = None
+
+    def session(self):
+        if self._session is None:
+            from .http_client import create_session
+            self._session = create_session()
+        return self._session
+
+    def driver(self):
+        if self._driver_session is None:
+            from .sessions import SessionManager
+            self._sessions = SessionManager(max_sessions=1, **self.browser_options)
+            self._driver_session = self._sessions.acquire()
+        return self._driver_session.driver
+
+    def run_one(self, job):
+        unit = f"{job['site']} {job['query']!r} {job['zip_code']} page {job['page']}"
+        # The lease is renewed while waiting for the politeness slot too, which
+        # with many workers on one site can take longer than the lease itself
+        with LeaseKeeper(self.queue, job, self.lease_seconds) as keeper:
+            delay = self.queue.reserve_slot(job["site"])
+            if delay > 0:
+                time.sleep(delay)
+            if keeper.lost:
+                print(f"[{self.worker_id}] {unit} lost its lease while waiting for its slot")
+                self.stats["lost"] += 1
+                return
+
+            start = time.perf_counter()
+            try:
+                rows, follow_ups = JOB_HANDLERS[job["site"]](self, job)
+            except Exception as e:
+                print(f"[{self.worker_id}] {unit} failed: {e}")
+                telemetry.count("jobs_failed", site=job["site"])
+                self.stats["failed"] += 1
+                self.queue.fail(job, e)
+                self._discard_driver()
+                return
+        telemetry.record("job", time.perf_counter() - start, site=job["site"])
+
+        if keeper.lost or not self.queue.complete(job, rows, follow_ups):
+            print(f"[{self.worker_id}] {unit} finished after its lease expired - rows discarded")
+            self.stats["lost"] += 1
+            return
+        print(f"[{self.worker_id}] {unit}: {len(rows)} rows, {len(follow_ups)} follow-up job(s)")
+        telemetry.count("jobs_done", site=job["site"])
+        self.stats["done"] += 1
+        self.stats["rows"] += len(rows)
+
+    def run(self):
+        try:
+            while True:
+                job = self.queue.claim(self.worker_id, self.lease_seconds, self.sites)
+                if job is not None:
+                    self.run_one(job)
+                elif self.keep_polling or self.queue.unfinished(self.sites):
+                    # Units leased by other workers may still expire and come back
+                    time.sleep(self.poll_interval)
+                else:
+                    break
+        finally:
+            self.close()
+        print(f"[{self.worker_id}] finished: {self.stats['done']} done, {self.stats['failed']} failed, "
+              f"{self.stats['lost']} lost lease(s), {self.stats['rows']} rows")
+        return self.stats
+
+    def _discard_driver(self):
+        # A failed job may have left Chrome in a bad state
+        if self._driver_session is not None:
+            self._sessions.release(self._driver_session, discard=True)
+            self._driver_session = None
+
+    def close(self):
+        if self._driver_session is not None:
+            self._sessions.release(self._driver_session)
+            self._driver_session = None
+        if self._sessions is not None:
+            self._sessions.close()
+        if self._session is not None:
+            self._session.close()
+
+
+def work(location, worker_id=None, **options):
+    """Run one QueueWorker on its own queue connection (the target of each worker process)"""
+    queue = open_queue(location)
+    try:
+        return QueueWorker(queue, worker_id, **options).run()
+    finally:
+        queue.close()
+
+
+def run_workers(location, processes=1, **options):
+    """Run QueueWorkers in processes separate processes until the queue is drained"""
+    if processes <= 1:
+        work(location, **options)
+        return
+    host = socket.gethostname()
+    pool = [
+        multiprocessing.Process(target=work, args=(location, f"{host}-{number}"), kwargs=options,
+                                name=f"queue-worker-{number}")
+        for number in range(1, processes + 1)
+    ]
+    for process in pool:
+        process.start()
+    for process in pool:
+        process.join()
+
+
+def parse_intervals(values):
+    """Turn ["earth911=0.5", ...] into {"earth911": 0.5, ...}"""
+    intervals = {}
+    for value in values:
+        site, separator, seconds = value.partition("=")
+        if not separator:
+            raise argparse.ArgumentTypeError(f"expected SITE=SECONDS, got {value!r}")
+        intervals[site] = float(seconds)
+    return intervals
+
+
+def enqueue_command(queue, args):
+    zip_codes = load_zip_codes(args.zips, args.zips_file)
+    if args.site == "earth911":
+        params = {"engine": args.engine or "http", "max_pages": args.max_pages, "base_url": args.base_url}
+        radius = f"{args.radius or 100:g}"
+        units = [("earth911", args.what, zip_code, radius, 1, params) for zip_code in zip_codes]
+    else:
+        params = {"engine": args.engine or "browser", "extract_mode": args.extract_mode, "api_url": args.api_url,
+                  "locator_url": args.base_url}
+        radius = f"{args.radius or 25:g}" if params["engine"] == "api" else None
+        units = [("bestbuy", "stores", zip_code, radius, 1, params) for zip_code in zip_codes]
+    added = queue.enqueue(units, args.max_attempts)
+    print(f"Queued {added} new job(s) ({len(units) - added} already in the queue)")
+
+
+def export_command(queue, args):
+    from .sinks import open_sink, write_rows
+
+    if args.site == "earth911":
+        from .earth911_scrapper import CSV_HEADERS
+        from .records import dedupe_rows
+
+        with open_sink(args.output, CSV_HEADERS, args.format) as sink:
+            total = write_rows(dedupe_rows(queue.results("earth911")), sink)
+        print(f"Saved {total} facilities to {args.output}")
+    else:
+        from .bestBut_scrapper import save_store_data_to_csv
+        from .bestbuy_batch import merge_stores
+
+        save_store_data_to_csv(merge_stores([queue.results("bestbuy")]), args.output, args.format)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distribute scrape jobs over worker processes through a shared queue")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH,
+                        help=f"Queue file or scheme://location (default: {DEFAULT_QUEUE_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Queue one job per ZIP code")
+    enqueue.add_argument("site", choices=sorted(JOB_HANDLERS))
+    enqueue.add_argument("--zips", nargs="*", default=[], help="ZIP codes to search")
+    enqueue.add_argument("--zips-file", help="File with one ZIP code per line, or a plan from plan_coverage.py")
+    enqueue.add_argument("--what", default="Electronics", help="Earth911 material or category")
+    enqueue.add_argument("--radius", type=float, help="Search radius in miles (Earth911: 100, Best Buy API: 25)")
+    enqueue.add_argument("--max-pages", type=int, default=5, help="Earth911 result pages per ZIP (0 for all)")
+    enqueue.add_argument("--engine", choices=["http", "chrome", "browser", "api"],
+                         help="Earth911: http or chrome; Best Buy: browser or api")
+    enqueue.add_argument("--extract-mode", choices=["dom", "js"], default="js", help="Best Buy browser extraction")
+    enqueue.add_argument("--api-url", help="Best Buy Stores API URL template")
+    enqueue.add_argument("--base-url", help="Override the Earth911 search page or Best Buy store locator URL")
+    enqueue.add_argument("--max-attempts", type=int, default=3, help="Tries before a job is marked failed")
+
+    worker = commands.add_parser("work", help="Run workers until the queue is drained")
+    worker.add_argument("--processes", type=int, default=1, help="Worker processes on this host")
+    worker.add_argument("--site", dest="sites", action="append", choices=sorted(JOB_HANDLERS),
+                        help="Only take jobs of this site (repeatable)")
+    worker.add_argument("--lease", type=float, default=120, help="Seconds a job stays leased without a heartbeat")
+    worker.add_argument("--min-interval", action="append", default=[], metavar="SITE=SECONDS",
+                        help="Minimum seconds between jobs of a site across all workers (saved in the queue)")
+    worker.add_argument("--keep-polling", action="store_true", help="Wait for new jobs instead of exiting when drained")
+    worker.add_argument("--headed", action="store_true", help="Show Chrome instead of running headless")
+
+    commands.add_parser("status", help="Print job counts per site and status")
+
+    retry = commands.add_parser("retry", help="Put failed jobs back in the queue")
+    retry.add_argument("--site", choices=sorted(JOB_HANDLERS))
+
+    export = commands.add_parser("export", help="Write the rows of the finished jobs of a site")
+    export.add_argument("site", choices=sorted(JOB_HANDLERS))
+    export.add_argument("--output", required=True, help="File to write the rows to")
+    export.add_argument("--format", choices=["csv", "jsonl", "parquet"], default=None,
+                        help="Output format (default: taken from the --output extension)")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+
+    queue = open_queue(args.queue)
+    try:
+        if args.command == "enqueue":
+            if args.max_pages == 0:
+                args.max_pages = None
+            enqueue_command(queue, args)
+        elif args.command == "work":
+            for site, seconds in parse_intervals(args.min_interval).items():
+                queue.set_site_interval(site, seconds)
+            run_workers(args.queue, args.processes, lease_seconds=args.lease, sites=args.sites,
+                        keep_polling=args.keep_polling, browser_options={"headless": not args.headed})
+        elif args.command == "retry":
+            print(f"Re-queued {queue.retry_failed(args.site)} failed job(s)")
+        elif args.command == "export":
+            export_command(queue, args)
+        for site, counts in sorted(queue.counts().items()):
+            print(f"{site}: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    finally:
+        queue.close()
+        export_telemetry(args)
+
+
+if __name__ == "__main__":
+    main()
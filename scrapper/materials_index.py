@@ -0,0 +1,268 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+
+from .records import canonical_address, canonical_name, clean_text, record_key
+from .sinks import LIST_SEPARATOR, open_sink, write_rows
+
+DEFAULT_MATERIALS_INDEX_PATH = "materials_index.sqlite3"
+
+# Placeholder written by build_recycling_entry when a facility lists nothing
+NO_MATERIALS = "Materials not specified"
+
+# Facility columns kept next to the material bitsets
+FACILITY_FIELDS = ["record_key", "business_name", "street_address"]
+
+
+def material_key(name):
+    """Case- and whitespace-insensitive lookup key for a material name"""
+    return clean_text(name).casefold()
+
+
+def split_materials(value):
+    """Accept materials_accepted as a list or as the "; "-joined CSV text"""
+    if isinstance(value, str):
+        value = value.split(LIST_SEPARATOR.strip())
+    return value or []
+
+
+def iter_bits(bits):
+    """Yield the positions of the set bits of an int, lowest first"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def _to_blob(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def _from_blob(blob):
+    return int.from_bytes(blob, "little")
+
+
+def _set_bit(bitmap, position):
+    byte = position >> 3
+    if byte >= len(bitmap):
+        bitmap.extend(bytes(byte + 1 - len(bitmap)))
+    bitmap[byte] |= 1 << (position & 7)
+
+
+def _clear_bit(bitmap, position):
+    byte = position >> 3
+    if byte < len(bitmap):
+        bitmap[byte] &= ~(1 << (position & 7)) & 0xFF
+
+
+class MaterialsIndex:
+    """Facilities by material, as integer-coded bitsets instead of joined strings
+
+    Every distinct material gets an integer code (its position in
+    vocabulary). Each facility is a row in parallel column lists and has
+    a bitset of the material codes it accepts; each material has a
+    posting bitmap of the facility rows that accept it. AND/OR queries
+    are bitwise operations over the postings, so they never re-read or
+    split the materials text. Postings are bytearrays, so adding a
+    facility sets one bit in place; queries turn them into Python ints.
+    """
+
+    def __init__(self):
+        self.vocabulary = []
+        self.codes = {}
+        self.postings = []
+        self.columns = {field: [] for field in FACILITY_FIELDS}
+        self.material_bits = []
+        self.rows_by_key = {}
+        # Raw material text -> code (None for placeholders), so each distinct
+        # spelling is cleaned only once
+        self._raw_codes = {}
+
+    def __len__(self):
+        return len(self.material_bits)
+
+    def code(self, material, create=False):
+        """Return the integer code of a material, or None if it is unknown"""
+        key = material_key(material)
+        code = self.codes.get(key)
+        if code is None and create:
+            code = self.codes[key] = len(self.vocabulary)
+            self.vocabulary.append(clean_text(material))
+            self.postings.append(bytearray())
+        return code
+
+    def add(self, row):
+        """Index one facility row; a record_key seen before is replaced"""
+        bits = 0
+        for material in split_materials(row.get("materials_accepted")):
+            if material in self._raw_codes:
+                code = self._raw_codes[material]
+            else:
+                cleaned = clean_text(material)
+                code = self.code(cleaned, create=True) if cleaned and cleaned != NO_MATERIALS else None
+                self._raw_codes[material] = code
+            if code is not None:
+                bits |= 1 << code
+
+        # Exports written before record_key existed get the same key computed here
+        key = row.get("record_key") or record_key(canonical_name(row.get("business_name") or ""),
+                                                  canonical_address(row.get("street_address") or ""))
+        position = self.rows_by_key.get(key)
+        if position is None:
+            position = self.rows_by_key[key] = len(self.material_bits)
+            for field in FACILITY_FIELDS:
+                self.columns[field].append(None)
+            self.material_bits.append(0)
+        else:
+            for code in iter_bits(self.material_bits[position]):
+                _clear_bit(self.postings[code], position)
+
+        for field in FACILITY_FIELDS:
+            self.columns[field][position] = key if field == "record_key" else clean_text(row.get(field))
+        self.material_bits[position] = bits
+        for code in iter_bits(bits):
+            _set_bit(self.postings[code], position)
+
+    def add_rows(self, rows):
+        for row in rows:
+            self.add(row)
+        return self
+
+    def _posting(self, material):
+        code = self.code(material)
+        return 0 if code is None else _from_blob(self.postings[code])
+
+    def match(self, all_of=(), any_of=()):
+        """Return the bitset of facility rows accepting every all_of material and at least one any_of material"""
+        bits = (1 << len(self)) - 1
+        for material in all_of:
+            bits &= self._posting(material)
+        if any_of:
+            either = 0
+            for material in any_of:
+                either |= self._posting(material)
+            bits &= either
+        return bits
+
+    def facility(self, position):
+        row = {field: self.columns[field][position] for field in FACILITY_FIELDS}
+        row["materials_accepted"] = [self.vocabulary[code] for code in iter_bits(self.material_bits[position])]
+        return row
+
+    def query(self, all_of=(), any_of=()):
+        """Return the facilities matching the material filters (see match)"""
+        return [self.facility(position) for position in iter_bits(self.match(all_of, any_of))]
+
+    def counts(self):
+        """Return {material: number of facilities accepting it}, most common first"""
+        counts = {material: _from_blob(self.postings[code]).bit_count() for code, material in enumerate(self.vocabulary)}
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def save(self, path=DEFAULT_MATERIALS_INDEX_PATH):
+        """Write the vocabulary, facility columns and both bitset directions to SQLite"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        db = sqlite3.connect(temp_path)
+        db.executescript("""
+            CREATE TABLE materials (code INTEGER PRIMARY KEY, name TEXT NOT NULL, facilities BLOB NOT NULL);
+            CREATE TABLE facilities (
+                position INTEGER PRIMARY KEY,
+                record_key TEXT NOT NULL,
+                business_name TEXT,
+                street_address TEXT,
+                materials BLOB NOT NULL
+            );
+        """)
+        db.executemany("INSERT INTO materials VALUES (?, ?, ?)", (
+            (code, material, bytes(self.postings[code])) for code, material in enumerate(self.vocabulary)
+        ))
+        db.executemany("INSERT INTO facilities VALUES (?, ?, ?, ?, ?)", (
+            (position, *(self.columns[field][position] for field in FACILITY_FIELDS), _to_blob(bits))
+            for position, bits in enumerate(self.material_bits)
+        ))
+        db.commit()
+        db.close()
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MATERIALS_INDEX_PATH):
+        index = cls()
+        db = sqlite3.connect(path)
+        try:
+            for code, material, facilities in db.execute("SELECT code, name, facilities FROM materials ORDER BY code"):
+                index.codes[material_key(material)] = code
+                index.vocabulary.append(material)
+                index.postings.append(bytearray(facilities))
+            rows = db.execute(f"SELECT {', '.join(FACILITY_FIELDS)}, materials FROM facilities ORDER BY position")
+            for *values, materials in rows:
+                for field, value in zip(FACILITY_FIELDS, values):
+                    index.columns[field].append(value)
+                index.rows_by_key[values[0]] = len(index.material_bits)
+                index.material_bits.append(_from_blob(materials))
+        finally:
+            db.close()
+        return index
+
+
+def index_materials(rows, index):
+    """Add each row to a MaterialsIndex as it streams past"""
+    for row in rows:
+        index.add(row)
+        yield row
+
+
+def read_export(path):
+    """Read the rows of a CSV or JSONL export"""
+    if path.endswith((".jsonl", ".json", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the Earth911 materials index")
+    parser.add_argument("--index", default=DEFAULT_MATERIALS_INDEX_PATH, help="Index file")
+    parser.add_argument("--build", nargs="+", metavar="EXPORT",
+                        help="(Re)build the index from these CSV/JSONL exports of earth911_scrapper.py")
+    parser.add_argument("--all", dest="all_of", action="append", default=[], metavar="MATERIAL",
+                        help="Only facilities accepting this material (repeat for AND)")
+    parser.add_argument("--any", dest="any_of", action="append", default=[], metavar="MATERIAL",
+                        help="Facilities accepting at least one of these materials (repeat for OR)")
+    parser.add_argument("--list", action="store_true", help="List the materials with their facility counts")
+    parser.add_argument("--output", help="Write the matching facilities to this file instead of printing them")
+    args = parser.parse_args()
+
+    if args.build:
+        index = MaterialsIndex()
+        for path in args.build:
+            index.add_rows(read_export(path))
+        index.save(args.index)
+        print(f"Indexed {len(index)} facilities and {len(index.vocabulary)} materials into {args.index}")
+    else:
+        index = MaterialsIndex.load(args.index)
+
+    if args.list:
+        for material, count in index.counts().items():
+            print(f"{count:6d}  {material}")
+
+    if args.all_of or args.any_of:
+        for material in args.all_of + args.any_of:
+            if index.code(material) is None:
+                print(f"Unknown material: {material}")
+        matches = index.query(args.all_of, args.any_of)
+        if args.output:
+            with open_sink(args.output, FACILITY_FIELDS + ["materials_accepted"]) as sink:
+                write_rows(matches, sink)
+            print(f"Saved {len(matches)} matching facilities to {args.output}")
+        else:
+            for row in matches:
+                print(f"{row['business_name']} - {row['street_address']}")
+            print(f"{len(matches)} of {len(index)} facilities match")
+
+
+if __name__ == "__main__":
+    main()
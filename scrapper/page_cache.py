@@ -0,0 +1,283 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import argparse
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_DIR = ".page_cache"
+
+# Eviction frees space down to this share of max_bytes, so it runs once per
+# batch of writes instead of on every put near the limit
+EVICT_TO_FRACTION = 0.9
+
+
+def canonical_url(url):
+    """Normalise a URL so equivalent requests share a cache entry
+
+    Query parameters are sorted and the fragment is dropped.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class PageCache:
+    """On-disk cache of fetched HTML and rendered DOM snapshots
+
+    Entries are keyed by kind ("http" for raw responses, "dom" for Selenium
+    page_source snapshots) plus the canonical URL. Bodies are stored gzipped
+    under their SHA-256 so identical pages are only kept once. A SQLite index
+    tracks age and last access.
+
+    The TTL only decides freshness: get() treats an older entry as a miss,
+    but the entry stays on disk so --replay can still read historical
+    crawls. Entries are only deleted when the cache grows past max_bytes
+    (expired ones first, then the least recently used) or by prune().
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=24 * 3600, max_bytes=500 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_content ON entries (content_hash)")
+        self.db.commit()
+        # Running total of the stored blobs, so put() can tell when to evict without a scan
+        self._bytes = self._total_bytes()
+
+    @staticmethod
+    def cache_key(url, kind="http"):
+        return hashlib.sha256(f"{kind} {canonical_url(url)}".encode("utf-8")).hexdigest()
+
+    def _object_path(self, content_hash):
+        return os.path.join(self.directory, "objects", content_hash[:2], f"{content_hash}.html.gz")
+
+    def _is_expired(self, fetched_at, now):
+        return self.ttl is not None and now - fetched_at > self.ttl
+
+    def get(self, url, kind="http", allow_expired=False):
+        """Return the cached HTML for url, or None on a miss or expired entry"""
+        key = self.cache_key(url, kind)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT content_hash, fetched_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (not allow_expired and self._is_expired(row[1], now)):
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self.db.commit()
+
+        try:
+            with gzip.open(self._object_path(row[0]), "rt", encoding="utf-8") as f:
+                html = f.read()
+        except OSError:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return html
+
+    def put(self, url, html, kind="http"):
+        """Store html for url, evicting a batch of entries if the cache goes over max_bytes"""
+        data = html.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._object_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        key = self.cache_key(url, kind)
+        size = os.path.getsize(path)
+        now = time.time()
+        with self.lock:
+            previous = self.db.execute("SELECT content_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            stored = self.db.execute("SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone()
+            if stored is None:
+                self._bytes += size
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, canonical_url(url), content_hash, size, now, now))
+            self.db.commit()
+            orphaned = self._orphaned({previous[0]} - {content_hash}) if previous else []
+            over_budget = self.max_bytes is not None and self._bytes > self.max_bytes
+        self._remove_blobs(orphaned)
+        if over_budget:
+            self.evict()
+
+    def entries(self, kind=None):
+        """Return (url, kind, fetched_at) for every entry, oldest first"""
+        query = "SELECT url, kind, fetched_at FROM entries"
+        params = ()
+        if kind:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        with self.lock:
+            return self.db.execute(query + " ORDER BY fetched_at", params).fetchall()
+
+    def _total_bytes(self):
+        row = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT content_hash, size FROM entries)").fetchone()
+        return row[0]
+
+    def total_bytes(self):
+        with self.lock:
+            return self._total_bytes()
+
+    def _orphaned(self, content_hashes):
+        """Return the hashes no entry refers to any more and take them off the running total
+
+        Blobs can be shared by several URLs, so only unreferenced ones may go.
+        """
+        orphaned = []
+        for content_hash in content_hashes:
+            referenced = self.db.execute(
+                "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone()
+            if referenced is None:
+                orphaned.append(content_hash)
+                path = self._object_path(content_hash)
+                if os.path.exists(path):
+                    self._bytes -= os.path.getsize(path)
+        return orphaned
+
+    def _remove_blobs(self, content_hashes):
+        for content_hash in content_hashes:
+            try:
+                os.remove(self._object_path(content_hash))
+            except OSError:
+                pass
+
+    def evict(self):
+        """Free space once the cache is over max_bytes, returning how many entries were dropped
+
+        Expired entries go first, oldest first, then the least recently used
+        ones, until the blobs fit in EVICT_TO_FRACTION of max_bytes. The
+        whole batch is picked in one ordered pass over the index.
+        """
+        if self.max_bytes is None:
+            return 0
+        with self.lock:
+            total = self._total_bytes()
+            if total <= self.max_bytes:
+                self._bytes = total
+                return 0
+
+            cutoff = time.time() - self.ttl if self.ttl is not None else 0
+            references = dict(self.db.execute(
+                "SELECT content_hash, COUNT(*) FROM entries GROUP BY content_hash").fetchall())
+            rows = self.db.execute("""
+                SELECT key, content_hash, size FROM entries
+                ORDER BY fetched_at < ? DESC, CASE WHEN fetched_at < ? THEN fetched_at ELSE accessed_at END
+            """, (cutoff, cutoff))
+            target = self.max_bytes * EVICT_TO_FRACTION
+            removed_keys = []
+            orphaned = []
+            for key, content_hash, size in rows:
+                if total <= target:
+                    break
+                removed_keys.append((key,))
+                references[content_hash] -= 1
+                if references[content_hash] == 0:
+                    orphaned.append(content_hash)
+                    total -= size
+            rows.close()
+
+            self.db.executemany("DELETE FROM entries WHERE key = ?", removed_keys)
+            self.db.commit()
+            self._bytes = total
+        self._remove_blobs(orphaned)
+        print(f"Page cache over {self.max_bytes / (1024 * 1024):g} MB - evicted {len(removed_keys)} entries")
+        return len(removed_keys)
+
+    def prune(self, max_age=None):
+        """Delete entries fetched more than max_age seconds ago (default: the TTL)
+
+        Returns how many entries were deleted. Under the size limit this is
+        the only way old entries leave the cache, so run it once the crawls
+        they hold are no longer needed for replay.
+        """
+        max_age = self.ttl if max_age is None else max_age
+        if max_age is None:
+            return 0
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT key, content_hash FROM entries WHERE fetched_at < ?", (time.time() - max_age,)).fetchall()
+            self.db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in rows])
+            self.db.commit()
+            orphaned = self._orphaned({content_hash for _, content_hash in rows})
+        self._remove_blobs(orphaned)
+        return len(rows)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "bytes": self.total_bytes()}
+
+
+def add_cache_arguments(parser):
+    """Add --cache-dir, --cache-ttl and --cache-max-mb to a command line parser"""
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for the page cache")
+    parser.add_argument("--cache-ttl", type=float, default=24,
+                        help="Hours a cached page counts as fresh before it is refetched (0: always fresh). "
+                             "Older pages stay on disk for --replay")
+    parser.add_argument("--cache-max-mb", type=float, default=500, help="Size limit of the page cache in MB")
+
+
+def open_cache(args):
+    """Open the PageCache described by the arguments from add_cache_arguments"""
+    return PageCache(args.cache_dir, ttl=args.cache_ttl * 3600 or None, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or prune the on-disk page cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for the page cache")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Print the entry counts and size of the cache")
+    prune = commands.add_parser("prune", help="Delete entries older than --older-than hours")
+    prune.add_argument("--older-than", type=float, required=True, metavar="HOURS",
+                       help="Delete pages fetched more than this many hours ago")
+    args = parser.parse_args()
+
+    cache = PageCache(args.cache_dir, ttl=None, max_bytes=None)
+    try:
+        if args.command == "prune":
+            print(f"Deleted {cache.prune(args.older_than * 3600)} cached page(s)")
+        counts = {}
+        for _, kind, _ in cache.entries():
+            counts[kind] = counts.get(kind, 0) + 1
+        kinds = ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items()))
+        print(f"{args.cache_dir}: {sum(counts.values())} cached page(s){f' ({kinds})' if kinds else ''}, "
+              f"{cache.total_bytes() / (1024 * 1024):.1f} MB")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
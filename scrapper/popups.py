@@ -0,0 +1,153 @@
+import json
+import time
+
+from .telemetry import telemetry
+
+# Key in sessionStorage where dismissals are logged, so they survive the
+# navigations between result pages
+DISMISSED_KEY = "__scrapperDismissedPopups"
+
+# Installed in every new document before the site's own scripts run. A
+# MutationObserver re-checks the selectors whenever nodes are added or an
+# element's style/class changes, and clicks each visible close button once.
+# Only buttons inside an overlay (fixed/sticky positioning, a dialog or an
+# aria-modal element) are clicked, so broad selectors such as
+# [class*='close'] cannot hit ordinary page content.
+POPUP_DISMISS_SCRIPT = """
+(() => {
+    if (window.__scrapperPopupObserver) return;
+    const selectors = %(selectors)s;
+    const storageKey = %(storage_key)s;
+    const clicked = new WeakSet();
+
+    const visible = element => element.getClientRects().length > 0
+        && getComputedStyle(element).visibility !== "hidden";
+
+    const inOverlay = element => {
+        for (let node = element; node && node.nodeType === 1; node = node.parentElement) {
+            if (node.getAttribute("role") === "dialog" || node.getAttribute("aria-modal") === "true"
+                    || node.tagName === "DIALOG") return true;
+            const position = getComputedStyle(node).position;
+            if (position === "fixed" || position === "sticky") return true;
+        }
+        return false;
+    };
+
+    const log = entry => {
+        try {
+            const entries = JSON.parse(sessionStorage.getItem(storageKey) || "[]");
+            entries.push(entry);
+            sessionStorage.setItem(storageKey, JSON.stringify(entries));
+        } catch (e) {
+            (window.__scrapperDismissedPopups = window.__scrapperDismissedPopups || []).push(entry);
+        }
+    };
+
+    const dismiss = () => {
+        for (const selector of selectors) {
+            let matches;
+            try {
+                matches = document.querySelectorAll(selector);
+            } catch (e) {
+                continue;
+            }
+            for (const element of matches) {
+                if (clicked.has(element) || !visible(element) || !inOverlay(element)) continue;
+                clicked.add(element);
+                element.click();
+                log({selector, url: location.href, at: Date.now(), page_ms: Math.round(performance.now())});
+            }
+        }
+    };
+
+    let scheduled = false;
+    const observer = new MutationObserver(() => {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => { scheduled = false; dismiss(); });
+    });
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ["style", "class", "hidden", "open"],
+    });
+    window.__scrapperPopupObserver = observer;
+    if (document.readyState !== "loading") dismiss();
+})();
+"""
+
+READ_DISMISSED_SCRIPT = """
+const stored = JSON.parse(sessionStorage.getItem(arguments[0]) || "[]");
+return stored.concat(window.__scrapperDismissedPopups || []);
+"""
+
+
+class PopupDismisser:
+    """Close popups from inside the page the moment they appear
+
+    install() registers POPUP_DISMISS_SCRIPT through CDP so it runs in
+    every document the driver loads from then on (and in the current one),
+    which means nothing in the scrape has to wait for a popup. report()
+    returns the dismissals so far: selector, URL, wall-clock time and
+    milliseconds since the page started loading. Use it as a context
+    manager so a driver borrowed from a SessionManager does not keep the
+    script for its next job.
+    """
+
+    def __init__(self, driver, selectors, site=None):
+        self.driver = driver
+        self.selectors = list(selectors)
+        self.site = site
+        self.script = POPUP_DISMISS_SCRIPT % {
+            "selectors": json.dumps(self.selectors),
+            "storage_key": json.dumps(DISMISSED_KEY),
+        }
+        self._script_id = None
+        self.installed_at = None
+
+    def install(self):
+        # Dismissals logged by an earlier job in the same tab are left out of report()
+        self.installed_at = time.time() * 1000
+        try:
+            self._script_id = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": self.script})["identifier"]
+        except Exception as e:
+            # Without CDP only the current document is covered
+            print(f"Could not register the popup handler for new pages: {e}")
+            telemetry.swallowed("popups.install", e)
+        try:
+            self.driver.execute_script(self.script)
+        except Exception as e:
+            telemetry.swallowed("popups.inject", e)
+        return self
+
+    def uninstall(self):
+        if self._script_id is None:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._script_id})
+        except Exception as e:
+            telemetry.swallowed("popups.uninstall", e)
+        self._script_id = None
+
+    def report(self):
+        """Return the popups dismissed so far in this browser tab"""
+        try:
+            dismissed = self.driver.execute_script(READ_DISMISSED_SCRIPT, DISMISSED_KEY) or []
+        except Exception as e:
+            telemetry.swallowed("popups.report", e)
+            return []
+        return [entry for entry in dismissed if entry["at"] >= (self.installed_at or 0)]
+
+    def summary(self):
+        dismissed = self.report()
+        telemetry.count("popups_dismissed", len(dismissed), site=self.site)
+        if not dismissed:
+            return "No popups dismissed"
+        details = ", ".join(f"{entry['selector']} after {entry['page_ms'] / 1000:.2f}s" for entry in dismissed)
+        return f"Dismissed {len(dismissed)} popup(s): {details}"
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+        return False
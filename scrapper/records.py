@@ -0,0 +1,183 @@
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import unicodedata
+
+# Zero-width spaces/joiners, direction marks, word joiner, BOM and soft hyphen
+INVISIBLE_CHARS = re.compile("[\u200b-\u200f\u202a-\u202e\u2060-\u2064\ufeff\u00ad]")
+WHITESPACE = re.compile(r"\s+")
+
+# Common USPS street suffix and direction abbreviations, used for record keys only
+ADDRESS_ABBREVIATIONS = {
+    "STREET": "ST", "AVENUE": "AVE", "ROAD": "RD", "BOULEVARD": "BLVD", "DRIVE": "DR",
+    "LANE": "LN", "PLACE": "PL", "COURT": "CT", "PARKWAY": "PKWY", "HIGHWAY": "HWY",
+    "SUITE": "STE", "FLOOR": "FL", "BUILDING": "BLDG", "NORTH": "N", "SOUTH": "S",
+    "EAST": "E", "WEST": "W", "FIRST": "1ST", "SECOND": "2ND", "THIRD": "3RD",
+}
+
+
+def clean_text(value):
+    """Strip invisible characters, apply NFKC and collapse whitespace"""
+    if not isinstance(value, str):
+        return value
+    value = INVISIBLE_CHARS.sub("", unicodedata.normalize("NFKC", value))
+    return WHITESPACE.sub(" ", value).strip()
+
+
+def normalize_record(row):
+    """Clean every string field of a row in place, including the items of list fields"""
+    for key, value in row.items():
+        if isinstance(value, list):
+            row[key] = [clean_text(item) for item in value]
+        else:
+            row[key] = clean_text(value)
+    return row
+
+
+def canonical_address(address):
+    """Upper-case, drop punctuation and abbreviate street words so spelling variants compare equal"""
+    words = re.sub(r"[^\w\s]", " ", clean_text(address or "").upper()).split()
+    return " ".join(ADDRESS_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def canonical_name(name):
+    return " ".join(re.sub(r"[^\w\s]", " ", clean_text(name or "").casefold()).split())
+
+
+def record_key(*parts):
+    """Stable 16-hex-digit key for a record built from its identifying parts"""
+    return hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:16]
+
+
+def build_recycling_entry(business_name, address, material_texts, details_url=None):
+    """Build an Earth911 data entry from raw field text, shared by the Chrome and HTTP engines
+
+    address is an (address1, address3) tuple, or None when the address
+    elements are missing from the result item. details_url is the absolute
+    link behind the title, used by the enrichment stage. Text is cleaned
+    of the zero-width characters the site sprinkles through it, and
+    record_key identifies the facility across pages and searches.
+    """
+    business_name = clean_text(business_name)
+
+    # Extract street address
+    if address is None:
+        street_address = "Address not available"
+    else:
+        address1, address3 = (clean_text(part) for part in address)
+        if address1:
+            street_address = f"{address1}, {address3}"
+        else:
+            street_address = address3
+
+    # Extract materials accepted
+    materials_accepted = []
+    for material_text in material_texts:
+        material_text = clean_text(material_text)
+        # Skip empty, "Materials accepted:", "+X more" entries
+        if (material_text and
+            not material_text.startswith('+') and
+            "more" not in material_text and
+            "Materials accepted" not in material_text):
+            materials_accepted.append(material_text)
+
+    if not materials_accepted:
+        materials_accepted = ["Materials not specified"]
+
+    # last_update_date is not available in the HTML, set to today's date
+    last_update_date = time.strftime("%d-%m-%Y")
+
+    # Create data entry
+    return {
+        "business_name": business_name,
+        "last_update_date": last_update_date,
+        "street_address": street_address,
+        "materials_accepted": materials_accepted,
+        "details_url": details_url or "Details URL not found",
+        "record_key": record_key(canonical_name(business_name), canonical_address(street_address))
+    }
+
+
+class DedupIndex:
+    """Set of seen record keys that spills from memory to SQLite when it grows large
+
+    Small runs stay in a Python set. Once max_memory_keys is exceeded the
+    keys move to an on-disk table (path, or a temporary file that is removed
+    on close) so multi-million row crawls run in bounded memory.
+    """
+
+    def __init__(self, path=None, max_memory_keys=1_000_000):
+        self.path = path
+        self.max_memory_keys = max_memory_keys
+        self.keys = set()
+        self.db = None
+        self.temp_path = None
+        self.duplicates = 0
+        if path is not None:
+            self._open_db(path)
+
+    def _open_db(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode = OFF")
+        self.db.execute("PRAGMA synchronous = OFF")
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def _spill(self):
+        fd, self.temp_path = tempfile.mkstemp(prefix="dedup-", suffix=".sqlite3")
+        os.close(fd)
+        self._open_db(self.temp_path)
+        self.db.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((key,) for key in self.keys))
+        self.db.commit()
+        print(f"Dedup index passed {self.max_memory_keys} keys - continuing on disk in {self.temp_path}")
+        self.keys = set()
+
+    def add(self, key):
+        """Record key and return True if it had not been seen before"""
+        if self.db is None:
+            if key in self.keys:
+                self.duplicates += 1
+                return False
+            self.keys.add(key)
+            if len(self.keys) > self.max_memory_keys:
+                self._spill()
+            return True
+
+        inserted = self.db.execute("INSERT OR IGNORE INTO seen VALUES (?)", (key,)).rowcount == 1
+        if not inserted:
+            self.duplicates += 1
+        return inserted
+
+    def close(self):
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+        if self.temp_path is not None:
+            os.remove(self.temp_path)
+            self.temp_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def dedupe_rows(rows, index=None, key_field="record_key"):
+    """Yield only the first row for each key_field value"""
+    own_index = index is None
+    index = index if index is not None else DedupIndex()
+    try:
+        for row in rows:
+            key = row.get(key_field)
+            if not key or index.add(key):
+                yield row
+        if index.duplicates:
+            print(f"Dropped {index.duplicates} duplicate record(s)")
+    finally:
+        if own_index:
+            index.close()
@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .telemetry import telemetry
+
+DEFAULT_SELECTOR_CACHE_PATH = "selector_cache.json"
+
+# Checks every candidate in one call and returns [index, element] for the
+# first one, in priority order, that matches a visible and enabled element.
+# Candidates starting with "/" or "(" are XPath, everything else CSS.
+# Candidates the browser cannot parse come back in a third slot.
+RACE_SELECTORS_SCRIPT = """
+const candidates = arguments[0];
+const invalid = [];
+const usable = element => element.getClientRects().length > 0
+    && getComputedStyle(element).visibility !== "hidden"
+    && !element.disabled && element.getAttribute("aria-disabled") !== "true";
+
+for (let i = 0; i < candidates.length; i++) {
+    const candidate = candidates[i];
+    let matches = [];
+    try {
+        if (candidate.startsWith("/") || candidate.startsWith("(")) {
+            const found = document.evaluate(candidate, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let j = 0; j < found.snapshotLength; j++) matches.push(found.snapshotItem(j));
+        } else {
+            matches = document.querySelectorAll(candidate);
+        }
+    } catch (e) {
+        invalid.push(candidate);
+        continue;
+    }
+    for (const element of matches) {
+        if (usable(element)) return [i, element, invalid];
+    }
+}
+return [null, null, invalid];
+"""
+
+
+class race_selectors:
+    """Condition: the first usable element matching any candidate, as (selector, element)
+
+    One script call per poll, however many candidates there are.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+        self.invalid = []
+
+    def __call__(self, driver):
+        index, element, self.invalid = driver.execute_script(RACE_SELECTORS_SCRIPT, self.candidates)
+        if index is None:
+            return False
+        return self.candidates[index], element
+
+
+class SelectorCache:
+    """Remember which fallback selector found each element, per site and role
+
+    find() first gives the remembered winner a short timeout. When it is
+    missing (or misses), every candidate is raced in one in-page query per
+    poll and the new winner is saved, so markup drift costs one full wait
+    instead of one per stale selector. The winners live in a small JSON
+    file that can be inspected or deleted by hand.
+    """
+
+    def __init__(self, path=DEFAULT_SELECTOR_CACHE_PATH, fast_timeout=2):
+        self.path = path
+        self.fast_timeout = fast_timeout
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "learned": 0, "not_found": 0}
+        self.winners = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.winners = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable selector cache {path}: {e}")
+
+    def winner(self, site, role):
+        entry = self.winners.get(site, {}).get(role)
+        return entry["selector"] if entry else None
+
+    def find(self, driver, site, role, candidates, timeout=20, poll_frequency=0.2):
+        """Return the first usable element for role, or None if no candidate matched in time"""
+        candidates = list(candidates)
+        known = self.winner(site, role)
+
+        if known in candidates:
+            result = self._wait(driver, [known], self.fast_timeout, poll_frequency)
+            if result:
+                self._count(site, role, "hits")
+                print(f"Found {role} using cached selector: {known}")
+                return result[1]
+            self._count(site, role, "misses")
+            print(f"Cached selector for {role} missed: {known}")
+
+        condition = race_selectors(candidates)
+        result = self._wait(driver, condition, timeout, poll_frequency)
+        for selector in condition.invalid:
+            print(f"Ignoring invalid {role} selector: {selector}")
+        if not result:
+            self._count(site, role, "not_found")
+            return None
+
+        selector, element = result
+        print(f"Found {role} using selector: {selector}")
+        if selector != known:
+            self._count(site, role, "learned")
+            self._remember(site, role, selector)
+        return element
+
+    def _wait(self, driver, condition, timeout, poll_frequency):
+        if isinstance(condition, list):
+            condition = race_selectors(condition)
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+        except TimeoutException:
+            return None
+
+    def _count(self, site, role, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+            entry = self.winners.get(site, {}).get(role)
+            if entry is not None and outcome in ("hits", "misses"):
+                entry[outcome] = entry.get(outcome, 0) + 1
+        telemetry.count("selector_lookups", site=site, role=role, outcome=outcome)
+
+    def _remember(self, site, role, selector):
+        with self.lock:
+            self.winners.setdefault(site, {})[role] = {
+                "selector": selector,
+                "learned_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "hits": 0,
+                "misses": 0,
+            }
+        self.save()
+
+    def save(self):
+        """Write the winners to disk (replacing the file atomically)"""
+        if not self.path:
+            return
+        with self.lock:
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.winners, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+
+    def summary(self):
+        return (f"Selector cache: {self.stats['hits']} hit(s), {self.stats['misses']} miss(es), "
+                f"{self.stats['learned']} learned, {self.stats['not_found']} not found")
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_selector_cache():
+    """Return the process-wide SelectorCache, backed by DEFAULT_SELECTOR_CACHE_PATH"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SelectorCache()
+        return _default_cache
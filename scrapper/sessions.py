@@ -0,0 +1,218 @@
+import atexit
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from .browser import create_driver
+
+
+def process_tree_rss_mb(pid=None):
+    """Return the resident memory of a process and all its children in MB
+
+    Uses psutil when it is installed and /proc otherwise; returns None
+    where neither is available (macOS or Windows without psutil).
+    """
+    pid = pid or os.getpid()
+    if psutil is not None:
+        process = psutil.Process(pid)
+        processes = [process] + process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+
+    # Linux fallback: walk /proc for the process tree
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def driver_rss_mb(driver):
+    """Resident memory of the chromedriver process and the Chrome processes it started"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return None
+    try:
+        return process_tree_rss_mb(process.pid)
+    except Exception:
+        return None
+
+
+class DriverSession:
+    """One Chrome driver plus the bookkeeping SessionManager uses to decide when to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.baseline_rss_mb = None
+
+    @property
+    def fresh(self):
+        return self.uses == 0
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class SessionManager:
+    """Keep warm Chrome sessions alive across jobs and recycle them when they get stale
+
+    Drivers are created lazily on the first acquire and returned to an idle
+    pool afterwards, so back-to-back jobs skip Chrome's startup. A session
+    is quit after max_uses jobs, when its process tree grows past
+    max_rss_mb, or when it has grown by more than max_rss_growth times its
+    size after the first job. Thread-safe; at most max_sessions drivers
+    exist at once.
+    """
+
+    def __init__(self, max_sessions=4, max_uses=50, max_rss_mb=None, max_rss_growth=3.0, **driver_options):
+        self.max_sessions = max_sessions
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.max_rss_growth = max_rss_growth
+        self.driver_options = driver_options
+        self.idle = []
+        self.active = 0
+        self.condition = threading.Condition()
+        self.closed = False
+        self.stats = {"launches": 0, "reuses": 0, "recycled": 0, "discarded": 0}
+        # Quit the browsers of a manager nobody closed; close() takes this back
+        atexit.register(self.close)
+
+    def acquire(self):
+        """Return a DriverSession, reusing an idle one or launching Chrome if under max_sessions"""
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("SessionManager is closed")
+                if self.idle:
+                    self.stats["reuses"] += 1
+                    self.active += 1
+                    return self.idle.pop()
+                if self.active < self.max_sessions:
+                    self.active += 1
+                    break
+                self.condition.wait()
+
+        try:
+            session = DriverSession(create_driver(**self.driver_options))
+        except Exception:
+            with self.condition:
+                self.active -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.stats["launches"] += 1
+        return session
+
+    def _should_recycle(self, session):
+        if self.max_uses and session.uses >= self.max_uses:
+            return f"after {session.uses} uses"
+        rss = driver_rss_mb(session.driver)
+        if rss is None:
+            return None
+        if session.baseline_rss_mb is None:
+            session.baseline_rss_mb = rss
+        if self.max_rss_mb and rss > self.max_rss_mb:
+            return f"at {rss:.0f} MB"
+        if self.max_rss_growth and rss > session.baseline_rss_mb * self.max_rss_growth:
+            return f"after growing from {session.baseline_rss_mb:.0f} to {rss:.0f} MB"
+        return None
+
+    def release(self, session, discard=False):
+        """Return a session to the pool; discard=True quits it (e.g. after a WebDriverException)"""
+        session.uses += 1
+        reason = "because it failed" if discard else self._should_recycle(session)
+        if reason:
+            print(f"Recycling Chrome session {reason}")
+            session.quit()
+
+        with self.condition:
+            self.active -= 1
+            if reason:
+                self.stats["discarded" if discard else "recycled"] += 1
+            elif self.closed:
+                session.quit()
+            else:
+                self.idle.append(session)
+            self.condition.notify()
+
+    def session(self):
+        """Context manager yielding a driver; the session is discarded if the block raises a WebDriverException"""
+        return _SessionLease(self)
+
+    def close(self):
+        """Quit every idle driver; drivers still in use are quit when released"""
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.condition.notify_all()
+        for session in idle:
+            session.quit()
+        # Otherwise every closed manager stays referenced until the interpreter exits
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class _SessionLease:
+    def __init__(self, manager):
+        self.manager = manager
+        self.lease = None
+
+    def __enter__(self):
+        self.lease = self.manager.acquire()
+        return self.lease.driver
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        from selenium.common.exceptions import WebDriverException
+
+        self.manager.release(self.lease, discard=exc_type is not None and issubclass(exc_type, WebDriverException))
+        return False
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+
+def default_session_manager():
+    """Process-wide SessionManager shared by the scrape_* entry points"""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None or _default_manager.closed:
+            _default_manager = SessionManager()
+        return _default_manager
@@ -0,0 +1,196 @@
+import csv
+import json
+import os
+import time
+
+from .telemetry import telemetry
+
+# Lists (e.g. materials_accepted) are flattened with this separator in CSV output
+LIST_SEPARATOR = "; "
+
+# Columns kept as lists of strings in Parquet output
+LIST_FIELDS = ("materials_accepted",)
+
+
+class CsvSink:
+    """Write rows to a CSV file as they arrive
+
+    With append=True new rows are added to an existing file and the header
+    is only written when the file is new or empty. Lists are joined with
+    LIST_SEPARATOR, and keys outside fieldnames are ignored.
+    """
+
+    def __init__(self, path, fieldnames, append=False, flush_every=50):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.flush_every = flush_every
+        self.rows_written = 0
+
+        write_header = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, extrasaction="ignore")
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow({
+            key: LIST_SEPARATOR.join(value) if isinstance(value, list) else value
+            for key, value in row.items()
+        })
+        self.rows_written += 1
+        if self.rows_written % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class JsonlSink:
+    """Write one JSON object per line, keeping lists as JSON arrays"""
+
+    def __init__(self, path, fieldnames=None, append=False, flush_every=50):
+        self.path = path
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.flush_every = flush_every
+        self.rows_written = 0
+        self.file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, row):
+        if self.fieldnames:
+            row = {key: row.get(key) for key in self.fieldnames}
+        self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.rows_written += 1
+        if self.rows_written % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class ParquetSink:
+    """Buffer rows and flush them to a Parquet file one row group at a time
+
+    Requires pyarrow. Memory stays bounded by row_group_size rows. Parquet
+    files cannot be appended to, so append=True is rejected.
+
+    The schema is fixed from fieldnames up front rather than inferred from
+    the first row group, where a column that happens to be all None would
+    get the null type and reject every later group. Every column is a
+    string, except LIST_FIELDS which are lists of strings.
+    """
+
+    def __init__(self, path, fieldnames, append=False, row_group_size=10000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+        if append:
+            raise ValueError("Parquet files cannot be appended to - write a new file instead")
+
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.schema = pa.schema([
+            (name, pa.list_(pa.string()) if name in LIST_FIELDS else pa.string()) for name in self.fieldnames
+        ])
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self.buffer = []
+        self.writer = None
+
+    @staticmethod
+    def _value(key, value):
+        """Coerce a field to the column type: None, a string or a list of strings"""
+        if value is None:
+            return None
+        if key in LIST_FIELDS:
+            if isinstance(value, str):
+                return [item for item in value.split(LIST_SEPARATOR) if item]
+            return [str(item) for item in value]
+        if isinstance(value, list):
+            return LIST_SEPARATOR.join(str(item) for item in value)
+        return str(value)
+
+    def write(self, row):
+        self.buffer.append({key: self._value(key, row.get(key)) for key in self.fieldnames})
+        if len(self.buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        table = self.pa.Table.from_pylist(self.buffer, schema=self.schema)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(table)
+        self.rows_written += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+}
+
+
+def open_sink(path, fieldnames, output_format=None, append=False):
+    """Open the sink for path, picking the format from its extension unless given"""
+    if output_format is None:
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        output_format = {"json": "jsonl", "ndjson": "jsonl", "pq": "parquet"}.get(extension, extension)
+    if output_format not in SINKS:
+        raise ValueError(f"Unsupported output format '{output_format}' - use one of {', '.join(SINKS)}")
+    return SINKS[output_format](path, fieldnames, append=append)
+
+
+def write_rows(rows, sink):
+    """Drain an iterable of rows into a sink and return how many were written
+
+    Only the time spent in sink.write is recorded as the "write" phase;
+    producing the rows is timed by the scrapers themselves.
+    """
+    count = 0
+    write_seconds = 0.0
+    output = type(sink).__name__.replace("Sink", "").lower()
+    try:
+        for row in rows:
+            start = time.perf_counter()
+            sink.write(row)
+            write_seconds += time.perf_counter() - start
+            count += 1
+    finally:
+        telemetry.record("write", write_seconds, output=output)
+        telemetry.count("rows_emitted", count, output=output)
+    return count
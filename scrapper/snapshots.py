@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_SNAPSHOT_PATH = "snapshots.sqlite3"
+
+# Columns added to exported rows when change tracking is on
+SNAPSHOT_FIELDS = ["first_seen", "last_changed"]
+
+# Extra column of a delta file: added, changed or removed
+CHANGE_FIELD = "change"
+
+# Per site: the field identifying a record, and fields left out of its
+# content hash because they change without the record changing (the date
+# of the crawl, or the distance from whichever ZIP was searched)
+SITE_KEYS = {
+    "earth911": ("record_key", ["last_update_date"]),
+    "bestbuy": ("store_id", ["distance"]),
+}
+
+
+def utc_timestamp(seconds=None):
+    """Format epoch seconds (default now) as an ISO 8601 UTC timestamp"""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+def content_hash(row, exclude=()):
+    """Hash the content of a row, ignoring exclude and the snapshot timestamps"""
+    skipped = set(exclude) | set(SNAPSHOT_FIELDS) | {CHANGE_FIELD}
+    content = {key: value for key, value in row.items() if key not in skipped}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def delta_path_for(output_path):
+    """Default delta file next to an export: data.csv -> data.delta.csv"""
+    stem, extension = os.path.splitext(output_path)
+    return f"{stem}.delta{extension or '.csv'}"
+
+
+class SnapshotIndex:
+    """Content hashes of every exported record, to tell what changed between runs
+
+    Records are grouped by site and scope (normally the export file), so
+    a record missing from a new run of the same export counts as removed.
+    Each record keeps its hash, last exported row, first_seen and
+    last_changed time. A run's changes are only committed once it has
+    seen every row, so a crawl that dies half way leaves the index as it was.
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                site TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                row TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_changed REAL NOT NULL,
+                last_run INTEGER NOT NULL,
+                PRIMARY KEY (site, scope, key)
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                site TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL,
+                added INTEGER,
+                changed INTEGER,
+                removed INTEGER,
+                unchanged INTEGER
+            );
+        """)
+        self.db.commit()
+
+    def begin(self, site, scope):
+        """Start a run over one export; see SnapshotRun"""
+        return SnapshotRun(self, site, scope)
+
+    def last_run(self, site, scope):
+        """Return the counts of the last finished run of an export, or None"""
+        with self.lock:
+            row = self.db.execute("""
+                SELECT finished_at, added, changed, removed, unchanged FROM runs
+                WHERE site = ? AND scope = ? AND finished_at IS NOT NULL ORDER BY id DESC LIMIT 1
+            """, (site, scope)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("finished_at", "added", "changed", "removed", "unchanged"), row))
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class SnapshotRun:
+    """One pass over an export: observe() every row, then finish()"""
+
+    def __init__(self, index, site, scope):
+        self.index = index
+        self.site = site
+        self.scope = scope
+        self.key_field, self.exclude = SITE_KEYS[site]
+        self.started_at = time.time()
+        self.counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        with index.lock:
+            self.run_id = index.db.execute(
+                "INSERT INTO runs (site, scope, started_at) VALUES (?, ?, ?)", (site, scope, self.started_at)
+            ).lastrowid
+
+    def observe(self, row):
+        """Record a row and return (row with first_seen/last_changed, change)
+
+        change is "added", "changed" or None for an unchanged record.
+        """
+        key = str(row.get(self.key_field))
+        row_hash = content_hash(row, self.exclude)
+        now = self.started_at
+        db = self.index.db
+        with self.index.lock:
+            previous = db.execute(
+                "SELECT hash, first_seen, last_changed FROM records WHERE site = ? AND scope = ? AND key = ?",
+                (self.site, self.scope, key)).fetchone()
+            if previous is None:
+                change, first_seen, last_changed = "added", now, now
+            elif previous[0] != row_hash:
+                change, first_seen, last_changed = "changed", previous[1], now
+            else:
+                change, first_seen, last_changed = None, previous[1], previous[2]
+            stored = json.dumps(row, ensure_ascii=False, default=str)
+            db.execute("""
+                INSERT OR REPLACE INTO records (site, scope, key, hash, row, first_seen, last_changed, last_run)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (self.site, self.scope, key, row_hash, stored, first_seen, last_changed, self.run_id))
+
+        self.counts[change or "unchanged"] += 1
+        stamped = dict(row, first_seen=utc_timestamp(first_seen), last_changed=utc_timestamp(last_changed))
+        return stamped, change
+
+    def finish(self):
+        """Drop the records this run did not see, commit, and return them as removed rows"""
+        db = self.index.db
+        with self.index.lock:
+            missing = db.execute("""
+                SELECT row, first_seen, last_changed FROM records
+                WHERE site = ? AND scope = ? AND last_run != ?
+            """, (self.site, self.scope, self.run_id)).fetchall()
+            db.execute("DELETE FROM records WHERE site = ? AND scope = ? AND last_run != ?",
+                       (self.site, self.scope, self.run_id))
+            self.counts["removed"] = len(missing)
+            db.execute("""
+                UPDATE runs SET finished_at = ?, added = ?, changed = ?, removed = ?, unchanged = ? WHERE id = ?
+            """, (time.time(), self.counts["added"], self.counts["changed"], self.counts["removed"],
+                  self.counts["unchanged"], self.run_id))
+            db.commit()
+
+        return [
+            dict(json.loads(stored), first_seen=utc_timestamp(first_seen), last_changed=utc_timestamp(last_changed))
+            for stored, first_seen, last_changed in missing
+        ]
+
+    def abort(self):
+        with self.index.lock:
+            self.index.db.rollback()
+
+    def summary(self):
+        return (f"{self.counts['added']} added, {self.counts['changed']} changed, "
+                f"{self.counts['removed']} removed, {self.counts['unchanged']} unchanged")
+
+
+def track_changes(rows, index, site, scope, delta_sink=None, stats=None):
+    """Stamp rows with first_seen/last_changed as they stream past, writing changes to delta_sink
+
+    Added and changed rows go to the delta as they are seen, removed ones
+    once the input is exhausted. If the input fails part way nothing is
+    committed to the index. The added/changed/removed/unchanged counts are
+    stored in stats.
+    """
+    stats = stats if stats is not None else {}
+    run = index.begin(site, scope)
+    try:
+        for row in rows:
+            row, change = run.observe(row)
+            if change and delta_sink is not None:
+                delta_sink.write(dict(row, **{CHANGE_FIELD: change}))
+            yield row
+    except BaseException:
+        run.abort()
+        raise
+
+    for row in run.finish():
+        if delta_sink is not None:
+            delta_sink.write(dict(row, **{CHANGE_FIELD: "removed"}))
+    stats.update(run.counts)
+    print(f"Changes since the last run: {run.summary()}")
@@ -0,0 +1,169 @@
+import json
+import re
+
+# Pulls every embedded JSON payload off the page in one round trip: JSON-LD
+# blocks, JSON script tags (hydration state such as __NEXT_DATA__) and the
+# usual global state objects
+STRUCTURED_DATA_SCRIPT = """
+const payloads = Array.from(document.querySelectorAll(
+    "script[type='application/ld+json'], script[type='application/json']"
+)).map(script => script.textContent);
+
+for (const name of ["__INITIAL_STATE__", "__PRELOADED_STATE__", "__APOLLO_STATE__"]) {
+    try {
+        if (window[name]) {
+            payloads.push(JSON.stringify(window[name]));
+        }
+    } catch (e) {}
+}
+return payloads;
+"""
+
+# Keys that identify a store, in order of preference
+ID_KEYS = ("storeId", "store_id", "locationId", "branchCode", "id", "@id")
+PHONE_KEYS = ("telephone", "phone", "phoneNumber")
+HOURS_KEYS = ("openingHoursSpecification", "openingHours", "hours", "weeklyHours", "storeHours")
+
+
+def payloads_from_html(html_or_soup):
+    """Return the embedded JSON payloads of saved page HTML (or a parsed soup)"""
+    if isinstance(html_or_soup, str):
+        from .html_utils import make_soup
+        html_or_soup = make_soup(html_or_soup)
+    return [
+        script.string or script.get_text()
+        for script in html_or_soup.find_all("script", type=["application/ld+json", "application/json"])
+    ]
+
+
+def iter_json_objects(value):
+    """Yield every dict nested anywhere inside a decoded JSON value"""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            yield value
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+
+
+def _store_id(obj):
+    for key in ID_KEYS:
+        value = obj.get(key)
+        if isinstance(value, (str, int)) and not isinstance(value, bool):
+            # JSON-LD ids are URLs such as https://stores.bestbuy.com/482
+            match = re.search(r"(\d+)/?(?:#.*)?$", str(value))
+            if match:
+                return match.group(1)
+    return None
+
+
+def format_hours(value):
+    """Flatten the different hours shapes into 'Mon 10:00-21:00; Tue ...'"""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list):
+        return ""
+
+    parts = []
+    for entry in value:
+        if isinstance(entry, str):
+            parts.append(entry.strip())
+            continue
+        if not isinstance(entry, dict):
+            continue
+        days = entry.get("dayOfWeek") or entry.get("day") or entry.get("days") or ""
+        if isinstance(days, list):
+            days = ",".join(str(day).rsplit("/", 1)[-1][:3] for day in days)
+        else:
+            days = str(days).rsplit("/", 1)[-1][:3]
+        opens = entry.get("opens") or entry.get("open") or entry.get("openTime") or ""
+        closes = entry.get("closes") or entry.get("close") or entry.get("closeTime") or ""
+        if opens or closes:
+            parts.append(f"{days} {opens}-{closes}".strip())
+        elif days:
+            parts.append(f"{days} closed")
+    return "; ".join(parts)
+
+
+def _coordinates(obj):
+    geo = obj.get("geo") if isinstance(obj.get("geo"), dict) else obj
+    latitude = geo.get("latitude", geo.get("lat"))
+    longitude = geo.get("longitude", geo.get("lng", geo.get("lon")))
+    try:
+        return float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None, None
+
+
+def structured_fields(obj):
+    """Return the phone, weekly_hours and coordinates found directly on a JSON object"""
+    fields = {}
+    for key in PHONE_KEYS:
+        if isinstance(obj.get(key), str) and obj[key].strip():
+            fields["phone"] = obj[key].strip()
+            break
+    for key in HOURS_KEYS:
+        hours = format_hours(obj.get(key))
+        if hours:
+            fields["weekly_hours"] = hours
+            break
+    latitude, longitude = _coordinates(obj)
+    if latitude is not None:
+        fields["latitude"] = latitude
+        fields["longitude"] = longitude
+    return fields
+
+
+def store_record(obj):
+    """Return (store_id, fields) for a JSON object describing a store, or None"""
+    store_id = _store_id(obj)
+    if store_id is None:
+        return None
+    fields = structured_fields(obj)
+    return (store_id, fields) if fields else None
+
+
+def build_store_index(payloads):
+    """Parse the page's JSON payloads once and index store details by store_id
+
+    Payloads that are not valid JSON are skipped. When a store appears in
+    several payloads the first value found for each field wins.
+    """
+    index = {}
+    for payload in payloads:
+        try:
+            data = json.loads(payload)
+        except (TypeError, ValueError):
+            continue
+        for obj in iter_json_objects(data):
+            record = store_record(obj)
+            if record is None:
+                continue
+            store_id, fields = record
+            entry = index.setdefault(store_id, {})
+            for key, value in fields.items():
+                entry.setdefault(key, value)
+    return index
+
+
+def join_store_index(stores, index):
+    """Fill phone, weekly hours and coordinates on store rows from the index
+
+    Returns how many rows were matched.
+    """
+    matched = 0
+    for store in stores:
+        fields = index.get(str(store.get("store_id")))
+        if not fields:
+            continue
+        matched += 1
+        if "phone" in fields and store.get("phone", "Phone not found") == "Phone not found":
+            store["phone"] = fields["phone"]
+        for key in ("weekly_hours", "latitude", "longitude"):
+            if key in fields:
+                store[key] = fields[key]
+    return matched
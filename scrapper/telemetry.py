@@ -0,0 +1,223 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+
+# Labels kept in the JSON export only; they would give Prometheus one series per page
+HIGH_CARDINALITY_LABELS = ("page", "url")
+
+METRIC_PREFIX = "scrapper"
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _prometheus_labels(key):
+    labels = [(name, value) for name, value in key if name not in HIGH_CARDINALITY_LABELS]
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+class Telemetry:
+    """Timing spans and counters for one run of a scraper
+
+    Spans are named phases ("navigate", "extract", "wait", ...) with
+    optional labels such as site, page or step; every span is kept for the
+    JSON export, and Prometheus gets the totals per phase. Counters cover
+    WebDriver commands, swallowed exceptions, bytes fetched and rows
+    emitted. Safe to use from the worker threads of a batch run.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.spans = []
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, **labels):
+        """Add a finished span that was timed elsewhere"""
+        with self._lock:
+            self.spans.append((name, _label_key(labels), seconds))
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time the body of a with block as one span, whether or not it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **labels)
+
+    def count(self, name, value=1, **labels):
+        with self._lock:
+            self.counters[(name, _label_key(labels))] += value
+
+    def swallowed(self, where, exc=None):
+        """Count an exception that a fallback branch deliberately ignores"""
+        self.count("swallowed_exceptions", where=where, type=type(exc).__name__ if exc is not None else None)
+
+    def phase_totals(self):
+        """Return {(name, labels): [count, seconds]} with high-cardinality labels dropped"""
+        totals = defaultdict(lambda: [0, 0.0])
+        with self._lock:
+            spans = list(self.spans)
+        for name, key, seconds in spans:
+            key = tuple(item for item in key if item[0] not in HIGH_CARDINALITY_LABELS)
+            totals[(name, key)][0] += 1
+            totals[(name, key)][1] += seconds
+        return totals
+
+    def to_dict(self):
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        return {
+            "started": self.started,
+            "elapsed_seconds": round(time.time() - self.started, 3),
+            "phases": [
+                {"name": name, "labels": dict(key), "count": count, "seconds": round(seconds, 4)}
+                for (name, key), (count, seconds) in sorted(self.phase_totals().items())
+            ],
+            "spans": [{"name": name, "labels": dict(key), "seconds": round(seconds, 4)} for name, key, seconds in spans],
+            "counters": [
+                {"name": name, "labels": dict(key), "value": value}
+                for (name, key), value in sorted(counters.items())
+            ],
+        }
+
+    def summary(self):
+        """Return a multi-line summary of the slowest phases and the counters"""
+        totals = sorted(self.phase_totals().items(), key=lambda item: item[1][1], reverse=True)
+        lines = [f"Telemetry after {time.time() - self.started:.2f}s:"]
+        for (name, key), (count, seconds) in totals[:10]:
+            labels = ", ".join(f"{label}={value}" for label, value in key)
+            lines.append(f"  {name}{f' ({labels})' if labels else ''}: {seconds:.2f}s over {count} span(s)")
+        merged = Counter()
+        for (name, _), value in self.counters.items():
+            merged[name] += value
+        for name, value in sorted(merged.items()):
+            lines.append(f"  {name}: {value:g}")
+        return "\n".join(lines)
+
+    def to_prometheus(self):
+        """Render the totals in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {METRIC_PREFIX}_phase_seconds_total Time spent in each scraper phase.",
+            f"# TYPE {METRIC_PREFIX}_phase_seconds_total counter",
+        ]
+        totals = sorted(self.phase_totals().items())
+        for (name, key), (_, seconds) in totals:
+            lines.append(f"{METRIC_PREFIX}_phase_seconds_total{_prometheus_labels((('phase', name),) + key)} {seconds:.6f}")
+        lines += [
+            f"# HELP {METRIC_PREFIX}_phase_spans_total Number of spans recorded for each scraper phase.",
+            f"# TYPE {METRIC_PREFIX}_phase_spans_total counter",
+        ]
+        for (name, key), (count, _) in totals:
+            lines.append(f"{METRIC_PREFIX}_phase_spans_total{_prometheus_labels((('phase', name),) + key)} {count}")
+
+        merged = Counter()
+        with self._lock:
+            counters = dict(self.counters)
+        for (name, key), value in counters.items():
+            merged[(name, tuple(item for item in key if item[0] not in HIGH_CARDINALITY_LABELS))] += value
+        previous = None
+        for (name, key), value in sorted(merged.items()):
+            if name != previous:
+                lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+                previous = name
+            lines.append(f"{METRIC_PREFIX}_{name}_total{_prometheus_labels(key)} {value:g}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_run_started_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_run_started_seconds {self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        print(f"Telemetry saved to {path}")
+
+    def write_prometheus(self, path):
+        """Write a textfile for node_exporter's textfile collector
+
+        The file is replaced atomically so the collector never reads half of it.
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+        print(f"Prometheus metrics saved to {path}")
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.spans = []
+            self.counters = Counter()
+
+
+# Process-wide telemetry that the scrapers record into
+telemetry = Telemetry()
+
+
+def instrument_driver(driver):
+    """Count every WebDriver command the driver sends, and time it, in telemetry
+
+    Installed once by create_driver; CommandCounter still works on top of it.
+    """
+    original_execute = driver.execute
+
+    def instrumented_execute(driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return original_execute(driver_command, params)
+        finally:
+            telemetry.count("webdriver_commands", command=driver_command)
+            telemetry.count("webdriver_seconds", time.perf_counter() - start, command=driver_command)
+
+    driver.execute = instrumented_execute
+    return driver
+
+
+@contextmanager
+def profiled(path=None, top=25):
+    """Run the body of a with block under cProfile
+
+    The stats are dumped to path (open them with snakeviz or pstats) and
+    the top functions by cumulative time are printed. With path=None the
+    block runs unprofiled.
+    """
+    if not path:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Profile saved to {path}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+
+
+def add_telemetry_arguments(parser):
+    """Add --metrics-json, --metrics-prom and --profile to a command line parser"""
+    parser.add_argument("--metrics-json", help="Write phase timings and counters to this JSON file")
+    parser.add_argument("--metrics-prom",
+                        help="Write the same metrics as a Prometheus textfile (e.g. for node_exporter)")
+    parser.add_argument("--profile", metavar="PATH", help="Run under cProfile and save the stats to PATH")
+
+
+def export_telemetry(args):
+    """Print the telemetry summary and write the files asked for on the command line"""
+    print(telemetry.summary())
+    if args.metrics_json:
+        telemetry.write_json(args.metrics_json)
+    if args.metrics_prom:
+        telemetry.write_prometheus(args.metrics_prom)
@@ -0,0 +1,174 @@
+import re
+import time
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .telemetry import telemetry
+
+
+class ReadinessWaiter:
+    """Wait for page readiness conditions instead of fixed sleeps
+
+    Each wait is a named step with its own timeout. The time actually spent
+    in every step is recorded so runs can show where the waiting went.
+    """
+
+    def __init__(self, driver, default_timeout=20, poll_frequency=0.2):
+        self.driver = driver
+        self.default_timeout = default_timeout
+        self.poll_frequency = poll_frequency
+        self.timings = []
+
+    def wait(self, step, condition, timeout=None, required=False):
+        """Wait until condition(driver) is truthy and return its value
+
+        A timed-out optional step returns None so the caller can carry on,
+        exactly like the old fixed sleeps did. Required steps re-raise.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        result = None
+        timed_out = False
+
+        try:
+            result = WebDriverWait(
+                self.driver, timeout, poll_frequency=self.poll_frequency,
+                ignored_exceptions=(StaleElementReferenceException,)
+            ).until(condition)
+        except TimeoutException:
+            timed_out = True
+            if required:
+                raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.append({
+                "step": step,
+                "seconds": round(elapsed, 3),
+                "timeout": timeout,
+                "timed_out": timed_out,
+            })
+            # Page numbers are folded so "page 2 load" and "page 3 load" add up
+            telemetry.record("wait", elapsed, step=re.sub(r"\d+", "N", step), timed_out=timed_out)
+
+        status = "timed out" if timed_out else "ready"
+        print(f"[wait] {step}: {status} after {elapsed:.2f}s")
+        return result
+
+    @property
+    def total_seconds(self):
+        return sum(timing["seconds"] for timing in self.timings)
+
+    def report(self):
+        """Return a multi-line summary of the time spent in each wait"""
+        lines = [f"Waited {self.total_seconds:.2f}s over {len(self.timings)} step(s):"]
+        for timing in self.timings:
+            flag = " (timed out)" if timing["timed_out"] else ""
+            lines.append(f"  {timing['step']}: {timing['seconds']:.2f}s{flag}")
+        return "\n".join(lines)
+
+
+def document_ready(driver):
+    """Condition: the document has finished loading"""
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+class network_idle:
+    """Condition: no new resources have started loading for idle_time seconds
+
+    Uses the Resource Timing buffer (plus jQuery.active when the page has
+    jQuery) so it works without a CDP network listener.
+    """
+
+    SCRIPT = """
+        const pending = window.jQuery ? window.jQuery.active : 0;
+        return [document.readyState, performance.getEntriesByType('resource').length, pending];
+    """
+
+    def __init__(self, idle_time=0.5):
+        self.idle_time = idle_time
+        self.last_count = None
+        self.last_change = None
+
+    def __call__(self, driver):
+        ready_state, resource_count, pending = driver.execute_script(self.SCRIPT)
+        now = time.monotonic()
+        if resource_count != self.last_count or pending:
+            self.last_count = resource_count
+            self.last_change = now
+            return False
+        return ready_state == "complete" and now - self.last_change >= self.idle_time
+
+
+class elements_present:
+    """Condition: at least one element matches the selector, returning them all"""
+
+    def __init__(self, css_selector):
+        self.css_selector = css_selector
+
+    def __call__(self, driver):
+        return driver.find_elements(By.CSS_SELECTOR, self.css_selector) or False
+
+
+class result_count_changed:
+    """Condition: the number of matching elements differs from previous_count and is non-zero"""
+
+    def __init__(self, css_selector, previous_count):
+        self.css_selector = css_selector
+        self.previous_count = previous_count
+
+    def __call__(self, driver):
+        elements = driver.find_elements(By.CSS_SELECTOR, self.css_selector)
+        return elements if elements and len(elements) != self.previous_count else False
+
+
+class replaced:
+    """Condition: an element from the previous page is gone from the DOM
+
+    Passing None (nothing rendered before) counts as already replaced.
+    """
+
+    def __init__(self, element):
+        self.element = element
+
+    def __call__(self, driver):
+        if self.element is None:
+            return True
+        try:
+            self.element.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+
+
+class url_changed:
+    """Condition: the current URL differs from previous_url (and contains fragment, if given)"""
+
+    def __init__(self, previous_url, fragment=None):
+        self.previous_url = previous_url
+        self.fragment = fragment
+
+    def __call__(self, driver):
+        current_url = driver.current_url
+        if current_url == self.previous_url:
+            return False
+        return self.fragment is None or self.fragment in current_url
+
+
+class any_visible:
+    """Condition: return the first displayed element matching any of the selectors"""
+
+    def __init__(self, css_selectors):
+        self.css_selectors = list(css_selectors)
+
+    def __call__(self, driver):
+        for selector in self.css_selectors:
+            try:
+                for element in driver.find_elements(By.CSS_SELECTOR, selector):
+                    if element.is_displayed():
+                        return element
+            except WebDriverException:
+                continue
+        return False
+
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fixture_server import start_fixture_server  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fixture_site():
+    """The benchmark fixture server, as (server, base_url)"""
+    server, base_url = start_fixture_server()
+    yield server, base_url
+    server.shutdown()
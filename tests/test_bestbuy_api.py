@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from fixture_server import FIXTURES_DIR
+from scrapper.bestbuy_api import StoreApiClient, store_from_api
+from scrapper.bestBut_scrapper import STORE_CSV_HEADERS
+
+
+def recorded_stores():
+    with open(os.path.join(FIXTURES_DIR, "bestbuy", "stores_api.json"), encoding="utf-8") as f:
+        return json.load(f)["stores"]
+
+
+def make_client(base_url, page_size=5):
+    return StoreApiClient("test-key", f"{base_url}bestbuy/v1/stores(area({{zip_code}},{{radius}}))",
+                          page_size=page_size)
+
+
+def test_store_from_api_maps_every_csv_column():
+    store = next(store for store in recorded_stores() if store["storeId"] == 2518)
+    row = store_from_api(store)
+
+    assert set(row) == set(STORE_CSV_HEADERS)
+    assert row["store_id"] == "2518"
+    assert row["store_name"] == "Atlantic Center"
+    assert row["distance"] == "4.7 miles away"
+    assert row["street_address"] == "625 Atlantic Ave, Ste A7"
+    assert row["city_state_zip"] == "Brooklyn, NY 11217"
+    assert row["full_address"] == "625 Atlantic Ave, Ste A7, Brooklyn, NY 11217"
+    assert row["details_url"] == "https://stores.bestbuy.com/2518"
+    assert row["weekly_hours"].startswith("Mon 10:00-21:00; Tue 10:00-21:00")
+    assert (row["latitude"], row["longitude"]) == (40.6846, -73.9777)
+
+
+def test_store_from_api_placeholders_for_missing_fields():
+    row = store_from_api({"storeId": 1})
+
+    assert row["store_name"] == "Store name not found"
+    assert row["distance"] == "Distance not found"
+    assert row["street_address"] == "Address not found"
+    assert row["phone"] == "Phone not found"
+    assert "weekly_hours" not in row and "latitude" not in row
+
+
+def test_search_pages_through_every_store_in_the_radius(fixture_site):
+    server, base_url = fixture_site
+    expected = sorted((store for store in recorded_stores() if store["distance"] <= 10),
+                      key=lambda store: store["distance"])
+
+    before = server.stats["requests"]
+    stores = make_client(base_url, page_size=5).search("10001", 10)
+
+    assert [store["store_id"] for store in stores] == [str(store["storeId"]) for store in expected]
+    # 12 stores at 5 per page
+    assert server.stats["requests"] - before == 3
+
+
+def test_search_stops_after_a_single_short_page(fixture_site):
+    server, base_url = fixture_site
+    before = server.stats["requests"]
+
+    stores = make_client(base_url, page_size=100).search("10001", 25)
+
+    assert len(stores) == len(recorded_stores())
+    assert server.stats["requests"] - before == 1
+
+
+def test_search_many_leaves_out_failed_zips(fixture_site):
+    _, base_url = fixture_site
+    client = make_client(base_url)
+    # The stub only answers requests that carry an apiKey
+    client.api_key = None
+
+    assert client.search_many(["10001", "10002"], 25) == {}
+
+    client.api_key = "test-key"
+    results = client.search_many(["10001", "10002"], 5)
+    assert sorted(results) == ["10001", "10002"]
+    assert all(len(stores) == 8 for stores in results.values())
+
+
+def test_client_requires_an_api_key(monkeypatch):
+    monkeypatch.delenv("BESTBUY_API_KEY", raising=False)
+    with pytest.raises(ValueError):
+        StoreApiClient()
@@ -0,0 +1,101 @@
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from scrapper import bestbuy_batch
+from scrapper.bestbuy_batch import StoreLocatorWorker, merge_stores
+from scrapper.checkpoints import CheckpointStore
+
+
+class FakeSessions:
+    """Hands out one stand-in session and records how each was released"""
+
+    def __init__(self):
+        self.released = []
+
+    def acquire(self):
+        return SimpleNamespace(driver=object(), fresh=not self.released)
+
+    def release(self, session, discard=False):
+        self.released.append(discard)
+
+
+@pytest.fixture
+def checkpoints(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    yield store
+    store.close()
+
+
+def run_worker(zip_codes, checkpoints, sessions=None):
+    zip_queue = queue.Queue()
+    for zip_code in zip_codes:
+        zip_queue.put(zip_code)
+    results = {}
+    worker = StoreLocatorWorker(1, zip_queue, results, sessions or FakeSessions(), checkpoints=checkpoints)
+    worker.run()
+    return worker, results, zip_queue
+
+
+def test_worker_keeps_going_after_failed_zips(monkeypatch, checkpoints):
+    outcomes = {
+        "10001": RuntimeError("chrome crashed"),
+        "10002": None,
+        "10003": [],
+        "10004": [{"store_id": "482", "distance": "1.2 miles"}],
+    }
+
+    def fake_search(driver, zip_code, extract_mode, cache=None, selectors=None):
+        outcome = outcomes[zip_code]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(bestbuy_batch, "search_stores", fake_search)
+    sessions = FakeSessions()
+    worker, results, zip_queue = run_worker(list(outcomes), checkpoints, sessions)
+
+    assert zip_queue.empty()
+    assert worker.stats["zips_failed"] == 2
+    assert worker.stats["zips_processed"] == 2
+    assert worker.stats["stores_found"] == 1
+    assert results == {"10003": [], "10004": outcomes["10004"]}
+    # Only the session whose search raised is thrown away
+    assert sessions.released == [True, False, False, False]
+
+
+def test_empty_results_are_checkpointed_but_failures_are_not(monkeypatch, checkpoints):
+    outcomes = {"10001": RuntimeError("timed out"), "10002": None, "10003": []}
+
+    def fake_search(driver, zip_code, extract_mode, cache=None, selectors=None):
+        outcome = outcomes[zip_code]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(bestbuy_batch, "search_stores", fake_search)
+    run_worker(list(outcomes), checkpoints)
+
+    assert checkpoints.get_rows("bestbuy", "stores", "10003", None) == []
+    assert checkpoints.get_rows("bestbuy", "stores", "10001", None) is None
+    assert checkpoints.get_rows("bestbuy", "stores", "10002", None) is None
+
+    # A re-run loads the empty ZIP instead of searching it again
+    searched = []
+    monkeypatch.setattr(bestbuy_batch, "search_stores",
+                        lambda driver, zip_code, *args, **kwargs: searched.append(zip_code) or [])
+    worker, results, _ = run_worker(list(outcomes), checkpoints)
+
+    assert searched == ["10001", "10002"]
+    assert worker.stats["zips_resumed"] == 1
+    assert results["10003"] == []
+
+
+def test_merge_stores_keeps_the_nearest_sighting():
+    merged = merge_stores([
+        [{"store_id": "482", "distance": "4.0 miles"}],
+        [{"store_id": "482", "distance": "0.5 miles"}, {"store_id": "1028", "distance": "2 miles"}],
+    ])
+
+    assert merged == [{"store_id": "482", "distance": "0.5 miles"}, {"store_id": "1028", "distance": "2 miles"}]
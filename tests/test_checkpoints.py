@@ -0,0 +1,77 @@
+import pytest
+
+from scrapper.checkpoints import CheckpointStore
+
+SEARCH = ("earth911", "Electronics", "10001", 25)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_nothing_done_starts_at_page_one(store):
+    assert store.resume_point(*SEARCH) == ([], 1)
+
+
+def test_resumes_after_the_leading_finished_pages(store):
+    search = store.search(*SEARCH)
+    search.mark_done(1, [{"id": 1}])
+    search.mark_done(2, [{"id": 2}])
+    # A page after a gap is kept, but the crawl resumes at the gap
+    search.mark_done(4, [{"id": 4}])
+
+    assert search.resume_point() == ([{"id": 1}, {"id": 2}], 3)
+
+
+def test_final_page_completes_the_search(store):
+    search = store.search(*SEARCH)
+    search.mark_done(1, [{"id": 1}])
+    search.mark_done(2, [{"id": 2}], final=True)
+
+    assert search.resume_point() == ([{"id": 1}, {"id": 2}], None)
+
+
+def test_mark_final_on_an_existing_page(store):
+    search = store.search(*SEARCH)
+    search.mark_done(1, [{"id": 1}])
+    search.mark_done(2, [])
+    assert search.resume_point() == ([{"id": 1}], 3)
+
+    search.mark_final(2)
+    assert search.resume_point() == ([{"id": 1}], None)
+
+
+def test_searches_are_kept_apart(store):
+    store.mark_done("earth911", "Electronics", "10001", 25, 1, [{"id": 1}], final=True)
+
+    assert store.resume_point("earth911", "Electronics", "10001", 50) == ([], 1)
+    assert store.resume_point("earth911", "Batteries", "10001", 25) == ([], 1)
+    # Sites without a radius or query still get a usable key
+    store.mark_done("bestbuy", None, 10001, None, 1, [{"id": 2}], final=True)
+    assert store.resume_point("bestbuy", None, "10001", None) == ([{"id": 2}], None)
+
+
+def test_clear_forgets_one_search_or_a_whole_site(store):
+    store.mark_done(*SEARCH, 1, [{"id": 1}], final=True)
+    store.mark_done("earth911", "Batteries", "10001", 25, 1, [{"id": 2}], final=True)
+
+    store.search(*SEARCH).clear()
+    assert store.resume_point(*SEARCH) == ([], 1)
+    assert store.get_rows("earth911", "Batteries", "10001", 25) == [{"id": 2}]
+
+    store.clear("earth911")
+    assert store.get_rows("earth911", "Batteries", "10001", 25) is None
+
+
+def test_checkpoints_survive_a_restart(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    first = CheckpointStore(path)
+    first.mark_done(*SEARCH, 1, [{"id": 1}])
+    first.close()
+
+    second = CheckpointStore(path)
+    assert second.resume_point(*SEARCH) == ([{"id": 1}], 2)
+    second.close()
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from scrapper.coverage import (haversine_miles, load_centroids, load_zip_codes, neighbours_within, plan_coverage,
+                               select_region, state_for_zip, summarise_plan)
+
+
+def random_points(count, seed=1):
+    rng = random.Random(seed)
+    # Roughly the New York metro area, dense enough that circles overlap
+    return {f"{index:05d}": (rng.uniform(40.4, 41.2), rng.uniform(-74.5, -73.5)) for index in range(count)}
+
+
+@pytest.mark.parametrize("radius", [5, 15])
+def test_neighbours_within_matches_brute_force(radius):
+    points = random_points(300)
+    neighbours = neighbours_within(points, radius)
+
+    for zip_code, (lat, lng) in points.items():
+        expected = {other for other, (olat, olng) in points.items() if haversine_miles(lat, lng, olat, olng) <= radius}
+        assert set(neighbours[zip_code]) == expected
+
+
+@pytest.mark.parametrize("radius", [5, 15])
+def test_plan_covers_every_zip_exactly_once(radius):
+    points = random_points(300)
+    plan = plan_coverage(points, radius)
+
+    covered = [zip_code for _, covers in plan for zip_code in covers]
+    assert sorted(covered) == sorted(points)
+    for centre, covers in plan:
+        lat, lng = points[centre]
+        assert all(haversine_miles(lat, lng, *points[zip_code]) <= radius for zip_code in covers)
+    assert len(plan) < len(points)
+
+
+def test_neighbours_within_wraps_at_the_antimeridian():
+    # Western Aleutians: Attu and Shemya sit east of 180, Adak and Atka west of it
+    points = {"attu": (52.93, 172.91), "shemya": (52.72, 174.11), "amchitka": (51.45, 179.2),
+              "semisopochnoi": (51.95, 179.6), "gareloi": (51.79, -178.8), "adak": (51.88, -176.64),
+              "atka": (52.2, -174.2), "dateline": (51.9, 180.0)}
+    for radius in (20, 75, 200):
+        neighbours = neighbours_within(points, radius)
+        for name, (lat, lng) in points.items():
+            expected = {other for other, (olat, olng) in points.items()
+                        if haversine_miles(lat, lng, olat, olng) <= radius}
+            assert set(neighbours[name]) == expected
+
+    assert "gareloi" in neighbours_within(points, 75)["semisopochnoi"]
+
+
+def test_plan_keeps_isolated_zips():
+    points = {"10001": (40.75, -73.99), "10002": (40.71, -73.98), "90001": (33.97, -118.24)}
+    plan = plan_coverage(points, 10)
+
+    assert [centre for centre, _ in plan if centre == "90001"] == ["90001"]
+    assert len(plan) == 2
+    summary = summarise_plan(points, plan, 10)
+    assert summary["queries_planned"] == 2
+    assert summary["queries_saved"] == 1
+
+
+def test_plan_of_nothing_is_empty():
+    assert plan_coverage({}, 25) == []
+
+
+@pytest.mark.parametrize("zip_code, state", [
+    ("10001", "NY"), ("00501", "NY"), ("07030", "NJ"), ("02134", "MA"), ("20001", "DC"), ("33101", "FL"),
+    ("60601", "IL"), ("75201", "TX"), ("94105", "CA"), ("99501", "AK"), ("96801", "HI"), ("340", None),
+    ("00000", None), ("abcde", None),
+])
+def test_state_for_zip(zip_code, state):
+    assert state_for_zip(zip_code) == state
+
+
+def test_load_centroids_reads_the_gazetteer_layout(tmp_path):
+    path = tmp_path / "gazetteer.txt"
+    path.write_text("GEOID\tALAND\tINTPTLAT\tINTPTLONG\n"
+                    "07030\t1\t40.745\t-74.032\n"
+                    "10001\t1\t40.750\t-73.997\n"
+                    "10002\t1\tbad\t-73.986\n", encoding="utf-8")
+
+    centroids = load_centroids(str(path))
+
+    assert centroids == {"07030": (40.745, -74.032, "NJ"), "10001": (40.75, -73.997, "NY")}
+    assert select_region(centroids, states=["ny"]) == {"10001": (40.75, -73.997)}
+    assert select_region(centroids, bbox=(40.7, -74.1, 40.8, -74.0)) == {"07030": (40.745, -74.032)}
+
+
+def test_load_centroids_requires_coordinates(tmp_path):
+    path = tmp_path / "zips.csv"
+    path.write_text("zip,state\n10001,NY\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_centroids(str(path))
+
+
+def test_load_zip_codes_dedupes_files_and_arguments(tmp_path):
+    path = tmp_path / "zips.txt"
+    path.write_text("# centres\n10001, 10002\n10001  # again\n\n07030\n", encoding="utf-8")
+
+    assert load_zip_codes(["10002", "11201"], str(path)) == ["10002", "11201", "10001", "07030"]
@@ -0,0 +1,61 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from scrapper.earth911_http import (_iter_planned_pages, build_search_url, parse_last_page_number,
+                                    parse_total_results, plan_remaining_pages, scrape_earth911_concurrent,
+                                    scrape_earth911_http, with_page)
+
+
+def test_concurrent_scrape_matches_the_sequential_one(fixture_site):
+    _, base_url = fixture_site
+    search = ("Electronics", "10001", 100)
+
+    sequential, sequential_pages = scrape_earth911_http(*search, max_pages=5, base_url=f"{base_url}earth911/")
+    concurrent, concurrent_pages = scrape_earth911_concurrent(*search, max_pages=5, base_url=f"{base_url}earth911/")
+
+    assert concurrent_pages == sequential_pages == 5
+    # Pages are fetched out of order but their rows come back in page order
+    assert concurrent == sequential
+
+
+def test_max_pages_caps_the_concurrent_scrape(fixture_site):
+    _, base_url = fixture_site
+
+    rows, pages = scrape_earth911_concurrent("Electronics", "10001", max_pages=2, base_url=f"{base_url}earth911/")
+
+    assert pages == 2
+    assert len(rows) == 20
+
+
+def test_a_page_that_cannot_be_fetched_fails_the_crawl(fixture_site):
+    _, base_url = fixture_site
+    planned = [(2, build_search_url("Electronics", "10001", page=2, base_url=f"{base_url}earth911/")),
+               (3, f"{base_url}earth911/missing.html")]
+    rows = []
+
+    with pytest.raises(RuntimeError, match=r"page\(s\) 3"):
+        for row in _iter_planned_pages(planned, concurrency=2, rate=None):
+            rows.append(row)
+
+    # The pages that did arrive are still handed over before the error
+    assert len(rows) == 10
+
+
+def test_plan_remaining_pages():
+    soup = BeautifulSoup('<p>Showing 1-10 of 35 results</p><a class="next" href="/search?what=Paint&page=2">Next</a>'
+                         '<a href="/search?what=Paint&page=9">9</a>', "html.parser")
+    first = "https://example.com/search?what=Paint"
+
+    assert parse_total_results(soup) == 35
+    assert parse_last_page_number(soup) == 9
+    assert plan_remaining_pages(soup, first, 10) == [
+        "https://example.com/search?what=Paint&page=2",
+        "https://example.com/search?what=Paint&page=3",
+        "https://example.com/search?what=Paint&page=4",
+    ]
+    assert plan_remaining_pages(soup, first, 10, max_pages=2) == ["https://example.com/search?what=Paint&page=2"]
+    assert plan_remaining_pages(BeautifulSoup("<p>No more</p>", "html.parser"), first, 10) == []
+
+
+def test_with_page_replaces_the_page_parameter():
+    assert with_page("https://example.com/s?what=Paint&page=2", 7) == "https://example.com/s?what=Paint&page=7"
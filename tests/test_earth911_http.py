@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from selenium import webdriver
+
+from fixture_server import FIXTURES_DIR
+from scrapper.earth911_http import build_search_url, find_next_page_url, parse_recycling_html
+from scrapper.earth911_scrapper import extract_recycling_data
+
+
+def fixture_html(page):
+    with open(os.path.join(FIXTURES_DIR, "earth911", f"page_{page}.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def visible(text):
+    # The saved pages keep the zero-width no-break spaces the live site puts in its text
+    return text.replace("\ufeff", "")
+
+
+@pytest.fixture(scope="module")
+def chrome():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        pytest.skip(f"Chrome is not available: {e}")
+    yield driver
+    driver.quit()
+
+
+def test_parse_recycling_html_reads_every_result():
+    rows, soup = parse_recycling_html(fixture_html(1))
+
+    assert len(rows) == 10
+    tekserve = next(row for row in rows if visible(row["business_name"]) == "Tekserve")
+    assert visible(tekserve["street_address"]) == "119 W 23rd St, New York, NY 10011"
+    assert [visible(material) for material in tekserve["materials_accepted"]] == \
+        ["Desktop Computers", "LCD Computer Monitors", "Office Machines"]
+    # "+1 more" links are not materials
+    assert not any(material.startswith("+") for row in rows for material in row["materials_accepted"])
+    assert find_next_page_url(soup, "http://fixture/?what=Electronics").endswith("&page=2")
+
+
+def test_last_page_has_no_next_link():
+    _, soup = parse_recycling_html(fixture_html(5))
+
+    assert find_next_page_url(soup, "http://fixture/?what=Electronics&page=5") is None
+
+
+def test_build_search_url():
+    assert build_search_url("Electronics", "10001", 25, base_url="http://fixture/") == \
+        "http://fixture/?what=Electronics&where=10001&list_filter=all&max_distance=25"
+    assert build_search_url("Electronics", "10001", page=3, base_url="http://fixture/").endswith("&page=3")
+
+
+@pytest.mark.parametrize("page", [1, 2, 5])
+def test_http_parser_matches_the_chrome_extractor(chrome, fixture_site, page):
+    _, base_url = fixture_site
+    url = build_search_url("Electronics", "10001", page=page, base_url=base_url)
+    chrome.get(url)
+
+    # details_url is resolved against the page URL, as Chrome resolves the link
+    assert extract_recycling_data(chrome) == parse_recycling_html(fixture_html(page), url)[0]
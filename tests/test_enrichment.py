@@ -0,0 +1,71 @@
+import os
+
+from fixture_server import FIXTURES_DIR
+
+from scrapper.earth911_http import parse_recycling_html
+from scrapper.enrichment import merge_detail, parse_bestbuy_detail, parse_earth911_detail
+
+
+def fixture_html(*path):
+    with open(os.path.join(FIXTURES_DIR, *path), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parse_earth911_detail():
+    detail = parse_earth911_detail(fixture_html("earth911", "detail.html"))
+
+    assert detail == {
+        "phone": "(212) 639-4311",
+        "hours": "Mon-Sat 6:00 am - 6:00 pm",
+        "materials_accepted": ["Dehumidifiers", "Humidifiers", "Air Conditioners", "Barbeque Grills", "Carpet",
+                               "Carpet Padding", "Refrigerators"],
+    }
+
+
+def test_detail_page_replaces_the_truncated_materials_list():
+    rows, _ = parse_recycling_html(fixture_html("earth911", "page_1.html"), "https://earth911.com/?what=Electronics")
+    row = rows[0]
+    # The listing shows six materials and '+1 more'
+    assert len(row["materials_accepted"]) == 6
+
+    merge_detail(row, parse_earth911_detail(fixture_html("earth911", "detail.html")))
+
+    assert row["materials_accepted"][-1] == "Refrigerators" and len(row["materials_accepted"]) == 7
+    assert row["phone"] == "(212) 639-4311"
+    assert row["street_address"] == "New York, NY 10001"
+
+
+def test_parse_bestbuy_detail_picks_the_row_s_store():
+    html = fixture_html("bestbuy", "store_detail.html")
+
+    detail = parse_bestbuy_detail(html, {"store_id": "482"})
+
+    assert detail == {"phone": "(212) 366-1373", "latitude": 40.7424, "longitude": -73.9927,
+                      "weekly_hours": "Mon,Tue,Wed,Thu,Fri,Sat 10:00-21:00; Sun 11:00-19:00"}
+    assert parse_bestbuy_detail(html, {"store_id": "1028"})["phone"] == "(212) 808-0358"
+
+
+def test_merge_detail_only_fills_missing_or_placeholder_fields():
+    row = {"store_id": "482", "phone": "Phone not found", "hours": "Open until 9 pm",
+           "materials_accepted": ["Materials not specified"]}
+
+    merge_detail(row, {"phone": "(212) 366-1373", "hours": "Mon-Sat 10:00-21:00", "weekly_hours": "",
+                       "materials_accepted": ["Paint"], "latitude": 40.7424})
+
+    assert row == {"store_id": "482", "phone": "(212) 366-1373", "hours": "Open until 9 pm",
+                   "materials_accepted": ["Paint"], "latitude": 40.7424}
+    # A shorter list never replaces a longer one
+    merge_detail(row, {"materials_accepted": []})
+    assert merge_detail(row, {"materials_accepted": ["Glass"]})["materials_accepted"] == ["Paint"]
+
+
+def test_detail_text_is_cleaned_before_merging():
+    html = ('<div id="materials"><ul><li>Cell\u200b Phones</li><li>\ufeffBatteries</li><li>Batteries</li></ul></div>'
+            '<div class="hours">Mon-Fri  9-5</div>')
+    row = {"materials_accepted": ["Cell Phones"]}
+
+    merge_detail(row, parse_earth911_detail(html))
+    merge_detail(row, {"phone": "\ufeff(212) 555-0100 "})
+
+    assert row == {"materials_accepted": ["Cell Phones", "Batteries"], "hours": "Mon-Fri 9-5",
+                   "phone": "(212) 555-0100"}
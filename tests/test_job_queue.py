@@ -0,0 +1,186 @@
+import functools
+
+import pytest
+
+from scrapper import job_queue
+from scrapper.job_queue import QueueWorker, SQLiteJobQueue, open_queue
+
+
+def unit(page=1, zip_code="10001", site="test"):
+    return (site, "Electronics", zip_code, 25, page, {"max_pages": 3})
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite3"))
+    yield queue
+    queue.close()
+
+
+def test_units_are_only_queued_once(queue):
+    assert queue.enqueue([unit(), unit(zip_code="10002")]) == 2
+    assert queue.enqueue([unit(), unit(zip_code="10003")]) == 1
+    assert queue.counts() == {"test": {"pending": 3}}
+
+
+def test_claim_leases_the_oldest_unit(queue):
+    queue.enqueue([unit(zip_code="10001"), unit(zip_code="10002"), unit(zip_code="10003", site="other")])
+
+    job = queue.claim("w1", sites=["test"])
+
+    assert (job["zip_code"], job["attempts"], job["params"]) == ("10001", 1, {"max_pages": 3})
+    assert queue.claim("w2", sites=["test"])["zip_code"] == "10002"
+    assert queue.claim("w3", sites=["test"]) is None
+    assert queue.counts() == {"test": {"leased": 2}, "other": {"pending": 1}}
+
+
+def test_complete_stores_rows_and_queues_follow_ups(queue):
+    queue.enqueue([unit()], max_attempts=5)
+    job = queue.claim("w1")
+
+    assert queue.complete(job, [{"id": 1}], [unit(page=2), unit(page=3)])
+
+    assert list(queue.results("test")) == [{"id": 1}]
+    follow_up = queue.claim("w1")
+    assert follow_up["page"] == 2
+    # Follow-ups inherit the parent's attempt budget
+    queue.fail(follow_up, "boom", retry_delay=0)
+    queue.retry_failed()
+    assert queue.db.execute("SELECT max_attempts FROM jobs WHERE page = 2").fetchone()[0] == 5
+
+
+def test_expired_lease_goes_back_to_pending(queue):
+    queue.enqueue([unit()])
+    stale = queue.claim("w1", lease_seconds=-1)
+
+    fresh = queue.claim("w2")
+
+    assert fresh["id"] == stale["id"]
+    assert fresh["attempts"] == 2
+    assert fresh["lease_token"] != stale["lease_token"]
+    # The worker that lost the lease can no longer touch the unit
+    assert not queue.heartbeat(stale)
+    assert not queue.complete(stale, [{"id": "stale"}])
+    assert not queue.fail(stale, "late failure")
+    assert queue.heartbeat(fresh)
+    assert queue.complete(fresh, [{"id": "fresh"}])
+    assert list(queue.results("test")) == [{"id": "fresh"}]
+
+
+def test_expired_lease_out_of_attempts_fails(queue):
+    queue.enqueue([unit()], max_attempts=1)
+    queue.claim("w1", lease_seconds=-1)
+
+    assert queue.claim("w2") is None
+    assert queue.counts() == {"test": {"failed": 1}}
+    assert queue.unfinished() == 0
+
+
+def test_fail_retries_until_out_of_attempts(queue):
+    queue.enqueue([unit()], max_attempts=2)
+
+    assert queue.fail(queue.claim("w1"), "first", retry_delay=0)
+    assert queue.counts() == {"test": {"pending": 1}}
+    assert queue.fail(queue.claim("w1"), "second", retry_delay=0)
+    assert queue.counts() == {"test": {"failed": 1}}
+
+    assert queue.retry_failed("other") == 0
+    assert queue.retry_failed("test") == 1
+    assert queue.claim("w1")["attempts"] == 1
+
+
+def test_failed_units_wait_before_their_retry(queue):
+    queue.enqueue([unit()])
+    queue.fail(queue.claim("w1"), "boom", retry_delay=60)
+
+    assert queue.claim("w1") is None
+    assert queue.unfinished() == 1
+
+
+def test_reserve_slot_spaces_out_jobs_of_a_site(queue):
+    queue.set_site_interval("test", 10)
+
+    delays = [queue.reserve_slot("test") for _ in range(3)]
+
+    assert delays[0] == pytest.approx(0, abs=0.5)
+    assert delays[1] == pytest.approx(10, abs=0.5)
+    assert delays[2] == pytest.approx(20, abs=0.5)
+    assert queue.reserve_slot("elsewhere") == pytest.approx(0, abs=0.5)
+
+
+def test_open_queue(tmp_path):
+    open_queue(f"sqlite://{tmp_path / 'a.sqlite3'}").close()
+    open_queue(str(tmp_path / "b.sqlite3")).close()
+    with pytest.raises(ValueError):
+        open_queue("redis://localhost")
+
+
+def test_worker_runs_follow_ups_and_retries_failures(queue, monkeypatch):
+    calls = []
+
+    def handler(worker, job):
+        calls.append(job["page"])
+        if job["page"] == 2 and calls.count(2) == 1:
+            raise RuntimeError("flaky page")
+        follow_ups = [unit(page=job["page"] + 1)] if job["page"] < 3 else []
+        return [{"page": job["page"]}], follow_ups
+
+    monkeypatch.setitem(job_queue.JOB_HANDLERS, "test", handler)
+    # Retry the flaky page straight away instead of after the default delay
+    monkeypatch.setattr(queue, "fail", functools.partial(queue.fail, retry_delay=0))
+    queue.set_site_interval("test", 0)
+    queue.enqueue([unit()])
+
+    stats = QueueWorker(queue, "w1", lease_seconds=30, poll_interval=0.01).run()
+
+    assert calls == [1, 2, 2, 3]
+    assert stats == {"done": 3, "failed": 1, "lost": 0, "rows": 3}
+    assert [row["page"] for row in queue.results("test")] == [1, 2, 3]
+
+
+def test_worker_discards_rows_after_losing_its_lease(queue, monkeypatch):
+    def handler(worker, job):
+        # Another worker takes the unit over while this one is still running
+        queue.db.execute("UPDATE jobs SET lease_token = 'other' WHERE id = ?", (job["id"],))
+        return [{"id": 1}], []
+
+    monkeypatch.setitem(job_queue.JOB_HANDLERS, "test", handler)
+    queue.set_site_interval("test", 0)
+    queue.enqueue([unit()])
+    worker = QueueWorker(queue, "w1", lease_seconds=30)
+
+    worker.run_one(queue.claim("w1", lease_seconds=30))
+
+    assert worker.stats["lost"] == 1
+    assert list(queue.results("test")) == []
+
+
+def test_earth911_jobs_against_the_fixture_site(queue, fixture_site):
+    _, base_url = fixture_site
+    queue.set_site_interval("earth911", 0)
+    params = {"engine": "http", "max_pages": 3, "base_url": f"{base_url}earth911/"}
+    queue.enqueue([("earth911", "Electronics", "10001", "100", 1, params)])
+
+    stats = QueueWorker(queue, "w1", lease_seconds=30, sites=["earth911"]).run()
+
+    assert stats["done"] == 3 and stats["failed"] == 0
+    assert queue.counts() == {"earth911": {"done": 3}}
+    assert len(list(queue.results("earth911"))) == stats["rows"] > 0
+
+
+def test_bestbuy_job_retries_a_failed_search_but_not_an_empty_one(queue, monkeypatch):
+    from scrapper import bestBut_scrapper
+
+    outcomes = {"10001": None, "10002": [], "10003": [{"store_id": "482"}]}
+    monkeypatch.setattr(bestBut_scrapper, "search_stores",
+                        lambda driver, zip_code, *args, **kwargs: outcomes[zip_code])
+    worker = QueueWorker(queue, "w1")
+    monkeypatch.setattr(worker, "driver", lambda: None)
+
+    def job(zip_code):
+        return {"zip_code": zip_code, "radius": None, "params": {}}
+
+    with pytest.raises(RuntimeError):
+        job_queue.run_bestbuy_job(worker, job("10001"))
+    assert job_queue.run_bestbuy_job(worker, job("10002")) == ([], [])
+    assert job_queue.run_bestbuy_job(worker, job("10003")) == ([{"store_id": "482"}], [])
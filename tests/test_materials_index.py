@@ -0,0 +1,93 @@
+import itertools
+import random
+
+from scrapper.materials_index import MaterialsIndex, iter_bits, material_key, split_materials
+
+MATERIALS = ["Cell Phones", "Batteries", "Paint", "Glass", "Motor Oil", "Tires", "Plastic Bags", "Electronics"]
+
+
+def random_rows(count, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        accepted = rng.sample(MATERIALS, rng.randint(0, 4))
+        rows.append({"record_key": f"key-{index}", "business_name": f"Facility {index}",
+                     "street_address": f"{index} Main St", "materials_accepted": accepted})
+    return rows
+
+
+def brute_force(rows, all_of=(), any_of=()):
+    matches = set()
+    for row in rows:
+        accepted = {material_key(material) for material in row["materials_accepted"]}
+        if all(material_key(material) in accepted for material in all_of) and \
+                (not any_of or any(material_key(material) in accepted for material in any_of)):
+            matches.add(row["record_key"])
+    return matches
+
+
+def matched_keys(index, all_of=(), any_of=()):
+    return {row["record_key"] for row in index.query(all_of, any_of)}
+
+
+def test_match_agrees_with_brute_force():
+    rows = random_rows(200)
+    index = MaterialsIndex().add_rows(rows)
+
+    for size in (1, 2):
+        for all_of in itertools.combinations(MATERIALS, size):
+            assert matched_keys(index, all_of=all_of) == brute_force(rows, all_of=all_of)
+            assert matched_keys(index, any_of=all_of) == brute_force(rows, any_of=all_of)
+    assert matched_keys(index, ["Paint"], ["Glass", "Tires"]) == brute_force(rows, ["Paint"], ["Glass", "Tires"])
+    assert matched_keys(index) == {row["record_key"] for row in rows}
+
+
+def test_material_names_are_matched_loosely():
+    index = MaterialsIndex().add_rows([{"record_key": "a", "materials_accepted": "Cell  Phones; batteries"}])
+
+    assert matched_keys(index, all_of=["cell phones", "BATTERIES"]) == {"a"}
+    assert index.query(all_of=["Unknown"]) == []
+    assert index.vocabulary == ["Cell Phones", "batteries"]
+
+
+def test_placeholder_is_not_a_material():
+    index = MaterialsIndex().add_rows([{"record_key": "a", "materials_accepted": "Materials not specified"}])
+
+    assert index.vocabulary == []
+    assert [row["materials_accepted"] for row in index.query()] == [[]]
+
+
+def test_readding_a_record_key_replaces_its_materials():
+    index = MaterialsIndex()
+    index.add({"record_key": "a", "materials_accepted": ["Paint", "Glass"]})
+    index.add({"record_key": "b", "materials_accepted": ["Glass"]})
+    index.add({"record_key": "a", "materials_accepted": ["Tires"]})
+
+    assert len(index) == 2
+    assert matched_keys(index, all_of=["Paint"]) == set()
+    assert matched_keys(index, all_of=["Glass"]) == {"b"}
+    assert matched_keys(index, all_of=["Tires"]) == {"a"}
+    assert index.counts() == {"Glass": 1, "Tires": 1, "Paint": 0}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rows = random_rows(50)
+    path = str(tmp_path / "materials.sqlite3")
+    original = MaterialsIndex().add_rows(rows)
+    original.save(path)
+
+    loaded = MaterialsIndex.load(path)
+
+    assert loaded.vocabulary == original.vocabulary
+    assert loaded.counts() == original.counts()
+    assert loaded.query(["Batteries"], ["Paint", "Glass"]) == original.query(["Batteries"], ["Paint", "Glass"])
+    # A loaded index keeps accepting updates
+    loaded.add({"record_key": "key-0", "materials_accepted": ["Electronics"]})
+    assert "key-0" in matched_keys(loaded, all_of=["Electronics"])
+    assert len(loaded) == len(original)
+
+
+def test_helpers():
+    assert list(iter_bits(0b101001)) == [0, 3, 5]
+    assert split_materials("Paint; Glass") == ["Paint", " Glass"]
+    assert split_materials(None) == []
@@ -0,0 +1,154 @@
+import os
+import random
+import string
+
+import pytest
+from fixture_server import FIXTURES_DIR
+
+from scrapper.earth911_http import build_search_url, parse_recycling_html, replay_from_cache
+from scrapper.page_cache import EVICT_TO_FRACTION, PageCache, canonical_url
+
+
+def random_html(seed):
+    # Random text so the gzipped bodies all come out the same size
+    rng = random.Random(seed)
+    return "<html>" + "".join(rng.choice(string.ascii_letters) for _ in range(4000)) + "</html>"
+
+
+def fixture_html(page):
+    with open(os.path.join(FIXTURES_DIR, "earth911", f"page_{page}.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PageCache(str(tmp_path / "cache"), ttl=3600, max_bytes=None)
+    yield cache
+    cache.close()
+
+
+def test_canonical_url():
+    assert canonical_url("HTTPS://Example.com/s?b=2&a=1#top") == "https://example.com/s?a=1&b=2"
+    assert canonical_url("https://example.com") == "https://example.com/"
+
+
+def test_equivalent_urls_share_an_entry(cache):
+    cache.put("https://example.com/s?what=Paint&where=10001", "<p>paint</p>")
+
+    assert cache.get("https://example.com/s?where=10001&what=Paint#results") == "<p>paint</p>"
+    assert cache.get("https://example.com/s?what=Paint&where=10002") is None
+    # Raw responses and DOM snapshots of the same URL are kept apart
+    assert cache.get("https://example.com/s?what=Paint&where=10001", kind="dom") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_identical_bodies_are_stored_once(cache):
+    cache.put("https://example.com/a", random_html(1))
+    single = cache.total_bytes()
+    cache.put("https://example.com/b", random_html(1))
+
+    assert cache.total_bytes() == single
+    assert len(cache.entries()) == 2
+
+
+def test_expired_entries_are_misses_unless_asked_for(cache):
+    cache.put("https://example.com/a", "<p>old</p>")
+    cache.db.execute("UPDATE entries SET fetched_at = fetched_at - 7200")
+
+    assert cache.get("https://example.com/a") is None
+    assert cache.get("https://example.com/a", allow_expired=True) == "<p>old</p>"
+
+
+def test_writes_do_not_delete_expired_entries(cache):
+    cache.max_bytes = 10 * 1024 * 1024
+    cache.put("https://example.com/old", "<p>old</p>")
+    cache.db.execute("UPDATE entries SET fetched_at = fetched_at - 7200")
+
+    cache.put("https://example.com/new", "<p>new</p>")
+
+    assert cache.get("https://example.com/old", allow_expired=True) == "<p>old</p>"
+    assert len(cache.entries()) == 2
+
+
+def test_size_pressure_evicts_expired_entries_first_in_one_batch(cache):
+    for name, seed in (("a", 1), ("b", 2), ("c", 3), ("d", 4)):
+        cache.put(f"https://example.com/{name}", random_html(seed))
+    # c is the stalest page but the most recently used one
+    cache.db.execute("UPDATE entries SET fetched_at = fetched_at - 7200 WHERE url = 'https://example.com/c'")
+    cache.get("https://example.com/c", allow_expired=True)
+    size = cache.total_bytes() // 4
+    cache.max_bytes = int(size * 3.5)
+
+    cache.put("https://example.com/e", random_html(5))
+
+    # Down to 90% of the limit: the expired page, then the least recently used one
+    assert sorted(url for url, _, _ in cache.entries()) == [
+        "https://example.com/b", "https://example.com/d", "https://example.com/e"]
+    assert cache.total_bytes() <= cache.max_bytes * EVICT_TO_FRACTION
+
+
+def test_prune_deletes_old_entries_and_their_blobs(cache):
+    cache.put("https://example.com/old", random_html(1))
+    cache.put("https://example.com/shared", random_html(2))
+    cache.put("https://example.com/new", random_html(2))
+    cache.db.execute("UPDATE entries SET fetched_at = fetched_at - 7200 WHERE url != 'https://example.com/new'")
+    old_hash, shared_hash = (cache.db.execute("SELECT content_hash FROM entries WHERE url = ?", (url,)).fetchone()[0]
+                             for url in ("https://example.com/old", "https://example.com/shared"))
+
+    assert cache.prune(3600 * 3) == 0
+    assert cache.prune() == 2
+
+    assert [url for url, _, _ in cache.entries()] == ["https://example.com/new"]
+    assert not os.path.exists(cache._object_path(old_hash))
+    # The blob is still used by the newer entry
+    assert os.path.exists(cache._object_path(shared_hash))
+
+
+def test_replacing_a_page_drops_its_old_blob(cache):
+    cache.put("https://example.com/a", random_html(1))
+    old_hash = cache.db.execute("SELECT content_hash FROM entries").fetchone()[0]
+
+    cache.put("https://example.com/a", random_html(2))
+
+    assert not os.path.exists(cache._object_path(old_hash))
+    assert cache.total_bytes() == cache._bytes
+
+
+def test_least_recently_used_entries_are_evicted_first(cache):
+    for name, seed in (("a", 1), ("b", 2), ("c", 3)):
+        cache.put(f"https://example.com/{name}", random_html(seed))
+    cache.get("https://example.com/a")
+    sizes = dict(cache.db.execute("SELECT url, size FROM entries").fetchall())
+    b_hash = cache.db.execute("SELECT content_hash FROM entries WHERE url = 'https://example.com/b'").fetchone()[0]
+
+    cache.max_bytes = int((sizes["https://example.com/a"] + sizes["https://example.com/c"]) / EVICT_TO_FRACTION) + 1
+    assert cache.evict() == 1
+
+    assert sorted(url for url, _, _ in cache.entries()) == ["https://example.com/a", "https://example.com/c"]
+    assert not os.path.exists(cache._object_path(b_hash))
+
+
+def test_replay_re_extracts_the_cached_pages(cache):
+    urls = {page: build_search_url("Electronics", "10001", 100, page=page) for page in (1, 2, 3)}
+    for page, url in urls.items():
+        cache.put(url, fixture_html(page), kind="dom" if page == 2 else "http")
+    # A different search in the same cache is left out
+    cache.put(build_search_url("Batteries", "10001", 100), fixture_html(4))
+
+    rows, pages = replay_from_cache(cache, "Electronics", "10001", 100)
+
+    assert pages == 3
+    assert rows == [row for page in (1, 2, 3) for row in parse_recycling_html(fixture_html(page), urls[page])[0]]
+    assert replay_from_cache(cache, "Electronics", "10001", 100, max_pages=2)[1] == 2
+
+
+def test_replay_reads_pages_past_their_ttl(cache):
+    url = build_search_url("Electronics", "10001", 100)
+    cache.put(url, fixture_html(1))
+    cache.db.execute("UPDATE entries SET fetched_at = fetched_at - 30 * 24 * 3600")
+    cache.put(build_search_url("Electronics", "10001", 100, page=2), fixture_html(2))
+
+    rows, pages = replay_from_cache(cache, "Electronics", "10001", 100)
+
+    assert pages == 2
+    assert len(rows) == 20
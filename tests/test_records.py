@@ -0,0 +1,67 @@
+import os
+
+from scrapper.records import (DedupIndex, build_recycling_entry, canonical_address, canonical_name, clean_text,
+                              dedupe_rows, normalize_record)
+
+
+def test_clean_text_strips_invisible_characters():
+    assert clean_text("\ufeffNew\u200b York\u00ad  City\u2060 ") == "New York City"
+    # NFKC folds compatibility forms such as full-width letters and ligatures
+    assert clean_text("Ｔekﬁx Store") == "Tekfix Store"
+    assert clean_text(None) is None
+
+
+def test_normalize_record_cleans_list_items():
+    row = normalize_record({"name": " A\u200bB ", "materials_accepted": ["\ufeffPaint", "Glass "], "count": 3})
+
+    assert row == {"name": "AB", "materials_accepted": ["Paint", "Glass"], "count": 3}
+
+
+def test_spelling_variants_share_a_record_key():
+    first = build_recycling_entry("Tek\ufeffserve", ("119 West 23rd Street", "New York, NY 10011"), ["Paint"])
+    second = build_recycling_entry("TEKSERVE", ("119 W. 23rd St", "New York, NY  10011"), ["Glass"])
+    other = build_recycling_entry("Tekserve", ("120 W 23rd St", "New York, NY 10011"), ["Paint"])
+
+    assert canonical_address("119 West 23rd Street") == canonical_address("119 W. 23rd St") == "119 W 23RD ST"
+    assert canonical_name("Willoughby's") == "willoughby s"
+    assert first["record_key"] == second["record_key"] != other["record_key"]
+    assert len(first["record_key"]) == 16
+    assert first["business_name"] == "Tekserve"
+
+
+def test_dedupe_rows_keeps_the_first_sighting():
+    rows = [{"record_key": "a", "page": 1}, {"record_key": "b", "page": 1}, {"record_key": "a", "page": 2},
+            {"record_key": None, "page": 2}, {"record_key": None, "page": 3}]
+
+    assert [(row["record_key"], row["page"]) for row in dedupe_rows(rows)] == [
+        ("a", 1), ("b", 1), (None, 2), (None, 3)]
+
+
+def test_dedup_index_spills_to_sqlite():
+    index = DedupIndex(max_memory_keys=3)
+    assert all(index.add(f"key-{n}") for n in range(3))
+    assert index.db is None
+
+    assert index.add("key-3")
+    temp_path = index.temp_path
+    assert index.db is not None and os.path.exists(temp_path) and not index.keys
+
+    # Keys seen before and after the spill are both still known
+    assert not index.add("key-0")
+    assert not index.add("key-3")
+    assert index.add("key-4")
+    assert index.duplicates == 2
+
+    index.close()
+    assert not os.path.exists(temp_path)
+
+
+def test_dedup_index_on_a_given_path_persists(tmp_path):
+    path = str(tmp_path / "seen.sqlite3")
+    with DedupIndex(path) as index:
+        index.add("a")
+
+    with DedupIndex(path) as index:
+        assert not index.add("a")
+        assert index.add("b")
+    assert os.path.exists(path)
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from scrapper.selector_cache import SelectorCache, race_selectors
+
+CANDIDATES = ["button.submit", "//button[@type='submit']", "input[type=submit]"]
+
+
+class StubDriver:
+    """Answers the race script from a fixed set of selectors that are on the page"""
+
+    def __init__(self, present, invalid=()):
+        self.present = set(present)
+        self.invalid = list(invalid)
+        self.scripts = 0
+
+    def execute_script(self, script, candidates):
+        self.scripts += 1
+        for index, candidate in enumerate(candidates):
+            if candidate in self.present:
+                return [index, f"<element {candidate}>", self.invalid]
+        return [None, None, self.invalid]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SelectorCache(str(tmp_path / "selectors.json"), fast_timeout=0.05)
+
+
+def find(cache, driver, candidates=CANDIDATES):
+    return cache.find(driver, "bestbuy", "submit", candidates, timeout=0.1, poll_frequency=0.01)
+
+
+def test_race_returns_the_first_candidate_on_the_page():
+    condition = race_selectors(CANDIDATES)
+    driver = StubDriver(["input[type=submit]", "//button[@type='submit']"], invalid=["(broken"])
+
+    assert condition(driver) == ("//button[@type='submit']", "<element //button[@type='submit']>")
+    assert condition.invalid == ["(broken"]
+    assert race_selectors(CANDIDATES)(StubDriver([])) is False
+
+
+def test_winner_is_learned_then_hit(cache):
+    driver = StubDriver(["input[type=submit]"])
+
+    assert find(cache, driver) == "<element input[type=submit]>"
+    assert cache.winner("bestbuy", "submit") == "input[type=submit]"
+    assert cache.stats == {"hits": 0, "misses": 0, "learned": 1, "not_found": 0}
+
+    driver.scripts = 0
+    assert find(cache, driver) == "<element input[type=submit]>"
+    # The remembered selector is tried on its own and found in one script call
+    assert driver.scripts == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_a_stale_winner_misses_and_is_replaced(cache):
+    find(cache, StubDriver(["input[type=submit]"]))
+
+    assert find(cache, StubDriver(["button.submit"])) == "<element button.submit>"
+
+    assert cache.winner("bestbuy", "submit") == "button.submit"
+    assert cache.stats == {"hits": 0, "misses": 1, "learned": 2, "not_found": 0}
+
+
+def test_no_candidate_found(cache):
+    assert find(cache, StubDriver([])) is None
+    assert cache.stats["not_found"] == 1
+    assert cache.winner("bestbuy", "submit") is None
+
+
+def test_winners_survive_a_round_trip(cache, tmp_path):
+    driver = StubDriver(["//button[@type='submit']"])
+    find(cache, driver)
+    find(cache, driver)
+
+    reloaded = SelectorCache(cache.path)
+
+    assert reloaded.winner("bestbuy", "submit") == "//button[@type='submit']"
+    with open(cache.path, encoding="utf-8") as f:
+        entry = json.load(f)["bestbuy"]["submit"]
+    assert entry["selector"] == "//button[@type='submit']"
+    assert reloaded.winner("earth911", "submit") is None
+
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "selectors.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    assert SelectorCache(str(path)).winners == {}
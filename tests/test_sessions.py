@@ -0,0 +1,27 @@
+import atexit
+
+from scrapper import sessions
+from scrapper.sessions import SessionManager, default_session_manager
+
+
+def test_close_unregisters_the_exit_hook(monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(atexit, "unregister", lambda func: registered.remove(func))
+
+    managers = [SessionManager() for _ in range(3)]
+    assert len(registered) == 3
+    for manager in managers:
+        manager.close()
+
+    assert registered == []
+
+
+def test_default_session_manager_is_shared_until_closed(monkeypatch):
+    monkeypatch.setattr(sessions, "_default_manager", None)
+    manager = default_session_manager()
+
+    assert default_session_manager() is manager
+    manager.close()
+    assert default_session_manager() is not manager
+    default_session_manager().close()
@@ -0,0 +1,50 @@
+import csv
+import json
+
+import pytest
+
+from scrapper.sinks import open_sink
+
+FIELDS = ["business_name", "phone", "latitude", "materials_accepted"]
+
+
+def test_csv_sink_flattens_lists(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    with open_sink(path, FIELDS) as sink:
+        sink.write({"business_name": "Tekserve", "materials_accepted": ["Paint", "Glass"], "extra": 1})
+
+    with open(path, newline="", encoding="utf-8") as f:
+        assert list(csv.DictReader(f)) == [
+            {"business_name": "Tekserve", "phone": "", "latitude": "", "materials_accepted": "Paint; Glass"}]
+
+
+def test_jsonl_sink_keeps_lists(tmp_path):
+    path = str(tmp_path / "rows.jsonl")
+    with open_sink(path, FIELDS) as sink:
+        sink.write({"business_name": "Tekserve", "materials_accepted": ["Paint"]})
+
+    with open(path, encoding="utf-8") as f:
+        assert json.loads(f.readline()) == {"business_name": "Tekserve", "phone": None, "latitude": None,
+                                            "materials_accepted": ["Paint"]}
+
+
+def test_parquet_schema_does_not_depend_on_the_first_row_group(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    path = str(tmp_path / "rows.parquet")
+
+    with open_sink(path, FIELDS) as sink:
+        sink.row_group_size = 2
+        # phone is None throughout the first row group
+        sink.write({"business_name": "A", "materials_accepted": ["Paint"]})
+        sink.write({"business_name": "B", "latitude": 40.75, "materials_accepted": "Glass; Tires"})
+        sink.write({"business_name": "C", "phone": "(212) 555-0100", "materials_accepted": []})
+
+    table = pq.read_table(path)
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert table.schema.types == [pa.string(), pa.string(), pa.string(), pa.list_(pa.string())]
+    assert table.to_pylist() == [
+        {"business_name": "A", "phone": None, "latitude": None, "materials_accepted": ["Paint"]},
+        {"business_name": "B", "phone": None, "latitude": "40.75", "materials_accepted": ["Glass", "Tires"]},
+        {"business_name": "C", "phone": "(212) 555-0100", "latitude": None, "materials_accepted": []},
+    ]
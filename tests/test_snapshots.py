@@ -0,0 +1,83 @@
+from scrapper.snapshots import CHANGE_FIELD, SnapshotIndex, content_hash, delta_path_for, track_changes
+
+
+class ListSink:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+
+
+def facility(key, materials="Cell Phones", date="01-01-2025"):
+    return {"record_key": key, "business_name": f"Facility {key}", "materials_accepted": materials,
+            "last_update_date": date}
+
+
+def crawl(index, rows, scope="data.csv"):
+    delta = ListSink()
+    stats = {}
+    exported = list(track_changes(rows, index, "earth911", scope, delta, stats))
+    return exported, {row["record_key"]: row[CHANGE_FIELD] for row in delta.rows}, stats
+
+
+def test_first_run_adds_everything(tmp_path):
+    with SnapshotIndex(str(tmp_path / "snapshots.sqlite3")) as index:
+        exported, changes, stats = crawl(index, [facility("a"), facility("b")])
+
+    assert changes == {"a": "added", "b": "added"}
+    assert stats == {"added": 2, "changed": 0, "removed": 0, "unchanged": 0}
+    assert all(row["first_seen"] == row["last_changed"] for row in exported)
+
+
+def test_second_run_reports_changed_removed_and_unchanged(tmp_path):
+    with SnapshotIndex(str(tmp_path / "snapshots.sqlite3")) as index:
+        first, _, _ = crawl(index, [facility("a"), facility("b"), facility("c")])
+        # Only the crawl date differs for a, and it is not part of the hash
+        second, changes, stats = crawl(index, [facility("a", date="02-01-2025"), facility("b", "Batteries"),
+                                               facility("d")])
+
+    assert changes == {"b": "changed", "c": "removed", "d": "added"}
+    assert stats == {"added": 1, "changed": 1, "removed": 1, "unchanged": 1}
+    first_seen = {row["record_key"]: row["first_seen"] for row in first}
+    assert {row["record_key"]: row["first_seen"] for row in second if row["record_key"] in first_seen} == \
+        {"a": first_seen["a"], "b": first_seen["b"]}
+
+
+def test_interrupted_run_leaves_the_index_unchanged(tmp_path):
+    def failing_rows():
+        yield facility("a", "Batteries")
+        raise RuntimeError("crawl died")
+
+    with SnapshotIndex(str(tmp_path / "snapshots.sqlite3")) as index:
+        crawl(index, [facility("a"), facility("b")])
+        try:
+            crawl(index, failing_rows())
+        except RuntimeError:
+            pass
+        _, changes, stats = crawl(index, [facility("a"), facility("b")])
+        assert index.last_run("earth911", "data.csv")["unchanged"] == 2
+
+    assert changes == {}
+    assert stats["unchanged"] == 2
+
+
+def test_scopes_are_tracked_separately(tmp_path):
+    with SnapshotIndex(str(tmp_path / "snapshots.sqlite3")) as index:
+        crawl(index, [facility("a")], scope="ny.csv")
+        _, changes, _ = crawl(index, [facility("b")], scope="nj.csv")
+
+    assert changes == {"b": "added"}
+
+
+def test_content_hash_ignores_excluded_and_snapshot_fields():
+    row = facility("a")
+    stamped = dict(row, first_seen="x", last_changed="y", last_update_date="other")
+    assert content_hash(row, ["last_update_date"]) == content_hash(stamped, ["last_update_date"])
+    assert content_hash(row) != content_hash(dict(row, materials_accepted="Batteries"))
+
+
+def test_delta_path_for():
+    assert delta_path_for("out/data.csv") == "out/data.delta.csv"
+    assert delta_path_for("stores.jsonl") == "stores.delta.jsonl"
+    assert delta_path_for("export") == "export.delta.csv"
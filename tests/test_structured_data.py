@@ -0,0 +1,98 @@
+import json
+import os
+import re
+
+from fixture_server import FIXTURES_DIR
+
+from scrapper.bestBut_scrapper import join_structured_data
+from scrapper.structured_data import build_store_index, format_hours, join_store_index, payloads_from_html
+
+JSON_LD = {
+    "@context": "https://schema.org",
+    "@graph": [
+        {
+            "@type": "ElectronicsStore",
+            "@id": "https://stores.bestbuy.com/482",
+            "telephone": "(212) 366-1373",
+            "geo": {"latitude": "40.7424", "longitude": "-73.9927"},
+            "openingHoursSpecification": [
+                {"dayOfWeek": ["https://schema.org/Monday", "https://schema.org/Tuesday"],
+                 "opens": "10:00", "closes": "21:00"},
+                {"dayOfWeek": "https://schema.org/Sunday"},
+            ],
+        },
+    ],
+}
+STATE = {"stores": [{"storeId": 1028, "phoneNumber": "(212) 808-0358", "lat": 40.7548, "lng": -73.9799,
+                     "hours": "Mon-Sun 10:00-21:00"},
+                    {"storeId": 482, "phone": "(000) 000-0000"}]}
+
+
+class StubDriver:
+    """Stands in for Chrome: execute_script returns the page's embedded payloads"""
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.scripts = 0
+
+    def execute_script(self, script):
+        self.scripts += 1
+        return self.payloads
+
+
+def testformat_hours():
+    assert format_hours(JSON_LD["@graph"][0]["openingHoursSpecification"]) == "Mon,Tue 10:00-21:00; Sun closed"
+    assert format_hours({"day": "Saturday", "open": "9:00", "close": "18:00"}) == "Sat 9:00-18:00"
+    assert format_hours(" Mo-Fr 09:00-17:00 ") == "Mo-Fr 09:00-17:00"
+    assert format_hours(None) == ""
+
+
+def test_build_store_index_reads_every_payload_once():
+    payloads = [json.dumps(JSON_LD), "not json", json.dumps(STATE)]
+
+    index = build_store_index(payloads)
+
+    assert index["482"] == {"phone": "(212) 366-1373", "weekly_hours": "Mon,Tue 10:00-21:00; Sun closed",
+                            "latitude": 40.7424, "longitude": -73.9927}
+    assert index["1028"] == {"phone": "(212) 808-0358", "weekly_hours": "Mon-Sun 10:00-21:00",
+                             "latitude": 40.7548, "longitude": -73.9799}
+
+
+def test_join_store_index_only_fills_placeholders():
+    stores = [{"store_id": "482", "phone": "Phone not found"}, {"store_id": 1028, "phone": "(212) 555-0100"},
+              {"store_id": "999", "phone": "Phone not found"}]
+
+    matched = join_store_index(stores, build_store_index([json.dumps(JSON_LD), json.dumps(STATE)]))
+
+    assert matched == 2
+    assert stores[0]["phone"] == "(212) 366-1373" and stores[0]["latitude"] == 40.7424
+    # A phone read off the card is kept
+    assert stores[1]["phone"] == "(212) 555-0100" and stores[1]["weekly_hours"] == "Mon-Sun 10:00-21:00"
+    assert stores[2] == {"store_id": "999", "phone": "Phone not found"}
+
+
+def test_join_structured_data_reads_the_page_in_one_script_call():
+    html = f'<script type="application/ld+json">{json.dumps(JSON_LD)}</script><script>var x = 1;</script>'
+    driver = StubDriver(payloads_from_html(html))
+    stores = [{"store_id": "482", "phone": "Phone not found"}, {"store_id": "1028", "phone": "Phone not found"}]
+
+    assert join_structured_data(driver, stores) == 1
+    assert driver.scripts == 1
+    assert stores[0]["weekly_hours"] == "Mon,Tue 10:00-21:00; Sun closed"
+
+
+def test_locator_fixture_through_join_structured_data():
+    with open(os.path.join(FIXTURES_DIR, "bestbuy", "store_locator.html"), encoding="utf-8") as f:
+        html = f.read()
+    # The cards the page renders from its STORES array, as extract_store_data reads them
+    stores = json.loads(re.search(r"const STORES = (\[.*?\]);", html, re.S).group(1))
+    for store in stores:
+        store["phone"] = "Phone not found"
+    driver = StubDriver(payloads_from_html(html))
+
+    assert join_structured_data(driver, stores) == 3
+    by_id = {store["store_id"]: store for store in stores}
+    assert by_id["482"]["phone"] == "(212) 366-1373"
+    assert by_id["482"]["weekly_hours"] == "Mon,Tue,Wed,Thu,Fri,Sat 10:00-21:00; Sun 11:00-19:00"
+    assert (by_id["1531"]["latitude"], by_id["1531"]["longitude"]) == (40.7343, -73.9905)
+    assert by_id["835"]["phone"] == "Phone not found" and "latitude" not in by_id["835"]
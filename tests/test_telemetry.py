@@ -0,0 +1,76 @@
+import json
+import os
+
+import pytest
+
+from scrapper.telemetry import Telemetry
+
+
+@pytest.fixture
+def metrics():
+    metrics = Telemetry()
+    metrics.record("navigate", 0.5, site="earth911", page=1)
+    metrics.record("navigate", 0.25, site="earth911", page=2)
+    metrics.record("extract", 1.0, site="bestbuy")
+    with metrics.span("wait", site="earth911", step='results "list"'):
+        pass
+    metrics.count("rows_emitted", 10, site="earth911")
+    metrics.count("rows_emitted", 5, site="earth911")
+    metrics.swallowed("popups", ValueError("boom"))
+    return metrics
+
+
+def test_spans_are_totalled_per_phase_without_page_labels(metrics):
+    totals = metrics.phase_totals()
+
+    assert totals[("navigate", (("site", "earth911"),))] == [2, 0.75]
+    assert totals[("extract", (("site", "bestbuy"),))] == [1, 1.0]
+    # The JSON export still keeps every span with its page
+    spans = metrics.to_dict()["spans"]
+    assert [span["labels"].get("page") for span in spans if span["name"] == "navigate"] == ["1", "2"]
+
+
+def test_a_span_is_recorded_when_its_body_raises():
+    metrics = Telemetry()
+    with pytest.raises(RuntimeError):
+        with metrics.span("extract", site="earth911"):
+            raise RuntimeError("boom")
+
+    assert metrics.phase_totals()[("extract", (("site", "earth911"),))][0] == 1
+
+
+def test_prometheus_text_format(metrics):
+    lines = metrics.to_prometheus().splitlines()
+
+    assert "# TYPE scrapper_phase_seconds_total counter" in lines
+    assert 'scrapper_phase_seconds_total{phase="navigate",site="earth911"} 0.750000' in lines
+    assert 'scrapper_phase_spans_total{phase="navigate",site="earth911"} 2' in lines
+    assert 'scrapper_rows_emitted_total{site="earth911"} 15' in lines
+    assert 'scrapper_swallowed_exceptions_total{type="ValueError",where="popups"} 1' in lines
+    assert any(line.startswith('scrapper_phase_spans_total{phase="wait",site="earth911",step="results \\"list\\""}')
+               for line in lines)
+    assert not any("page=" in line for line in lines)
+    assert lines[-1].startswith("scrapper_run_started_seconds ")
+    # One TYPE line per metric
+    types = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+    assert len(types) == len(set(types))
+
+
+def test_write_prometheus_replaces_the_file(metrics, tmp_path):
+    path = tmp_path / "scrapper.prom"
+    path.write_text("stale\n", encoding="utf-8")
+
+    metrics.write_prometheus(str(path))
+
+    assert path.read_text(encoding="utf-8") == metrics.to_prometheus()
+    assert os.listdir(tmp_path) == ["scrapper.prom"]
+
+
+def test_write_json(metrics, tmp_path):
+    path = tmp_path / "metrics.json"
+
+    metrics.write_json(str(path))
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert {"name": "rows_emitted", "labels": {"site": "earth911"}, "value": 15} in data["counters"]
+    assert {"name": "navigate", "labels": {"site": "earth911"}, "count": 2, "seconds": 0.75} in data["phases"]